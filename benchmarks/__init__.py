@@ -0,0 +1,5 @@
+"""
+Performance benchmarks for StoryCraftr.
+
+Run ``python -m benchmarks.run --help`` from the repository root.
+"""
@@ -0,0 +1,229 @@
+"""
+Measure StoryCraftr's own overhead on a synthetic project.
+
+The benchmark uses the offline chat model (with configurable latency and
+token rate) and deterministic hash embeddings, so results reflect
+StoryCraftr's code paths rather than provider speed. Reports are JSON and can
+be compared across commits::
+
+    python -m benchmarks.run --chapters 40 --words 2500 --output before.json
+    python -m benchmarks.run --chapters 40 --words 2500 --compare before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess  # nosec B404
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from .synthetic import generate_book
+
+_QUERIES = [
+    "What does Elowen remember about the river?",
+    "Describe the Glass Spire.",
+    "Who crossed the Ashen Reach during the storm?",
+    "Where was the lantern hidden?",
+    "What happened in Port Calder?",
+]
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(  # nosec B603 B607
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class Recorder:
+    def __init__(self):
+        self.stages: Dict[str, dict] = {}
+
+    @contextmanager
+    def stage(self, name: str, **details):
+        start = time.perf_counter()
+        entry = {"seconds": None, **details}
+        self.stages[name] = entry
+        try:
+            yield entry
+        except Exception as exc:
+            entry["error"] = f"{type(exc).__name__}: {exc}"
+        else:
+            entry["seconds"] = round(time.perf_counter() - start, 6)
+
+    def repeat(self, name: str, func: Callable[[], object], runs: int) -> None:
+        samples: List[float] = []
+        with self.stage(name, runs=runs) as entry:
+            for _ in range(runs):
+                start = time.perf_counter()
+                func()
+                samples.append(time.perf_counter() - start)
+            entry["mean"] = round(statistics.fmean(samples), 6)
+            entry["min"] = round(min(samples), 6)
+
+
+def run_benchmarks(args: argparse.Namespace, workdir: Path) -> dict:
+    os.environ["STORYCRAFTR_NO_DAEMON"] = "1"
+    os.environ["STORYCRAFTR_FAKE_LATENCY"] = str(args.llm_latency)
+    os.environ["STORYCRAFTR_FAKE_TOKENS_PER_SECOND"] = str(args.llm_tokens_per_second)
+
+    from storycraftr.agent.agents import (
+        LangChainAssistant,
+        close_assistant,
+        create_or_get_assistant,
+        load_markdown_documents,
+        process_chapters,
+    )
+    from storycraftr.prompts.story.iterate import CHECK_NAMES_PROMPT
+    from storycraftr.utils.markdown import consolidate_book_md, save_to_markdown
+    from storycraftr.utils.pdf import to_pdf
+
+    recorder = Recorder()
+    book_path = workdir / "book"
+    with recorder.stage("generate_project"):
+        generate_book(
+            book_path,
+            chapters=args.chapters,
+            words=args.words,
+            seed=args.seed,
+            llm_max_concurrency=args.concurrency,
+            vector_backend=args.vector_backend,
+        )
+    book = str(book_path.resolve())
+    # init_structure_story cached an assistant built before the config
+    # override; drop it so the selected backend is used.
+    close_assistant(book)
+
+    documents = []
+    with recorder.stage("load_markdown_documents") as entry:
+        documents = load_markdown_documents(book)
+        entry["documents"] = len(documents)
+    with recorder.stage("chunking") as entry:
+        chunks, _, _ = LangChainAssistant._split_documents(documents)
+        entry["chunks"] = len(chunks)
+
+    # init_structure_story already opened the assistant over the template
+    # files, so a forced rebuild measures a full index of the synthetic text.
+    assistant = create_or_get_assistant(book)
+    with recorder.stage("index_build"):
+        assistant.ensure_vector_store(force=True)
+    with recorder.stage("index_sync_unchanged"):
+        assistant.sync_vector_store()
+
+    recorder.repeat(
+        "retrieval_dense",
+        lambda: [assistant.retriever.invoke(query) for query in _QUERIES],
+        args.retrieval_runs,
+    )
+    if assistant.keyword_index is not None:
+        recorder.repeat(
+            "retrieval_keyword",
+            lambda: [assistant.keyword_index.search(query) for query in _QUERIES],
+            args.retrieval_runs,
+        )
+
+    with recorder.stage("consolidate_book_md"):
+        consolidate_book_md(book, "en")
+    if not args.skip_pdf:
+        with recorder.stage("to_pdf"):
+            to_pdf(book, "en")
+
+    with recorder.stage("process_chapters", concurrency=args.concurrency):
+        process_chapters(
+            save_to_markdown,
+            book,
+            prompt_template=CHECK_NAMES_PROMPT,
+            task_description="Benchmark: checking names...",
+            file_suffix="Name Consistency Check",
+            concurrency=args.concurrency,
+        )
+
+    return {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "chapters": args.chapters,
+            "words": args.words,
+            "seed": args.seed,
+            "concurrency": args.concurrency,
+            "llm_latency": args.llm_latency,
+            "llm_tokens_per_second": args.llm_tokens_per_second,
+        },
+        "stages": recorder.stages,
+    }
+
+
+def compare_reports(current: dict, baseline: dict) -> List[str]:
+    lines = [f"{'stage':<26}{'baseline':>12}{'current':>12}{'change':>12}"]
+    for name, stage in current["stages"].items():
+        before = baseline.get("stages", {}).get(name, {}).get("seconds")
+        after = stage.get("seconds")
+        if before is None or after is None:
+            change = "n/a"
+        else:
+            change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+        lines.append(
+            f"{name:<26}{before if before is not None else '-':>12}"
+            f"{after if after is not None else '-':>12}{change:>12}"
+        )
+    return lines
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chapters", type=int, default=20)
+    parser.add_argument("--words", type=int, default=2000, help="Words per chapter.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.0, help="Seconds to first token."
+    )
+    parser.add_argument("--llm-tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--retrieval-runs", type=int, default=5)
+    parser.add_argument(
+        "--vector-backend",
+        choices=("chroma", "flat"),
+        default="chroma",
+        help="Vector index backend to measure.",
+    )
+    parser.add_argument("--skip-pdf", action="store_true")
+    parser.add_argument("--workdir", type=Path, default=None)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    if args.workdir:
+        args.workdir.mkdir(parents=True, exist_ok=True)
+        report = run_benchmarks(args, args.workdir)
+    else:
+        with tempfile.TemporaryDirectory(prefix="storycraftr-bench-") as tmp:
+            report = run_benchmarks(args, Path(tmp))
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        print("\n".join(compare_reports(report, baseline)), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
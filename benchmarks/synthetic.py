@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+from storycraftr.init import init_structure_story
+
+_NAMES = ["Elowen", "Karsh", "Maelis", "Doran", "Ysolde", "Thessaly", "Orrin"]
+_PLACES = ["Veilmarch", "the Ashen Reach", "Port Calder", "the Glass Spire"]
+_WORDS = (
+    "the a of and to in was her his it that with as she he for on had at by "
+    "from they but not were said would which when there one could all been "
+    "night river storm lantern road silence stone memory harbour blade map "
+    "ancient bright cold quiet broken hidden slow distant secret heavy "
+    "walked whispered crossed remembered watched carried followed opened"
+).split()
+
+SYNTHETIC_BEHAVIOR = "You are a benchmarking assistant. Keep answers short."
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(8, 18))]
+    if rng.random() < 0.4:
+        words.insert(rng.randrange(len(words)), rng.choice(_NAMES))
+    if rng.random() < 0.2:
+        words.insert(rng.randrange(len(words)), rng.choice(_PLACES))
+    text = " ".join(words)
+    return text[0].upper() + text[1:] + "."
+
+
+def _prose(rng: random.Random, words: int) -> str:
+    paragraphs, paragraph, count = [], [], 0
+    while count < words:
+        sentence = _sentence(rng)
+        paragraph.append(sentence)
+        count += len(sentence.split())
+        if len(paragraph) >= rng.randint(3, 6):
+            paragraphs.append(" ".join(paragraph))
+            paragraph = []
+            if rng.random() < 0.15:
+                paragraphs.append("* * *")
+    if paragraph:
+        paragraphs.append(" ".join(paragraph))
+    return "\n\n".join(paragraphs)
+
+
+def generate_book(
+    book_path: str | Path,
+    chapters: int = 20,
+    words: int = 2000,
+    seed: int = 0,
+    llm_max_concurrency: int = 4,
+    vector_backend: str = "chroma",
+) -> Path:
+    """
+    Create a StoryCraftr project with ``chapters`` chapters of ~``words`` words.
+
+    The project uses the offline chat model and deterministic hash embeddings,
+    so it can be indexed and processed without network access. The same seed
+    always produces byte-identical files.
+    """
+    book_path = Path(book_path)
+    rng = random.Random(seed)
+    init_structure_story(
+        str(book_path),
+        license="CC BY",
+        primary_language="en",
+        alternate_languages=[],
+        default_author="Benchmark",
+        genre="fantasy",
+        behavior_content=SYNTHETIC_BEHAVIOR,
+        reference_author="",
+        cli_name="storycraftr",
+        llm_provider="fake",
+        llm_model="offline",
+        llm_endpoint="",
+        llm_api_key_env="",
+        temperature=0.0,
+        request_timeout=30,
+        embed_model="hash",
+        embed_device="cpu",
+        embed_cache_dir="",
+    )
+
+    config_path = book_path / "storycraftr.json"
+    config = json.loads(config_path.read_text(encoding="utf-8"))
+    config.update(
+        {
+            "multiple_answer": False,
+            "llm_max_concurrency": llm_max_concurrency,
+            "vector_backend": vector_backend,
+        }
+    )
+    config_path.write_text(json.dumps(config, indent=4), encoding="utf-8")
+
+    chapters_dir = book_path / "chapters"
+    for number in range(1, chapters + 1):
+        (chapters_dir / f"chapter-{number}.md").write_text(
+            f"# Chapter {number}\n\n{_prose(rng, words)}\n", encoding="utf-8"
+        )
+    for folder in ("outline", "worldbuilding"):
+        for path in sorted((book_path / folder).glob("*.md")):
+            title = path.stem.replace("_", " ").title()
+            path.write_text(
+                f"# {title}\n\n{_prose(rng, max(words // 4, 50))}\n", encoding="utf-8"
+            )
+    return book_path
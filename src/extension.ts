@@ -7,6 +7,7 @@ const decoder = new TextDecoder();
 const TRANSCRIPT_SCHEME = "storycraftr-transcript";
 
 interface StoryCraftrEvent {
+  seq?: number;
   event: string;
   payload: Record<string, any>;
 }
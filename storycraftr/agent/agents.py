@@ -1,23 +1,36 @@
 from __future__ import annotations
 
-import glob
+import asyncio
 import os
-import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
 from uuid import uuid4
 
-from langchain.schema import Document
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
 from langchain_core.messages import AIMessage, HumanMessage
-from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_community.vectorstores import Chroma
 from rich.console import Console
 from rich.progress import Progress
 
-from storycraftr.llm import build_chat_model, build_embedding_model
+from storycraftr.daemon import RemoteAssistant, connect_daemon
+from storycraftr.llm import (
+    ContextBudget,
+    build_chat_model,
+    build_embedding_model,
+    release_embedding_model,
+)
 from storycraftr.prompts.story.core import FORMAT_OUTPUT
 from storycraftr.graph import build_assistant_graph
 from storycraftr.utils.core import (
@@ -26,7 +39,35 @@ from storycraftr.utils.core import (
     llm_settings_from_config,
     embedding_settings_from_config,
 )
-from storycraftr.vectorstores import build_chroma_store
+from storycraftr.utils.memory_cache import BoundedCache, env_number
+from storycraftr.utils.prompt_log import DEFAULT_MAX_BYTES, configure_prompt_log
+from storycraftr.utils.timing import TurnTimer
+from storycraftr.vectorstores import build_vector_store, close_vector_store
+from storycraftr.vectorstores.chunking import MarkdownChunker
+from storycraftr.vectorstores.generations import (
+    Generation,
+    activate_generation,
+    create_generation,
+    current_generation,
+    open_generation,
+)
+from storycraftr.vectorstores.keyword import KEYWORD_INDEX_NAME, KeywordIndex
+from storycraftr.vectorstores.scope import (
+    MIN_LINES,
+    IndexScope,
+    ScanResult,
+    scan_markdown_files,
+)
+from storycraftr.vectorstores.manifest import (
+    FileEntry,
+    IndexManifest,
+    ManifestDiff,
+    content_hash,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from langchain_chroma import Chroma
+    from langchain_core.language_models.chat_models import BaseChatModel
 
 console = Console()
 
@@ -38,6 +79,26 @@ class ConversationThread:
     messages: List[HumanMessage | AIMessage] = field(default_factory=list)
 
 
+@dataclass
+class IndexBuild:
+    """Progress of an index build running on a background thread."""
+
+    done: int = 0
+    total: int = 0
+    error: Optional[BaseException] = None
+    finished: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def running(self) -> bool:
+        return not self.finished.is_set()
+
+    def update(self, done: int, total: int) -> None:
+        self.done, self.total = done, total
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self.finished.wait(timeout)
+
+
 @dataclass
 class LangChainAssistant:
     id: str
@@ -50,72 +111,280 @@ class LangChainAssistant:
     retriever: Optional[object] = None
     graph: Optional[object] = None
     last_documents: List[Document] = field(default_factory=list)
+    last_timings: Dict[str, object] = field(default_factory=dict)
+    keyword_index: Optional[KeywordIndex] = None
+    retrieval_k: int = 6
+    chunker: MarkdownChunker = field(default_factory=MarkdownChunker)
+    index_build: Optional[IndexBuild] = None
+    generation: Optional[Generation] = None
+    context_budget: Optional[ContextBudget] = None
+    _index_lock: threading.RLock = field(
+        default_factory=threading.RLock, init=False, repr=False
+    )
+    _closed: bool = field(default=False, init=False, repr=False)
+    _holders: int = field(default=0, init=False, repr=False)
+    _close_pending: bool = field(default=False, init=False, repr=False)
+    _hold_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
     graph: Optional[object] = None
 
-    def ensure_vector_store(self, force: bool = False) -> None:
+    def ensure_vector_store(
+        self,
+        force: bool = False,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
         """
         Ensure that the local Chroma store is populated with Markdown content.
+
+        With ``force`` every file is re-embedded into a new index generation
+        that replaces the live one only once it is complete (see
+        ``_rebuild_generation``). Otherwise the store is synchronised
+        incrementally against the index manifest, so only added or modified
+        files are re-chunked. ``progress(done, total)`` is called as chunks
+        are embedded.
+        """
+
+        with self._index_lock:
+            self._ensure_vector_store(force, progress)
+        self._activate_retriever()
+
+    def start_background_index(self, force: bool = False) -> IndexBuild:
+        """
+        Run ``ensure_vector_store`` on a background thread and return its
+        progress.
+
+        Until the build finishes, turns are answered from the keyword index
+        and whatever part of the vector store is already populated; the
+        retriever is replaced once the build completes.
         """
 
+        build = IndexBuild()
+        self.index_build = build
+        if self.retriever is None:
+            self._activate_retriever()
+
+        def run() -> None:
+            try:
+                with self.checkout():
+                    self.ensure_vector_store(force=force, progress=build.update)
+            except Exception as exc:
+                build.error = exc
+            finally:
+                build.finished.set()
+
+        threading.Thread(target=run, name=f"index-build:{self.id}", daemon=True).start()
+        return build
+
+    def _ensure_vector_store(
+        self, force: bool, progress: Optional[Callable[[int, int], None]]
+    ) -> None:
         if self.vector_store is None:
             raise RuntimeError(
                 "Vector store is not initialised. Ensure embeddings are available before continuing."
             )
 
-        persist_dir_str = getattr(
-            self.vector_store,
-            "_persist_directory",
-            str(Path(self.book_path) / "vector_store"),
+        manifest = IndexManifest.load(self.book_path)
+        self._follow_current_generation(manifest)
+        store_is_empty = self._store_is_empty()
+
+        embed_model = getattr(self.config, "embed_model", "")
+        generation = self.generation.name if self.generation else ""
+        full_rebuild = (
+            force
+            or store_is_empty
+            or not manifest.exists
+            or manifest.embed_model != embed_model
+            or manifest.chunker != self.chunker.signature
+            or manifest.generation != generation
+            or manifest.vector_backend != self._vector_backend
         )
-        persist_dir = Path(persist_dir_str)
-        if force:
-            reset_succeeded = False
-            try:
-                client = getattr(self.vector_store, "_client", None)
-                if client is not None and hasattr(client, "reset"):
-                    client.reset()
-                    reset_succeeded = True
-            except Exception:
-                reset_succeeded = False
-
-            if not reset_succeeded:
-                shutil.rmtree(persist_dir, ignore_errors=True)
-
-            self.vector_store = build_chroma_store(self.book_path, self.embeddings)
-            persist_dir_str = getattr(
-                self.vector_store,
-                "_persist_directory",
-                str(Path(self.book_path) / "vector_store"),
-            )
-            persist_dir = Path(persist_dir_str)
-
-        try:
-            needs_refresh = (
-                force or not persist_dir.exists() or not any(persist_dir.iterdir())
-            )
-        except OSError:
-            needs_refresh = True
 
-        if needs_refresh:
-            documents = load_markdown_documents(self.book_path)
+        if full_rebuild:
+            documents = self._load_documents()
+            if not documents and store_is_empty:
+                # A new project only holds short stubs; the next call indexes
+                # them once they grow.
+                return
             if not documents:
                 raise RuntimeError(
                     f"No Markdown documents available to index for project {self.book_path}."
                 )
-            else:
-                splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=1000, chunk_overlap=150
-                )
-                chunks = splitter.split_documents(documents)
-                try:
-                    self.vector_store.add_documents(chunks)
-                except Exception as exc:
-                    raise RuntimeError(
-                        f"Failed to populate vector store: {exc}"
-                    ) from exc
+            if not store_is_empty:
+                self._rebuild_generation(documents, manifest, progress)
+                return
+            # Nothing is served from an empty store, so fill it in place.
+            if self.keyword_index is not None:
+                self.keyword_index.clear()
+            manifest.clear()
+            manifest.embed_model = embed_model
+            manifest.chunker = self.chunker.signature
+            manifest.generation = generation
+            manifest.vector_backend = self._vector_backend
+            self._index_documents(documents, manifest, removed=[], progress=progress)
+        else:
+            if self.keyword_index is not None and not len(self.keyword_index):
+                self._backfill_keyword_index(manifest)
+            self.sync_vector_store(manifest, progress=progress)
+
+    def _rebuild_generation(
+        self,
+        documents: List[Document],
+        manifest: IndexManifest,
+        progress: Optional[Callable[[int, int], None]],
+    ) -> None:
+        """
+        Embed ``documents`` into a fresh generation and swap it in.
+
+        The live store keeps serving retrievals during the build. If the
+        build fails, the new generation is discarded and nothing changes;
+        otherwise the pointer is switched atomically and the old generation
+        is deleted once its in-flight readers are done.
+        """
+
+        generation = Generation(self.book_path, create_generation(self.book_path))
+        vector_store = keyword_index = None
+        try:
+            vector_store = _build_store(
+                self.book_path, self.embeddings, self.config, generation.subdir
+            )
+            if self.keyword_index is not None:
+                keyword_index = KeywordIndex(generation.path / KEYWORD_INDEX_NAME)
+            fresh = IndexManifest(
+                path=manifest.path,
+                embed_model=getattr(self.config, "embed_model", ""),
+                chunker=self.chunker.signature,
+                generation=generation.name,
+                vector_backend=self._vector_backend,
+            )
+            self._index_documents(
+                documents,
+                fresh,
+                removed=[],
+                progress=progress,
+                vector_store=vector_store,
+                keyword_index=keyword_index,
+            )
+        except Exception:
+            generation.retire(
+                cleanup=lambda: _close_indexes(vector_store, keyword_index)
+            )
+            raise
+
+        activate_generation(self.book_path, generation.name)
+        self._swap_generation(generation, vector_store, keyword_index)
+
+    def _follow_current_generation(self, manifest: IndexManifest) -> None:
+        """
+        Switch to the generation another process rebuilt into, so a forced
+        rebuild elsewhere is reopened here instead of embedded again.
+        """
+        if self.generation is None or not manifest.generation:
+            return
+        if manifest.generation == self.generation.name:
+            return
+        if current_generation(self.book_path) != manifest.generation:
+            return
+        generation = open_generation(self.book_path)
+        if generation.name != manifest.generation:
+            # Swapped again meanwhile; the manifest no longer matches.
+            generation.retire()
+            return
+        vector_store = _build_store(
+            self.book_path, self.embeddings, self.config, generation.subdir
+        )
+        keyword_index = None
+        if self.keyword_index is not None:
+            keyword_index = KeywordIndex(generation.path / KEYWORD_INDEX_NAME)
+        self._swap_generation(generation, vector_store, keyword_index)
+
+    def _swap_generation(
+        self,
+        generation: Generation,
+        vector_store,
+        keyword_index: Optional[KeywordIndex],
+    ) -> None:
+        """
+        Serve ``generation`` from now on. The previous store and keyword
+        index are closed once the old generation's in-flight readers finish.
+        """
+        previous = self.generation
+        old_store, old_keyword_index = self.vector_store, self.keyword_index
+        self.vector_store = vector_store
+        self.keyword_index = keyword_index
+        self._activate_retriever()
+        # Published last: a reader that leases the new generation is sure to
+        # see the new retriever and keyword index.
+        self.generation = generation
+        if previous is None:
+            _close_indexes(old_store, old_keyword_index)
+        else:
+            previous.retire(
+                cleanup=lambda: _close_indexes(old_store, old_keyword_index)
+            )
+
+    @property
+    def _vector_backend(self) -> str:
+        return getattr(self.config, "vector_backend", "chroma")
+
+    @contextmanager
+    def checkout(self) -> Iterator["LangChainAssistant"]:
+        """
+        Keep the assistant open for the duration of a ``with`` block.
 
+        ``close`` (including eviction from the assistant cache) is deferred
+        until the last checkout ends.
+        """
+        self.acquire()
         try:
-            self.retriever = self.vector_store.as_retriever(search_kwargs={"k": 6})
+            yield self
+        finally:
+            self.release()
+
+    def acquire(self) -> None:
+        with self._hold_lock:
+            self._holders += 1
+
+    def release(self) -> None:
+        with self._hold_lock:
+            self._holders -= 1
+            close = self._holders == 0 and self._close_pending
+        if close:
+            self._close_now()
+
+    def close(self) -> None:
+        """
+        Close the vector store and keyword index, then release the index
+        generation lease, the shared embedding model and its vector cache.
+
+        While the assistant is checked out this only marks it for closing;
+        the last ``release`` closes it.
+        """
+        with self._hold_lock:
+            if self._holders:
+                self._close_pending = True
+                return
+        self._close_now()
+
+    def _close_now(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        with self._index_lock:
+            _close_indexes(self.vector_store, self.keyword_index)
+        if self.generation is not None:
+            self.generation.retire()
+        if self.embeddings is not None:
+            release_embedding_model(self.embeddings)
+            close_cache = getattr(self.embeddings, "close", None)
+            if close_cache is not None:
+                close_cache()
+
+    def _activate_retriever(self) -> None:
+        try:
+            self.retriever = self.vector_store.as_retriever(
+                search_kwargs={"k": self.retrieval_k}
+            )
         except Exception as exc:
             raise RuntimeError(
                 f"Unable to construct retriever from vector store: {exc}"
@@ -124,6 +393,188 @@ class LangChainAssistant:
         self.graph = build_assistant_graph(self)
         self.last_documents = []
 
+    def sync_vector_store(
+        self,
+        manifest: Optional[IndexManifest] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> ManifestDiff:
+        """
+        Re-embed only the Markdown files whose content changed since the last
+        indexing run and drop the chunks of files that were removed.
+        """
+
+        manifest = manifest or IndexManifest.load(self.book_path)
+        documents = self._load_documents()
+        hashes = {
+            doc.metadata["source"]: content_hash(doc.page_content) for doc in documents
+        }
+        diff = manifest.diff(hashes)
+        if diff.is_empty:
+            return diff
+
+        touched = set(diff.added) | set(diff.changed)
+        self._index_documents(
+            [doc for doc in documents if doc.metadata["source"] in touched],
+            manifest,
+            removed=diff.changed + diff.removed,
+            progress=progress,
+        )
+        return diff
+
+    def _load_documents(self) -> List[Document]:
+        return load_markdown_documents(
+            self.book_path, IndexScope.from_config(self.config)
+        )
+
+    def _index_documents(
+        self,
+        documents: List[Document],
+        manifest: IndexManifest,
+        removed: List[str],
+        progress: Optional[Callable[[int, int], None]] = None,
+        vector_store: Optional[Chroma] = None,
+        keyword_index: Optional[KeywordIndex] = None,
+    ) -> None:
+        if vector_store is None:
+            vector_store = self.vector_store
+        if keyword_index is None:
+            keyword_index = self.keyword_index
+        # Chunk IDs depend on (source, heading path, content), so editing one
+        # section only replaces that section's chunks. Identical content
+        # (repeated boilerplate, copied scenes) is stored once under the
+        # chunk the manifest picks as its owner.
+        for source in removed:
+            manifest.files.pop(source, None)
+        chunks, _, entries = self._split_documents(documents, self.chunker)
+        manifest.files.update(entries)
+        stale_ids, new_ids = manifest.assign_owners()
+
+        wanted = set(new_ids)
+        new_chunks = self._owned_chunks(chunks, wanted)
+        missing = wanted - {chunk.metadata["chunk_id"] for chunk in new_chunks}
+        if missing:
+            # Ownership moved to a chunk of a file that was not re-read.
+            sources = [
+                source
+                for source, entry in manifest.files.items()
+                if missing.intersection(entry.chunk_ids)
+            ]
+            others, _, _ = self._split_documents(
+                [
+                    doc
+                    for doc in self._load_documents()
+                    if doc.metadata["source"] in sources
+                ],
+                self.chunker,
+            )
+            new_chunks.extend(self._owned_chunks(others, missing))
+
+        with _deferred_writes(vector_store):
+            try:
+                if stale_ids:
+                    vector_store.delete(ids=stale_ids)
+            except Exception as exc:
+                raise RuntimeError(f"Failed to remove stale chunks: {exc}") from exc
+            if stale_ids and keyword_index is not None:
+                keyword_index.delete(stale_ids)
+
+            if new_chunks:
+                new_ids = [chunk.metadata["chunk_id"] for chunk in new_chunks]
+                # Keyword indexing needs no embeddings, so it is complete
+                # before the first batch is embedded and can answer while the
+                # rest runs.
+                if keyword_index is not None:
+                    keyword_index.add_documents(new_chunks, new_ids)
+                total = len(new_chunks)
+                for start in range(0, total, INDEX_BATCH_SIZE):
+                    end = min(start + INDEX_BATCH_SIZE, total)
+                    try:
+                        vector_store.add_documents(
+                            new_chunks[start:end], ids=new_ids[start:end]
+                        )
+                    except Exception as exc:
+                        raise RuntimeError(
+                            f"Failed to populate vector store: {exc}"
+                        ) from exc
+                    if progress is not None:
+                        progress(end, total)
+        manifest.save()
+
+    @staticmethod
+    def _split_documents(
+        documents: List[Document], chunker: Optional[MarkdownChunker] = None
+    ):
+        """Chunk documents along their Markdown structure with stable IDs."""
+        chunker = chunker or MarkdownChunker()
+        chunks: List[Document] = []
+        ids: List[str] = []
+        entries: Dict[str, FileEntry] = {}
+        for document in documents:
+            entry = FileEntry(hash=content_hash(document.page_content))
+            for chunk in chunker.split_documents([document]):
+                chunks.append(chunk)
+                ids.append(chunk.metadata["chunk_id"])
+                entry.chunk_ids.append(chunk.metadata["chunk_id"])
+                entry.chunk_keys.append(chunk.metadata["content_hash"])
+            entries[document.metadata["source"]] = entry
+        return chunks, ids, entries
+
+    @staticmethod
+    def _owned_chunks(chunks: List[Document], wanted: set) -> List[Document]:
+        owned: Dict[str, Document] = {}
+        for chunk in chunks:
+            identifier = chunk.metadata["chunk_id"]
+            if identifier in wanted:
+                owned.setdefault(identifier, chunk)
+        return list(owned.values())
+
+    def _backfill_keyword_index(self, manifest: IndexManifest) -> None:
+        """
+        Populate an empty keyword index for files the manifest already covers.
+
+        Chunk IDs are deterministic, so this only re-splits text and never
+        calls the embedding model; files that changed are handled by the
+        regular sync afterwards.
+        """
+        documents = [
+            doc
+            for doc in self._load_documents()
+            if manifest.files.get(doc.metadata["source"])
+            and manifest.files[doc.metadata["source"]].hash
+            == content_hash(doc.page_content)
+        ]
+        chunks, _, _ = self._split_documents(documents, self.chunker)
+        owned = self._owned_chunks(chunks, set(manifest.stored_ids))
+        self.keyword_index.add_documents(
+            owned, [chunk.metadata["chunk_id"] for chunk in owned]
+        )
+
+    def _persist_dir(self) -> Path:
+        return Path(
+            getattr(
+                self.vector_store,
+                "_persist_directory",
+                str(Path(self.book_path) / "vector_store"),
+            )
+        )
+
+    def _store_is_empty(self) -> bool:
+        persist_dir = self._persist_dir()
+        try:
+            if not persist_dir.exists() or not any(persist_dir.iterdir()):
+                return True
+        except OSError:
+            return True
+        if hasattr(self.vector_store, "__len__"):
+            return len(self.vector_store) == 0
+        collection = getattr(self.vector_store, "_collection", None)
+        if collection is None:
+            return False
+        try:
+            return collection.count() == 0
+        except Exception:
+            return True
+
     @property
     def system_prompt(self) -> str:
         format_prompt = FORMAT_OUTPUT.format(
@@ -137,60 +588,213 @@ class LangChainAssistant:
         return f"{self.behavior.strip()}\n\n{meta}{format_prompt}"
 
 
-_ASSISTANT_CACHE: Dict[str, LangChainAssistant] = {}
-_THREADS: Dict[str, ConversationThread] = {}
+EMBEDDING_CACHE_PATH = Path(".storycraftr") / "embedding-cache.sqlite"
+INDEX_BATCH_SIZE = 64
+LLM_CACHE_PATH = Path(".storycraftr") / "llm-cache.sqlite"
+
+# Process-wide cache limits; long-running hosts (daemon, sub-agents) can
+# tune them through the environment or ``configure_caches``.
+ASSISTANT_CACHE_SIZE = int(env_number("STORYCRAFTR_ASSISTANT_CACHE_SIZE", 8))
+ASSISTANT_CACHE_TTL = env_number("STORYCRAFTR_ASSISTANT_CACHE_TTL", 0)
+ASSISTANT_CACHE_BYTES = int(env_number("STORYCRAFTR_ASSISTANT_CACHE_BYTES", 0))
+THREAD_CACHE_SIZE = int(env_number("STORYCRAFTR_THREAD_CACHE_SIZE", 256))
+THREAD_CACHE_TTL = env_number("STORYCRAFTR_THREAD_CACHE_TTL", 0)
+THREAD_CACHE_BYTES = int(env_number("STORYCRAFTR_THREAD_CACHE_BYTES", 64 << 20))
+
+
+def _close_evicted(_key: str, assistant) -> None:
+    close = getattr(assistant, "close", None)
+    if close is not None:
+        close()
+
+
+def _assistant_size(assistant) -> int:
+    # Chroma's HNSW segments and the flat store's matrix are loaded into
+    # memory, so the index generation's files approximate what the assistant
+    # keeps resident. The shared embedding model is not counted.
+    documents = getattr(assistant, "last_documents", None) or []
+    size = sum(len(doc.page_content.encode("utf-8")) for doc in documents)
+    generation = getattr(assistant, "generation", None)
+    if generation is not None:
+        size += _directory_size(generation.path)
+    return size
+
+
+def _directory_size(path: Path) -> int:
+    total = 0
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                total += _directory_size(Path(entry.path))
+            else:
+                total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return total
+
+
+def hold_assistant(assistant):
+    """Check out ``assistant`` for a ``with`` block; remote ones need no hold."""
+    checkout = getattr(assistant, "checkout", None)
+    return checkout() if checkout is not None else nullcontext(assistant)
+
+
+def _thread_size(thread: ConversationThread) -> int:
+    return sum(len(str(message.content).encode("utf-8")) for message in thread.messages)
+
+
+_ASSISTANT_CACHE: BoundedCache[
+    str, LangChainAssistant | RemoteAssistant
+] = BoundedCache(
+    max_entries=ASSISTANT_CACHE_SIZE,
+    ttl=ASSISTANT_CACHE_TTL,
+    max_bytes=ASSISTANT_CACHE_BYTES,
+    sizeof=_assistant_size,
+    on_evict=_close_evicted,
+)
+_THREADS: BoundedCache[str, ConversationThread] = BoundedCache(
+    max_entries=THREAD_CACHE_SIZE,
+    ttl=THREAD_CACHE_TTL,
+    max_bytes=THREAD_CACHE_BYTES,
+    sizeof=_thread_size,
+)
+
 
+def configure_caches(
+    assistants: Optional[int] = None,
+    assistant_ttl: Optional[float] = None,
+    assistant_bytes: Optional[int] = None,
+    threads: Optional[int] = None,
+    thread_ttl: Optional[float] = None,
+    thread_bytes: Optional[int] = None,
+) -> None:
+    """
+    Adjust the assistant and thread cache limits (``0`` disables a limit).
 
-def load_markdown_documents(book_path: str) -> List[Document]:
+    Evicted assistants are closed, which stops their Chroma client and
+    releases their index generation and embedding model; assistants that are
+    checked out (an open chat, a streaming turn) close when released.
+    """
+
+    _ASSISTANT_CACHE.configure(
+        max_entries=assistants, ttl=assistant_ttl, max_bytes=assistant_bytes
+    )
+    _THREADS.configure(max_entries=threads, ttl=thread_ttl, max_bytes=thread_bytes)
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Return entry counts, approximate sizes and eviction counters."""
+
+    return {
+        "assistants": _ASSISTANT_CACHE.stats().as_dict(),
+        "threads": _THREADS.stats().as_dict(),
+    }
+
+
+def _deferred_writes(vector_store):
+    """Batch a store's writes into one when it supports it (flat backend)."""
+    defer = getattr(vector_store, "deferred_writes", None)
+    return defer() if defer is not None else nullcontext()
+
+
+def _close_indexes(vector_store, keyword_index: Optional[KeywordIndex]) -> None:
+    try:
+        close_vector_store(vector_store)
+    except Exception as exc:  # pragma: no cover - best effort cleanup
+        console.print(
+            f"[yellow]Warning: closing the vector store failed ({exc}).[/yellow]"
+        )
+    if keyword_index is not None:
+        keyword_index.close()
+
+
+def _build_store(book_path: str, embeddings, config, persist_subdir: str):
+    return build_vector_store(
+        book_path,
+        embeddings,
+        backend=getattr(config, "vector_backend", "chroma"),
+        persist_subdir=persist_subdir,
+        dtype=getattr(config, "vector_dtype", "float32"),
+    )
+
+
+def load_markdown_documents(
+    book_path: str,
+    scope: Optional[IndexScope] = None,
+    report: Optional[ScanResult] = None,
+) -> List[Document]:
     """
     Load Markdown files from the project for indexing.
+
+    Files are selected by ``scope`` (the default include/exclude globs when
+    omitted). When ``report`` is given it receives the indexed sources and
+    every skipped path with the reason it was skipped.
     """
 
-    patterns = [
-        os.path.join(book_path, "**", "*.md"),
-    ]
+    scan = scan_markdown_files(book_path, scope or IndexScope())
     documents: List[Document] = []
 
-    for pattern in patterns:
-        for file_path in glob.glob(pattern, recursive=True):
-            if "/vector_store/" in file_path.replace("\\", "/"):
-                continue
-            try:
-                with open(file_path, "r", encoding="utf-8") as handle:
-                    lines = handle.readlines()
-                if len(lines) <= 3:
-                    continue
-                relative = str(Path(file_path).relative_to(book_path))
-                documents.append(
-                    Document(
-                        page_content="".join(lines),
-                        metadata={"source": relative},
-                    )
-                )
-            except (UnicodeDecodeError, FileNotFoundError):
-                console.print(
-                    f"[yellow]Skipping unreadable file for embeddings: {file_path}[/yellow]"
-                )
+    for relative in scan.included:
+        file_path = os.path.join(book_path, relative)
+        try:
+            with open(file_path, "r", encoding="utf-8") as handle:
+                lines = handle.readlines()
+        except (UnicodeDecodeError, FileNotFoundError):
+            scan.excluded[relative] = "unreadable"
+            console.print(
+                f"[yellow]Skipping unreadable file for embeddings: {file_path}[/yellow]"
+            )
+            continue
+        if len(lines) < MIN_LINES:
+            scan.excluded[relative] = f"fewer than {MIN_LINES} lines"
+            continue
+        documents.append(
+            Document(page_content="".join(lines), metadata={"source": relative})
+        )
 
+    if report is not None:
+        report.included = [doc.metadata["source"] for doc in documents]
+        report.excluded = scan.excluded
     return documents
 
 
-def create_or_get_assistant(book_path: str) -> LangChainAssistant:
+def create_or_get_assistant(
+    book_path: str, use_daemon: bool = True, background_index: bool = False
+) -> LangChainAssistant | RemoteAssistant:
     """
     Initialize (or fetch) the LangChain-powered assistant for a project.
+
+    When a StoryCraftr daemon is running (and ``use_daemon`` is set) a
+    ``RemoteAssistant`` bound to the daemon's warm instance is returned
+    instead, so no models or indexes are loaded in this process.
+
+    With ``background_index`` the vector store is built on a background
+    thread (see ``LangChainAssistant.start_background_index``) and the
+    assistant is returned immediately.
     """
 
     if not book_path:
         raise ValueError("book_path is required to create an assistant.")
 
     book_path = str(Path(book_path).resolve())
-    if book_path in _ASSISTANT_CACHE:
-        return _ASSISTANT_CACHE[book_path]
+    cached = _ASSISTANT_CACHE.get(book_path)
+    if cached is not None:
+        return cached
 
     config = load_book_config(book_path)
     if not config:
         raise RuntimeError("Unable to load project configuration.")
 
+    daemon = connect_daemon() if use_daemon else None
+    if daemon is not None:
+        remote = daemon.attach(book_path, config)
+        _ASSISTANT_CACHE[book_path] = remote
+        return remote
+
     behavior_path = Path(book_path) / "behaviors" / "default.txt"
     if behavior_path.exists():
         behavior_text = behavior_path.read_text(encoding="utf-8")
@@ -200,12 +804,26 @@ def create_or_get_assistant(book_path: str) -> LangChainAssistant:
             "Respond in markdown, keep outputs structured, and respect the requested tone."
         )
 
+    configure_prompt_log(
+        book_path,
+        max_bytes=int(getattr(config, "prompt_log_max_bytes", DEFAULT_MAX_BYTES)),
+        compress=bool(getattr(config, "prompt_log_compress", True)),
+    )
+
     llm_settings = llm_settings_from_config(config)
     embedding_settings = embedding_settings_from_config(config)
+    if getattr(config, "embed_vector_cache", True):
+        embedding_settings.vector_cache_path = str(
+            Path(book_path) / EMBEDDING_CACHE_PATH
+        )
+
+    if llm_settings.response_cache_mode != "off":
+        llm_settings.response_cache_path = str(Path(book_path) / LLM_CACHE_PATH)
 
     llm = build_chat_model(llm_settings)
     embeddings = build_embedding_model(embedding_settings)
-    vector_store = build_chroma_store(book_path, embeddings)
+    generation = open_generation(book_path)
+    vector_store = _build_store(book_path, embeddings, config, generation.subdir)
 
     assistant = LangChainAssistant(
         id=f"assistant:{Path(book_path).name}",
@@ -215,13 +833,35 @@ def create_or_get_assistant(book_path: str) -> LangChainAssistant:
         embeddings=embeddings,
         vector_store=vector_store,
         behavior=behavior_text,
+        chunker=MarkdownChunker.from_config(config),
+        generation=generation,
+        context_budget=ContextBudget.from_config(config),
     )
-    assistant.ensure_vector_store()
+    if getattr(config, "hybrid_retrieval", True):
+        assistant.keyword_index = KeywordIndex(generation.path / KEYWORD_INDEX_NAME)
+    if background_index:
+        assistant.start_background_index()
+    else:
+        assistant.ensure_vector_store()
 
     _ASSISTANT_CACHE[book_path] = assistant
     return assistant
 
 
+def close_assistant(book_path: str) -> None:
+    """
+    Drop the cached assistant of ``book_path`` and release what it holds.
+
+    Batch jobs that visit many projects in one process call this after each
+    book; the shared embedding model stays loaded for the next one.
+    """
+
+    assistant = _ASSISTANT_CACHE.pop(str(Path(book_path).resolve()), None)
+    close = getattr(assistant, "close", None)
+    if close is not None:
+        close()
+
+
 def get_thread(book_path: str) -> ConversationThread:
     """
     Create a new in-memory conversation thread for the project.
@@ -243,32 +883,34 @@ def _resolve_thread(thread_id: str, book_path: str) -> ConversationThread:
     return thread
 
 
-def create_message(
+END_OF_RESPONSE = "END_OF_RESPONSE"
+
+
+def _prepare_payload(
     book_path: str,
-    thread_id: str,
     content: str,
     assistant: LangChainAssistant,
-    file_path: Optional[str] = None,
-    progress: Optional[Progress] = None,
-    task_id=None,
-    force_single_answer: bool = False,
-) -> str:
+    thread: ConversationThread,
+    file_path: Optional[str],
+    force_single_answer: bool,
+    timer: TurnTimer,
+) -> Dict[str, object]:
     """
-    Generate a response from the assistant using the shared LangChain pipeline.
+    Build the graph input for one turn: the question, the text of
+    ``file_path``, a snapshot of the thread history and the turn's
+    ``timer``. The graph fits the file and history into the context window
+    (see ``ContextBudget``).
     """
-
-    assistant = assistant or create_or_get_assistant(book_path)
-    thread = _resolve_thread(thread_id, book_path)
     config = assistant.config
 
+    file_text = None
     if file_path and os.path.exists(file_path):
         file_text = Path(file_path).read_text(encoding="utf-8")
-        content = f"{content}\n\nHere is the existing content to adjust:\n{file_text}"
 
     if config.multiple_answer and not force_single_answer:
         content = (
             "Divide the answer into three titled sections (Part 1, Part 2, Part 3). "
-            "Conclude the final section with the token END_OF_RESPONSE. " + content
+            f"Conclude the final section with the token {END_OF_RESPONSE}. " + content
         )
 
     prompt_body = FORMAT_OUTPUT.format(
@@ -277,47 +919,534 @@ def create_message(
     )
     prompt_text = f"{prompt_body}\n\n{content}"
 
-    prompt_with_hash = generate_prompt_with_hash(
-        prompt_text,
-        datetime.now().strftime("%B %d, %Y"),
-        book_path=book_path,
-    )
+    with timer.span("prompt_log"):
+        prompt_with_hash = generate_prompt_with_hash(
+            prompt_text,
+            datetime.now().strftime("%B %d, %Y"),
+            book_path=book_path,
+            deterministic=getattr(config, "deterministic_prompts", False)
+            or getattr(config, "llm_cache", "off") != "off",
+        )
 
     if not assistant.graph:
         raise RuntimeError("Assistant graph is not initialised.")
+    return {
+        "question": prompt_with_hash,
+        "file_text": file_text,
+        "history": list(thread.messages),
+        "timer": timer,
+    }
 
-    result = assistant.graph.invoke({"question": prompt_with_hash})
-    if isinstance(result, dict):
-        response_text = result.get("answer", "")
-        documents = result.get("documents") or []
-    else:
-        response_text = str(result)
-        documents = []
 
+def _finish_turn(
+    assistant: LangChainAssistant,
+    thread: ConversationThread,
+    question: str,
+    response_text: str,
+    documents: List[Document],
+    timer: TurnTimer,
+    progress: Optional[Progress],
+    task_id,
+) -> None:
     assistant.last_documents = documents
+    assistant.last_timings = timer.as_dict()
+    thread.messages.extend(
+        [HumanMessage(content=question), AIMessage(content=response_text)]
+    )
+    # Turns grow the thread in place; re-measure it against the byte budget
+    # and keep callers that hold their own reference from looking idle.
+    _THREADS.touch(thread.id)
+    _ASSISTANT_CACHE.touch(assistant.book_path)
+    _complete_task(progress, task_id)
 
-    user_message = HumanMessage(content=prompt_with_hash)
-    assistant_message = AIMessage(content=response_text)
-    thread.messages.extend([user_message, assistant_message])
 
+def _complete_task(progress: Optional[Progress], task_id) -> None:
     if progress and task_id is not None:
         try:
             progress.update(task_id, completed=1)
         except Exception as exc:
             console.print(f"[yellow]Warning: progress update failed ({exc}).[/yellow]")
 
-    return response_text.replace("END_OF_RESPONSE", "").strip()
+
+class _AnswerCleaner:
+    """
+    Incrementally strip surrounding whitespace and the END_OF_RESPONSE
+    marker from answer deltas.
+    """
+
+    def __init__(self):
+        self.raw_parts: List[str] = []
+        self.emitted: List[str] = []
+        self.documents: List[Document] = []
+        self.timings: Dict[str, object] = {}
+        self._pending = ""
+        self._hold_back = len(END_OF_RESPONSE) - 1
+
+    def feed(self, chunk) -> Optional[str]:
+        if not isinstance(chunk, dict):
+            chunk = {"answer": str(chunk)}
+        if chunk.get("documents"):
+            self.documents = list(chunk["documents"])
+        if chunk.get("timings"):
+            self.timings = dict(chunk["timings"])
+        delta = chunk.get("answer")
+        if not delta:
+            return None
+        self.raw_parts.append(delta)
+        pending = (self._pending + delta).replace(END_OF_RESPONSE, "")
+        if not self.emitted:
+            pending = pending.lstrip()
+        # Keep a possible partial marker and trailing whitespace buffered.
+        ready = len(pending[: max(len(pending) - self._hold_back, 0)].rstrip())
+        if ready <= 0:
+            self._pending = pending
+            return None
+        piece, self._pending = pending[:ready], pending[ready:]
+        self.emitted.append(piece)
+        return piece
+
+    def finish(self) -> Optional[str]:
+        tail = self._pending.replace(END_OF_RESPONSE, "").rstrip()
+        if not self.emitted:
+            tail = tail.lstrip()
+        if not tail:
+            return None
+        self.emitted.append(tail)
+        return tail
+
+
+class MessageStream:
+    """
+    Iterator over the answer deltas of a streamed assistant turn.
+
+    Deltas are cleaned the same way as ``create_message`` results: leading and
+    trailing whitespace and the END_OF_RESPONSE marker never reach the caller.
+    Once exhausted, ``text`` holds the complete answer, ``documents`` the
+    retrieved context and ``timings`` the per-stage latencies of the turn.
+    The assistant stays checked out until the stream is exhausted or
+    ``close`` is called.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterator[dict],
+        on_complete: Callable[[str, str, list], None],
+        timer: Optional[TurnTimer] = None,
+        release: Optional[Callable[[], None]] = None,
+    ):
+        self._chunks = chunks
+        self._on_complete = on_complete
+        self._timer = timer
+        self._release = release
+        self._consumed = False
+        self.text = ""
+        self.documents: List[Document] = []
+        self.timings: Dict[str, object] = {}
+
+    def __iter__(self) -> Iterator[str]:
+        if self._consumed:
+            raise RuntimeError("A message stream can only be consumed once.")
+        self._consumed = True
+
+        try:
+            cleaner = _AnswerCleaner()
+            for chunk in self._chunks:
+                piece = cleaner.feed(chunk)
+                if piece:
+                    yield piece
+            tail = cleaner.finish()
+            if tail:
+                yield tail
+            self._complete(cleaner)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Give the assistant back; needed only when abandoning the stream."""
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def _complete(self, cleaner: _AnswerCleaner) -> None:
+        self.text = "".join(cleaner.emitted)
+        self.documents = cleaner.documents
+        self.timings = self._timer.as_dict() if self._timer else cleaner.timings
+        self._on_complete(self.text, "".join(cleaner.raw_parts), cleaner.documents)
+
+
+class AsyncMessageStream(MessageStream):
+    """``MessageStream`` over an async chunk iterator (``async for``)."""
+
+    def __init__(
+        self,
+        chunks: AsyncIterator[dict],
+        on_complete: Callable[[str, str, list], None],
+        timer: Optional[TurnTimer] = None,
+        release: Optional[Callable[[], None]] = None,
+    ):
+        super().__init__(chunks, on_complete, timer, release)
+
+    def __iter__(self) -> Iterator[str]:
+        raise TypeError("Use 'async for' to consume an AsyncMessageStream.")
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        if self._consumed:
+            raise RuntimeError("A message stream can only be consumed once.")
+        self._consumed = True
+
+        try:
+            cleaner = _AnswerCleaner()
+            async for chunk in self._chunks:
+                piece = cleaner.feed(chunk)
+                if piece:
+                    yield piece
+            tail = cleaner.finish()
+            if tail:
+                yield tail
+            self._complete(cleaner)
+        finally:
+            self.close()
+
+
+def stream_message(
+    book_path: str,
+    thread_id: str,
+    content: str,
+    assistant: LangChainAssistant,
+    file_path: Optional[str] = None,
+    progress: Optional[Progress] = None,
+    task_id=None,
+    force_single_answer: bool = False,
+) -> MessageStream:
+    """
+    Start an assistant turn and return a stream of answer deltas.
+
+    The prompt (including ``file_path`` contents) is assembled immediately, so
+    callers may overwrite ``file_path`` while consuming the stream.
+    """
+
+    assistant = assistant or create_or_get_assistant(book_path)
+    if isinstance(assistant, RemoteAssistant):
+        chunks = assistant.stream(thread_id, content, file_path, force_single_answer)
+
+        def on_remote_complete(text: str, raw_text: str, documents: List[Document]):
+            assistant.last_documents = documents
+            assistant.last_timings = stream.timings
+            _complete_task(progress, task_id)
+
+        stream = MessageStream(chunks, on_remote_complete)
+        return stream
+
+    thread = _resolve_thread(thread_id, book_path)
+    timer = TurnTimer()
+    assistant.acquire()
+    try:
+        payload = _prepare_payload(
+            book_path, content, assistant, thread, file_path, force_single_answer, timer
+        )
+    except BaseException:
+        assistant.release()
+        raise
+    question = payload["question"]
+
+    def on_complete(text: str, raw_text: str, documents: List[Document]) -> None:
+        _finish_turn(
+            assistant, thread, question, raw_text, documents, timer, progress, task_id
+        )
+
+    return MessageStream(
+        assistant.graph.stream(payload, config=timer.config()),
+        on_complete,
+        timer,
+        release=assistant.release,
+    )
+
+
+def create_message(
+    book_path: str,
+    thread_id: str,
+    content: str,
+    assistant: LangChainAssistant,
+    file_path: Optional[str] = None,
+    progress: Optional[Progress] = None,
+    task_id=None,
+    force_single_answer: bool = False,
+    on_token: Optional[Callable[[str], None]] = None,
+) -> str:
+    """
+    Generate a response from the assistant using the shared LangChain pipeline.
+
+    When ``on_token`` is given the answer is streamed and each delta is passed
+    to the callback as soon as the model produces it.
+    """
+
+    assistant = assistant or create_or_get_assistant(book_path)
+    if on_token is not None or isinstance(assistant, RemoteAssistant):
+        stream = stream_message(
+            book_path,
+            thread_id=thread_id,
+            content=content,
+            assistant=assistant,
+            file_path=file_path,
+            progress=progress,
+            task_id=task_id,
+            force_single_answer=force_single_answer,
+        )
+        for delta in stream:
+            if on_token is not None:
+                on_token(delta)
+        return stream.text
+
+    thread = _resolve_thread(thread_id, book_path)
+    timer = TurnTimer()
+    with assistant.checkout():
+        payload = _prepare_payload(
+            book_path, content, assistant, thread, file_path, force_single_answer, timer
+        )
+        question = payload["question"]
+
+        result = assistant.graph.invoke(payload, config=timer.config())
+        if isinstance(result, dict):
+            response_text = result.get("answer", "")
+            documents = result.get("documents") or []
+        else:
+            response_text = str(result)
+            documents = []
+
+        _finish_turn(
+            assistant,
+            thread,
+            question,
+            response_text,
+            documents,
+            timer,
+            progress,
+            task_id,
+        )
+
+    return response_text.replace(END_OF_RESPONSE, "").strip()
 
 
-def update_agent_files(book_path: str, assistant: Optional[LangChainAssistant] = None):
+async def astream_message(
+    book_path: str,
+    thread_id: str,
+    content: str,
+    assistant: LangChainAssistant,
+    file_path: Optional[str] = None,
+    progress: Optional[Progress] = None,
+    task_id=None,
+    force_single_answer: bool = False,
+) -> AsyncMessageStream:
     """
-    Rebuild the embedded knowledge base for the assistant.
+    Async counterpart of ``stream_message``; consume the result with
+    ``async for``. Remote (daemon) assistants are streamed from a worker
+    thread.
+    """
+
+    assistant = assistant or await asyncio.to_thread(create_or_get_assistant, book_path)
+    if isinstance(assistant, RemoteAssistant):
+        chunks = await asyncio.to_thread(
+            assistant.stream, thread_id, content, file_path, force_single_answer
+        )
+
+        def on_remote_complete(text: str, raw_text: str, documents: List[Document]):
+            assistant.last_documents = documents
+            assistant.last_timings = stream.timings
+            _complete_task(progress, task_id)
+
+        stream = AsyncMessageStream(_iterate_in_thread(chunks), on_remote_complete)
+        return stream
+
+    thread = _resolve_thread(thread_id, book_path)
+    timer = TurnTimer()
+    assistant.acquire()
+    try:
+        # Reads ``file_path`` and appends to the prompt log.
+        payload = await asyncio.to_thread(
+            _prepare_payload,
+            book_path,
+            content,
+            assistant,
+            thread,
+            file_path,
+            force_single_answer,
+            timer,
+        )
+    except BaseException:
+        assistant.release()
+        raise
+    question = payload["question"]
+
+    def on_complete(text: str, raw_text: str, documents: List[Document]) -> None:
+        _finish_turn(
+            assistant, thread, question, raw_text, documents, timer, progress, task_id
+        )
+
+    return AsyncMessageStream(
+        assistant.graph.astream(payload, config=timer.config()),
+        on_complete,
+        timer,
+        release=assistant.release,
+    )
+
+
+async def _iterate_in_thread(iterator: Iterator[dict]) -> AsyncIterator[dict]:
+    """Drain a blocking iterator (a daemon socket) from a worker thread."""
+    done = object()
+    while True:
+        item = await asyncio.to_thread(next, iterator, done)
+        if item is done:
+            return
+        yield item
+
+
+async def acreate_message(
+    book_path: str,
+    thread_id: str,
+    content: str,
+    assistant: LangChainAssistant,
+    file_path: Optional[str] = None,
+    progress: Optional[Progress] = None,
+    task_id=None,
+    force_single_answer: bool = False,
+    on_token: Optional[Callable[[str], None]] = None,
+) -> str:
+    """
+    Async counterpart of ``create_message``.
+
+    Retrieval and generation run on the event loop through the graph's
+    ``ainvoke``/``astream``, so many turns can overlap in a single thread;
+    bound them with a semaphore (see ``aprocess_chapters``).
+    """
+
+    assistant = assistant or await asyncio.to_thread(create_or_get_assistant, book_path)
+    if on_token is not None or isinstance(assistant, RemoteAssistant):
+        stream = await astream_message(
+            book_path,
+            thread_id=thread_id,
+            content=content,
+            assistant=assistant,
+            file_path=file_path,
+            progress=progress,
+            task_id=task_id,
+            force_single_answer=force_single_answer,
+        )
+        async for delta in stream:
+            if on_token is not None:
+                on_token(delta)
+        return stream.text
+
+    thread = _resolve_thread(thread_id, book_path)
+    timer = TurnTimer()
+    with assistant.checkout():
+        payload = await asyncio.to_thread(
+            _prepare_payload,
+            book_path,
+            content,
+            assistant,
+            thread,
+            file_path,
+            force_single_answer,
+            timer,
+        )
+        question = payload["question"]
+
+        result = await assistant.graph.ainvoke(payload, config=timer.config())
+        if isinstance(result, dict):
+            response_text = result.get("answer", "")
+            documents = result.get("documents") or []
+        else:
+            response_text = str(result)
+            documents = []
+
+        _finish_turn(
+            assistant,
+            thread,
+            question,
+            response_text,
+            documents,
+            timer,
+            progress,
+            task_id,
+        )
+
+    return response_text.replace(END_OF_RESPONSE, "").strip()
+
+
+@dataclass
+class IndexStats:
+    """What ``index_stats`` found: indexed files, skipped paths and duplicates."""
+
+    included: List[str]
+    excluded: Dict[str, str]
+    chunks: int
+    duplicates: Dict[str, List[str]]
+    pending: ManifestDiff
+
+    @property
+    def unique_chunks(self) -> int:
+        return self.chunks - sum(len(s) - 1 for s in self.duplicates.values())
+
+
+def index_stats(book_path: str) -> IndexStats:
+    """
+    Report the index scope of a project without embedding anything.
+
+    Applies the configured include/exclude globs, chunks the selected files
+    and groups chunks whose content appears more than once.
+    """
+
+    config = load_book_config(book_path)
+    if not config:
+        raise RuntimeError("Unable to load project configuration.")
+    report = ScanResult()
+    documents = load_markdown_documents(
+        book_path, IndexScope.from_config(config), report
+    )
+    chunks, _, entries = LangChainAssistant._split_documents(
+        documents, MarkdownChunker.from_config(config)
+    )
+
+    occurrences: Dict[str, List[str]] = {}
+    for chunk in chunks:
+        occurrences.setdefault(chunk.metadata["content_hash"], []).append(
+            chunk.metadata["source"]
+        )
+    duplicates = {
+        key: sources for key, sources in occurrences.items() if len(sources) > 1
+    }
+
+    manifest = IndexManifest.load(book_path)
+    pending = manifest.diff({source: entry.hash for source, entry in entries.items()})
+    return IndexStats(
+        included=report.included,
+        excluded=report.excluded,
+        chunks=len(chunks),
+        duplicates=duplicates,
+        pending=pending,
+    )
+
+
+def update_agent_files(
+    book_path: str,
+    assistant: Optional[LangChainAssistant] = None,
+    force: bool = False,
+):
+    """
+    Refresh the embedded knowledge base for the assistant.
+
+    Only files that changed since the last run are re-embedded unless
+    ``force`` requests a full rebuild.
     """
 
     assistant = assistant or _ASSISTANT_CACHE.get(str(Path(book_path).resolve()))
     if not assistant:
         assistant = create_or_get_assistant(book_path)
-    assistant.ensure_vector_store(force=True)
+    with hold_assistant(assistant):
+        assistant.ensure_vector_store(force=force)
+    if isinstance(assistant, RemoteAssistant):
+        # The daemon refreshes its index and resets its own threads.
+        return
 
     # Reset active threads for this project to avoid stale context.
     stale_ids = [
@@ -329,18 +1458,7 @@ def update_agent_files(book_path: str, assistant: Optional[LangChainAssistant] =
         _THREADS.pop(thread_id, None)
 
 
-def process_chapters(
-    save_to_markdown,
-    book_path: str,
-    prompt_template: str,
-    task_description: str,
-    file_suffix: str,
-    **prompt_kwargs,
-):
-    """
-    Process chapter files by generating refinements from the assistant.
-    """
-
+def _chapter_files(book_path: str) -> List[str]:
     chapters_dir = os.path.join(book_path, "chapters")
     outline_dir = os.path.join(book_path, "outline")
     worldbuilding_dir = os.path.join(book_path, "worldbuilding")
@@ -352,7 +1470,7 @@ def process_chapters(
     excluded_files = {"cover.md", "back-cover.md"}
     files_to_process: List[str] = []
     for dir_path in [chapters_dir, outline_dir, worldbuilding_dir]:
-        for filename in os.listdir(dir_path):
+        for filename in sorted(os.listdir(dir_path)):
             if filename.endswith(".md") and filename not in excluded_files:
                 files_to_process.append(os.path.join(dir_path, filename))
 
@@ -360,40 +1478,163 @@ def process_chapters(
         raise FileNotFoundError(
             "No Markdown (.md) files were found in the chapter directory."
         )
+    return files_to_process
+
 
+def process_chapters(
+    save_to_markdown,
+    book_path: str,
+    prompt_template: str,
+    task_description: str,
+    file_suffix: str,
+    concurrency: Optional[int] = None,
+    **prompt_kwargs,
+) -> Dict[str, str]:
+    """
+    Process chapter files by generating refinements from the assistant.
+
+    Up to ``concurrency`` files are sent to the model at once (defaults to the
+    project's ``llm_max_concurrency``). Results are saved in a deterministic
+    file order and the knowledge base is refreshed once at the end.
+
+    Returns:
+        Dict[str, str]: Refined text keyed by the file path relative to the book.
+    """
+
+    files_to_process = _chapter_files(book_path)
     assistant = create_or_get_assistant(book_path)
+    if concurrency is None:
+        concurrency = getattr(assistant.config, "llm_max_concurrency", 1)
+    workers = max(1, min(int(concurrency or 1), len(files_to_process)))
+    prompt = prompt_template.format(**prompt_kwargs)
+    results: Dict[str, str] = {}
 
     with Progress() as progress:
         task_chapters = progress.add_task(
             f"[cyan]{task_description}",
             total=len(files_to_process),
         )
-        task_llm = progress.add_task("[green]Calling language model...", total=1)
 
-        for chapter_file in files_to_process:
-            prompt = prompt_template.format(**prompt_kwargs)
+        def refine(chapter_file: str):
+            relative_path = os.path.relpath(chapter_file, book_path)
+            task_file = progress.add_task(f"[green]{relative_path}", total=1)
             thread = get_thread(book_path)
-
-            progress.reset(task_llm)
             refined_text = create_message(
                 book_path,
                 thread_id=thread.id,
                 content=prompt,
                 assistant=assistant,
                 progress=progress,
-                task_id=task_llm,
+                task_id=task_file,
                 file_path=chapter_file,
             )
+            return relative_path, refined_text, task_file
 
-            relative_path = os.path.relpath(chapter_file, book_path)
-            save_to_markdown(
-                book_path,
-                relative_path,
-                file_suffix,
-                refined_text,
-                progress=progress,
-                task=task_chapters,
-            )
-            progress.update(task_chapters, advance=1)
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="storycraftr-chapter"
+        ) as executor:
+            futures = [executor.submit(refine, path) for path in files_to_process]
+            try:
+                # Collect in submission order so saves stay deterministic.
+                for future in futures:
+                    relative_path, refined_text, task_file = future.result()
+                    save_to_markdown(
+                        book_path,
+                        relative_path,
+                        file_suffix,
+                        refined_text,
+                        progress=progress,
+                        task=task_chapters,
+                    )
+                    results[relative_path] = refined_text
+                    progress.remove_task(task_file)
+                    progress.update(task_chapters, advance=1)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
 
     update_agent_files(book_path, assistant)
+    return results
+
+
+async def aprocess_chapters(
+    save_to_markdown,
+    book_path: str,
+    prompt_template: str,
+    task_description: str,
+    file_suffix: str,
+    concurrency: Optional[int] = None,
+    **prompt_kwargs,
+) -> Dict[str, str]:
+    """
+    Async counterpart of ``process_chapters``.
+
+    Every file becomes a task on the running event loop and an
+    ``asyncio.Semaphore`` of size ``concurrency`` (defaults to the project's
+    ``llm_max_concurrency``) bounds the requests in flight, so large batches
+    need no thread per request. ``save_to_markdown`` may be a coroutine
+    function (``asave_to_markdown``); a plain function runs in a worker
+    thread.
+    """
+
+    files_to_process = _chapter_files(book_path)
+    assistant = await asyncio.to_thread(create_or_get_assistant, book_path)
+    if concurrency is None:
+        concurrency = getattr(assistant.config, "llm_max_concurrency", 1)
+    semaphore = asyncio.Semaphore(max(1, int(concurrency or 1)))
+    prompt = prompt_template.format(**prompt_kwargs)
+    results: Dict[str, str] = {}
+
+    async def save(*args, **kwargs) -> None:
+        if asyncio.iscoroutinefunction(save_to_markdown):
+            await save_to_markdown(*args, **kwargs)
+        else:
+            await asyncio.to_thread(save_to_markdown, *args, **kwargs)
+
+    with Progress() as progress:
+        task_chapters = progress.add_task(
+            f"[cyan]{task_description}",
+            total=len(files_to_process),
+        )
+
+        async def refine(chapter_file: str):
+            relative_path = os.path.relpath(chapter_file, book_path)
+            async with semaphore:
+                task_file = progress.add_task(f"[green]{relative_path}", total=1)
+                thread = get_thread(book_path)
+                refined_text = await acreate_message(
+                    book_path,
+                    thread_id=thread.id,
+                    content=prompt,
+                    assistant=assistant,
+                    progress=progress,
+                    task_id=task_file,
+                    file_path=chapter_file,
+                )
+            return relative_path, refined_text, task_file
+
+        tasks = [asyncio.create_task(refine(path)) for path in files_to_process]
+        try:
+            # Await in submission order so saves stay deterministic.
+            for task in tasks:
+                relative_path, refined_text, task_file = await task
+                await save(
+                    book_path,
+                    relative_path,
+                    file_suffix,
+                    refined_text,
+                    progress=progress,
+                    task=task_chapters,
+                )
+                results[relative_path] = refined_text
+                progress.remove_task(task_file)
+                progress.update(task_chapters, advance=1)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    await asyncio.to_thread(update_agent_files, book_path, assistant)
+    return results
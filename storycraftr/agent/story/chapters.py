@@ -3,7 +3,7 @@ from pathlib import Path
 from storycraftr.agent.agents import (
     create_or_get_assistant,
     get_thread,
-    create_message,
+    stream_message,
     update_agent_files,
 )
 from storycraftr.utils.core import load_book_config
@@ -52,7 +52,7 @@ def generate_chapter(book_path: str, chapter_number: int, prompt: str) -> str:
         )
         content = CHAPTER_PROMPT_NEW.format(prompt=prompt, language=language)
 
-    chapter_content = create_message(
+    chapter_stream = stream_message(
         book_path,
         thread_id=thread.id,
         content=content,
@@ -60,13 +60,14 @@ def generate_chapter(book_path: str, chapter_number: int, prompt: str) -> str:
         file_path=str(file_path),
     )
 
-    # Save the generated chapter to markdown
+    # Save the generated chapter to markdown as the answer streams in
     save_to_markdown(
         book_path,
         f"chapters/{chapter_file}",
         f"Chapter {chapter_number}",
-        chapter_content,
+        chapter_stream,
     )
+    chapter_content = chapter_stream.text
     console.print(
         f"[bold green]✔ Chapter {chapter_number} generated successfully[/bold green]"
     )
@@ -104,11 +105,12 @@ def generate_cover(book_path: str, prompt: str) -> str:
         language=language,
     )
 
-    cover_content = create_message(
+    cover_stream = stream_message(
         book_path, thread_id=thread.id, content=prompt_content, assistant=assistant
     )
 
-    save_to_markdown(book_path, "chapters/cover.md", "Cover", cover_content)
+    save_to_markdown(book_path, "chapters/cover.md", "Cover", cover_stream)
+    cover_content = cover_stream.text
     console.print("[bold green]✔ Cover generated successfully[/bold green]")
 
     update_agent_files(book_path, assistant)
@@ -143,13 +145,14 @@ def generate_back_cover(book_path: str, prompt: str) -> str:
         license=config.license,
     )
 
-    back_cover_content = create_message(
+    back_cover_stream = stream_message(
         book_path, thread_id=thread.id, content=prompt_content, assistant=assistant
     )
 
     save_to_markdown(
-        book_path, "chapters/back-cover.md", "Back Cover", back_cover_content
+        book_path, "chapters/back-cover.md", "Back Cover", back_cover_stream
     )
+    back_cover_content = back_cover_stream.text
     console.print("[bold green]✔ Back cover generated successfully[/bold green]")
 
     update_agent_files(book_path, assistant)
@@ -185,7 +188,7 @@ def generate_epilogue(book_path: str, prompt: str) -> str:
         )
         content = EPILOGUE_PROMPT_NEW.format(prompt=prompt, language=language)
 
-    epilogue_content = create_message(
+    epilogue_stream = stream_message(
         book_path,
         thread_id=thread.id,
         content=content,
@@ -193,7 +196,8 @@ def generate_epilogue(book_path: str, prompt: str) -> str:
         file_path=str(file_path),
     )
 
-    save_to_markdown(book_path, "chapters/epilogue.md", "Epilogue", epilogue_content)
+    save_to_markdown(book_path, "chapters/epilogue.md", "Epilogue", epilogue_stream)
+    epilogue_content = epilogue_stream.text
     console.print("[bold green]✔ Epilogue generated successfully[/bold green]")
 
     update_agent_files(book_path, assistant)
@@ -6,6 +6,7 @@ from typing import List, Optional
 
 from rich.console import Console
 from rich.table import Table
+from rich.text import Text
 
 from . import render
 from .render import render_subagent_event
@@ -113,7 +114,12 @@ def _print_help(console: Console) -> None:
 [bold]:session load <name>[/bold] Load and display a saved conversation
 [bold]:sub-agent !list[/bold]     List available sub-agent roles
 [bold]:sub-agent !status[/bold]   Show queued/background jobs
+[bold]:sub-agent !cancel <id>[/bold] Cancel a queued or running job
+[bold]:sub-agent !logs <role>[/bold]  Show a role's latest finished jobs
+[bold]:sub-agent !search <text>[/bold] Search job logs (--role ROLE to filter)
+[bold]:sub-agent !export <id>[/bold]  Write a job's log as Markdown
 [bold]:sub-agent !command[/bold]  Launch `!outline`, `!chapters`, etc. in background
+                      (prefix with --priority N / --timeout SECONDS)
         """
     )
 
@@ -132,6 +138,17 @@ def _handle_sub_agent(args: List[str], context: CommandContext) -> None:
         return
 
     emitter = context.event_emitter
+    try:
+        options, args = _parse_job_options(args)
+    except ValueError as exc:
+        context.console.print(f"[red]{exc}[/red]")
+        return
+    if not args:
+        context.console.print(
+            "[yellow]Usage: :sub-agent [--priority N] [--timeout SECONDS] "
+            "!command [role] [args][/yellow]"
+        )
+        return
     action = args[0]
     if action == "!list":
         roles = _render_roles(manager, context.console)
@@ -165,20 +182,75 @@ def _handle_sub_agent(args: List[str], context: CommandContext) -> None:
                 },
             )
         return
+    if action == "!cancel":
+        if len(args) < 2:
+            context.console.print("[yellow]Usage: :sub-agent !cancel <job-id>[/yellow]")
+            return
+        try:
+            job = manager.cancel(args[1])
+        except ValueError as exc:
+            context.console.print(f"[red]{exc}[/red]")
+            return
+        if job.status == "cancelled":
+            context.console.print(f"[green]Cancelled job {job.job_id[:8]}.[/green]")
+        else:
+            context.console.print(f"[yellow]Stopping job {job.job_id[:8]}…[/yellow]")
+        if emitter:
+            emitter.emit("sub_agent.cancel", job.to_dict())
+        return
     if action == "!logs":
         if len(args) < 2:
             context.console.print("[yellow]Usage: :sub-agent !logs <role>[/yellow]")
             return
-        logs = _render_logs(args[1], manager, context.console)
+        jobs = _render_logs(args[1], manager, context.console)
         if emitter:
             emitter.emit(
                 "sub_agent.logs",
                 {
                     "role": args[1],
-                    "files": [str(path) for path in logs],
+                    "jobs": [job.to_dict() for job in jobs],
+                    "files": [str(job.log_path) for job in jobs if job.log_path],
                 },
             )
         return
+    if action == "!search":
+        role_slug = None
+        terms = args[1:]
+        if len(terms) >= 2 and terms[0] == "--role":
+            role_slug, terms = terms[1], terms[2:]
+        query = " ".join(terms)
+        if not query.strip():
+            context.console.print(
+                "[yellow]Usage: :sub-agent !search [--role ROLE] <text>[/yellow]"
+            )
+            return
+        results = _render_log_search(query, role_slug, manager, context.console)
+        if emitter:
+            emitter.emit(
+                "sub_agent.search",
+                {
+                    "query": query,
+                    "role": role_slug,
+                    "results": [
+                        {**job.to_dict(), "snippet": snippet}
+                        for job, snippet in results
+                    ],
+                },
+            )
+        return
+    if action == "!export":
+        if len(args) < 2:
+            context.console.print("[yellow]Usage: :sub-agent !export <job-id>[/yellow]")
+            return
+        try:
+            path = manager.export_log(args[1])
+        except ValueError as exc:
+            context.console.print(f"[red]{exc}[/red]")
+            return
+        context.console.print(f"[green]Log written to {path}[/green]")
+        if emitter:
+            emitter.emit("sub_agent.export", {"job_id": args[1], "path": str(path)})
+        return
     if action == "!seed":
         seed_info = _handle_seed(args[1:], context)
         manager.reload_roles()
@@ -203,7 +275,10 @@ def _handle_sub_agent(args: List[str], context: CommandContext) -> None:
 
     try:
         job = manager.submit(
-            command_token=action, args=payload_args, role_slug=role_candidate
+            command_token=action,
+            args=payload_args,
+            role_slug=role_candidate,
+            **options,
         )
         event = {"type": "queued", "job": job.to_dict()}
         render_subagent_event(context.console, event)
@@ -221,6 +296,22 @@ def _handle_sub_agent(args: List[str], context: CommandContext) -> None:
             )
 
 
+def _parse_job_options(args: List[str]):
+    """Split leading ``--priority``/``--timeout`` options off a sub-agent command."""
+    options = {}
+    idx = 0
+    while idx < len(args) and args[idx] in ("--priority", "--timeout"):
+        if idx + 1 >= len(args):
+            raise ValueError(f"{args[idx]} needs a value.")
+        name, value = args[idx][2:], args[idx + 1]
+        try:
+            options[name] = int(value) if name == "priority" else float(value)
+        except ValueError:
+            raise ValueError(f"Invalid {args[idx]} value '{value}'.") from None
+        idx += 2
+    return options, args[idx:]
+
+
 def _render_roles(manager: SubAgentJobManager, console: Console):
     roles = manager.list_roles()
     if not roles:
@@ -258,12 +349,14 @@ def _render_job_status(manager: SubAgentJobManager, console: Console):
     table.add_column("Job", no_wrap=True)
     table.add_column("Role", style="cyan", no_wrap=True)
     table.add_column("Command", style="white")
+    table.add_column("Priority", justify="right", no_wrap=True)
     table.add_column("Status", style="magenta", no_wrap=True)
     for job in jobs[:10]:
         table.add_row(
             job.job_id[:8],
             job.role.slug,
             job.command_text,
+            str(job.priority),
             job.status,
         )
     console.print(table)
@@ -271,14 +364,50 @@ def _render_job_status(manager: SubAgentJobManager, console: Console):
 
 
 def _render_logs(role_slug: str, manager: SubAgentJobManager, console: Console):
-    files = manager.role_logs(role_slug, limit=5)
-    if not files:
+    jobs = manager.role_logs(role_slug, limit=5)
+    if not jobs:
         console.print(f"[yellow]No logs for role '{role_slug}'.[/yellow]")
         return []
-    console.print(f"[bold]Recent logs for {role_slug}:[/bold]")
-    for path in files:
-        console.print(f"- {path.name}")
-    return files
+    table = Table(title=f"Recent logs for {role_slug}")
+    table.add_column("Job", no_wrap=True)
+    table.add_column("Finished", no_wrap=True)
+    table.add_column("Status", style="magenta", no_wrap=True)
+    table.add_column("Command", style="white")
+    for job in jobs:
+        table.add_row(
+            job.job_id[:8],
+            job.finished_at.strftime("%Y-%m-%d %H:%M") if job.finished_at else "",
+            job.status,
+            job.command_text,
+        )
+    console.print(table)
+    return jobs
+
+
+def _render_log_search(
+    query: str,
+    role_slug: Optional[str],
+    manager: SubAgentJobManager,
+    console: Console,
+):
+    results = manager.search_logs(query, role_slug=role_slug, limit=10)
+    if not results:
+        console.print(f"[yellow]No job logs match '{query}'.[/yellow]")
+        return []
+    table = Table(title=f"Job logs matching '{query}'", show_lines=True)
+    table.add_column("Job", no_wrap=True)
+    table.add_column("Role", style="cyan", no_wrap=True)
+    table.add_column("Command", style="white")
+    table.add_column("Match", style="white")
+    for job, snippet in results:
+        table.add_row(
+            job.job_id[:8],
+            job.role.slug,
+            job.command_text,
+            Text(snippet.replace("\n", " ")),
+        )
+    console.print(table)
+    return results
 
 
 def _handle_seed(args: List[str], context: CommandContext) -> None:
@@ -1,19 +1,19 @@
 from __future__ import annotations
 
 import shlex
+from importlib import import_module
 from typing import Dict, List, Optional
 
 import click
 from rich.console import Console
 
-import storycraftr.cmd.story as story_cmd
-
-COMMAND_MODULES: Dict[str, object] = {
-    "iterate": story_cmd.iterate,
-    "outline": story_cmd.outline,
-    "worldbuilding": story_cmd.worldbuilding,
-    "chapters": story_cmd.chapters,
-    "publish": story_cmd.publish,
+# Command modules are imported on demand; they pull in the LangChain stack.
+COMMAND_MODULES: Dict[str, str] = {
+    "iterate": "storycraftr.cmd.story.iterate",
+    "outline": "storycraftr.cmd.story.outline",
+    "worldbuilding": "storycraftr.cmd.story.worldbuilding",
+    "chapters": "storycraftr.cmd.story.chapters",
+    "publish": "storycraftr.cmd.story.publish",
 }
 
 
@@ -48,9 +48,10 @@ def run_module_command(
     command_name = parts[1].replace("-", "_")
     command_args: List[str] = parts[2:]
 
-    module = COMMAND_MODULES.get(module_name)
-    if module is None:
+    module_path = COMMAND_MODULES.get(module_name)
+    if module_path is None:
         raise ModuleCommandError(f"Unknown module '{module_name}'.")
+    module = import_module(module_path)
 
     command_obj = getattr(module, command_name, None)
     if command_obj is None:
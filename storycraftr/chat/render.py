@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import textwrap
-from typing import Iterable, List, Mapping
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, List, Mapping, Optional
 
 from rich.console import Console, Group
+from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.table import Table
@@ -15,31 +17,76 @@ def _truncate(text: str, width: int = 220) -> str:
     return textwrap.shorten(text, width=width, placeholder=" …")
 
 
-def render_turn(console: Console, turn: Mapping, turn_index: int) -> None:
+def _user_panel(user_text: str, turn_index: int) -> Panel:
+    return Panel(
+        Markdown(user_text or "(vacío)"),
+        title=f"[yellow]You · Turn {turn_index}[/yellow]",
+        border_style="yellow",
+    )
+
+
+_STAGE_LABELS = {"prompt_log": "log", "first_token": "ttft", "generation": "gen"}
+
+
+def _format_count(value: int) -> str:
+    return f"{value / 1000:.1f}k" if value >= 1000 else str(value)
+
+
+def format_timings(timings: Optional[Mapping]) -> str:
+    """One-line stage summary, e.g. ``search 40ms · ttft 0.82s · 1.2k→310 tok``."""
+    if not timings:
+        return ""
+    parts = []
+    for name, seconds in (timings.get("stages") or {}).items():
+        shown = f"{seconds * 1000:.0f}ms" if seconds < 1 else f"{seconds:.2f}s"
+        parts.append(f"{_STAGE_LABELS.get(name, name)} {shown}")
+    tokens = timings.get("tokens") or {}
+    if tokens:
+        estimated = "~" if tokens.get("estimated") else ""
+        parts.append(
+            f"{estimated}{_format_count(tokens.get('prompt', 0))}→"
+            f"{_format_count(tokens.get('completion', 0))} tok"
+        )
+    dropped = timings.get("dropped") or {}
+    if dropped:
+        parts.append(
+            f"dropped {dropped.get('documents', 0)} docs, "
+            f"{dropped.get('messages', 0)} msgs to fit"
+        )
+    return " · ".join(parts)
+
+
+def _answer_panel(answer_text: str, subtitle: str) -> Panel:
+    return Panel(
+        Markdown(answer_text or "(sin respuesta)"),
+        title=f"[green]StoryCraftr · {subtitle}[/green]",
+        border_style="green",
+    )
+
+
+def render_turn(
+    console: Console,
+    turn: Mapping,
+    turn_index: int,
+    *,
+    include_user: bool = True,
+) -> None:
     user_text = turn.get("user", "")
     answer_text = turn.get("answer", "")
     duration = turn.get("duration")
     docs: List[Mapping] = turn.get("documents", []) or []
 
-    console.print(
-        Panel(
-            Markdown(user_text or "(vacío)"),
-            title=f"[yellow]You · Turn {turn_index}[/yellow]",
-            border_style="yellow",
-        )
-    )
+    if include_user:
+        console.print(_user_panel(user_text, turn_index))
 
     subtitle = f"Turn {turn_index}"
     if duration is not None:
         subtitle += f" · {duration:.2f}s"
+    timings = format_timings(turn.get("timings"))
+    if timings:
+        subtitle += f" · {timings}"
 
-    console.print(
-        Panel(
-            Markdown(answer_text or "(sin respuesta)"),
-            title=f"[green]StoryCraftr · {subtitle}[/green]",
-            border_style="green",
-        )
-    )
+    console.print(_answer_panel(answer_text, subtitle))
 
     if docs:
         table = Table(title="Retrieved Context", show_lines=True)
@@ -54,6 +101,47 @@ def render_turn(console: Console, turn: Mapping, turn_index: int) -> None:
         console.print(table)
 
 
+def render_user_turn(console: Console, user_text: str, turn_index: int) -> None:
+    console.print(_user_panel(user_text, turn_index))
+
+
+class _StreamingAnswer:
+    """Renderable that shows the tail of a partially streamed answer."""
+
+    def __init__(self, console: Console, turn_index: int):
+        self._console = console
+        self._turn_index = turn_index
+        self._parts: List[str] = []
+
+    def append(self, delta: str) -> None:
+        self._parts.append(delta)
+
+    def __rich__(self) -> Panel:
+        # Leave room for the panel borders so the live region never scrolls.
+        max_lines = max(self._console.height - 4, 3)
+        lines = "".join(self._parts).splitlines()
+        text = "\n".join(lines[-max_lines:])
+        return _answer_panel(text or "…", f"Turn {self._turn_index} · streaming")
+
+
+@contextmanager
+def stream_answer(console: Console, turn_index: int) -> Iterator[Callable[[str], None]]:
+    """
+    Show a live-updating answer panel while a turn streams.
+
+    Yields a callback that accepts answer deltas. The live panel is cleared on
+    exit so the caller can print the final turn with ``render_turn``.
+    """
+    answer = _StreamingAnswer(console, turn_index)
+    with Live(
+        answer,
+        console=console,
+        refresh_per_second=8,
+        transient=True,
+    ):
+        yield answer.append
+
+
 def render_status(console: Console, docs: Iterable[Mapping]) -> None:
     docs = list(docs)
     if not docs:
@@ -86,6 +174,7 @@ def render_footer(
     llm_model: str,
     embed_model: str,
     job_stats: Mapping[str, int],
+    index_status: Optional[str] = None,
 ) -> None:
     info_text = Text(
         f"{book_name} · Lang: {language} · LLM: {llm_provider}/{llm_model} · Embed: {embed_model}",
@@ -96,12 +185,20 @@ def render_footer(
         f"Sub-Agents — pending:{jobs.get('pending',0)} "
         f"running:{jobs.get('running',0)} "
         f"succeeded:{jobs.get('succeeded',0)} "
-        f"failed:{jobs.get('failed',0)}",
+        f"failed:{jobs.get('failed',0)}"
+        + "".join(
+            f" {status}:{jobs[status]}"
+            for status in ("cancelled", "timed_out")
+            if jobs.get(status)
+        ),
         style="magenta",
     )
+    lines = [info_text, job_text]
+    if index_status:
+        lines.append(Text(index_status, style="yellow"))
     console.print(
         Panel(
-            Group(info_text, job_text),
+            Group(*lines),
             border_style="dim",
             title="[grey62]Session Status[/grey62]",
         )
@@ -127,7 +224,7 @@ def render_subagent_event(console: Console, event: Mapping) -> None:
             border_style="magenta"
             if job.get("status") == "succeeded"
             else "red"
-            if job.get("status") == "failed"
+            if job.get("status") in ("failed", "timed_out")
             else "cyan",
             title=title,
         )
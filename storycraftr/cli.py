@@ -12,27 +12,9 @@ console = Console()
 load_local_credentials()
 
 # Import statements grouped together for clarity
+from importlib import import_module
 from storycraftr.state import debug_state
-from storycraftr.cmd.story.publish import publish
-from storycraftr.cmd.chat import chat
-from storycraftr.agent.agents import create_or_get_assistant, update_agent_files
 from storycraftr.utils.core import load_book_config
-
-# Imports StoryCraftr in storycraftr.cmd.story
-from storycraftr.cmd.story.worldbuilding import worldbuilding as story_worldbuilding
-from storycraftr.cmd.story.outline import outline as story_outline
-from storycraftr.cmd.story.chapters import chapters as story_chapters
-from storycraftr.cmd.story.iterate import iterate as story_iterate
-
-# Imports PaperCraftr in storycraftr.cmd.paper
-from storycraftr.cmd.paper.organize_lit import organize_lit as paper_organize_lit
-from storycraftr.cmd.paper.outline_sections import outline as paper_outline
-from storycraftr.cmd.paper.generate_section import generate as paper_generate
-from storycraftr.cmd.paper.references import references as paper_references
-from storycraftr.cmd.paper.iterate import iterate as paper_iterate
-from storycraftr.cmd.paper.publish import publish as paper_publish
-from storycraftr.cmd.paper.abstract import abstract as paper_abstract
-
 from storycraftr.init import init_structure_story, init_structure_paper
 from storycraftr.subagents import seed_default_roles
 
@@ -49,6 +31,131 @@ def detect_invocation():
 cli_name = detect_invocation()
 
 
+class LazyGroup(click.Group):
+    """
+    Click group that imports subcommand modules only when they are invoked.
+
+    ``lazy_commands`` maps a command name to ``(import_path, short_help)``, where
+    ``import_path`` has the form ``"package.module:attribute"``. The short help
+    is rendered by ``--help`` so listing commands never imports them.
+    """
+
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        command = super().get_command(ctx, cmd_name)
+        if command is not None or cmd_name not in self.lazy_commands:
+            return command
+        import_path, _ = self.lazy_commands[cmd_name]
+        module_name, attribute = import_path.split(":")
+        command = getattr(import_module(module_name), attribute)
+        self.add_command(command, name=cmd_name)
+        return command
+
+    def format_commands(self, ctx, formatter):
+        names = [
+            name
+            for name in self.list_commands(ctx)
+            if name in self.commands or name in self.lazy_commands
+        ]
+        if not names:
+            return
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = []
+        for name in names:
+            command = self.commands.get(name)
+            if command is not None:
+                if command.hidden:
+                    continue
+                rows.append((name, command.get_short_help_str(limit)))
+            else:
+                help_text = self.lazy_commands[name][1]
+                rows.append(
+                    (name, click.utils.make_default_short_help(help_text, limit))
+                )
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+
+_COMMON_COMMANDS = {
+    "chat": ("storycraftr.cmd.chat:chat", "Chat with the assistant about the project."),
+    "daemon": (
+        "storycraftr.cmd.daemon:daemon",
+        "Run a resident process that keeps assistants warm.",
+    ),
+}
+
+_STORY_COMMANDS = {
+    "worldbuilding": (
+        "storycraftr.cmd.story.worldbuilding:worldbuilding",
+        "Manage worldbuilding aspects of the book.",
+    ),
+    "outline": (
+        "storycraftr.cmd.story.outline:outline",
+        "Manage outline aspects of the book.",
+    ),
+    "chapters": (
+        "storycraftr.cmd.story.chapters:chapters",
+        "Manage chapters of the book.",
+    ),
+    "iterate": (
+        "storycraftr.cmd.story.iterate:iterate",
+        "Iterative refinement commands for StoryCraftr.",
+    ),
+    "publish": (
+        "storycraftr.cmd.story.publish:publish",
+        "Publish the book in various formats.",
+    ),
+}
+
+_PAPER_COMMANDS = {
+    "organize-lit": (
+        "storycraftr.cmd.paper.organize_lit:organize_lit",
+        "Group of commands for organizing literature for the paper.",
+    ),
+    "outline": (
+        "storycraftr.cmd.paper.outline_sections:outline",
+        "Group of commands for outlining the paper.",
+    ),
+    "generate": (
+        "storycraftr.cmd.paper.generate_section:generate",
+        "Group of commands for generating different sections of the paper.",
+    ),
+    "references": (
+        "storycraftr.cmd.paper.references:references",
+        "Group of commands for managing references and citations in the paper.",
+    ),
+    "iterate": (
+        "storycraftr.cmd.paper.iterate:iterate",
+        "Group of commands for iterative improvements to the paper.",
+    ),
+    "publish": (
+        "storycraftr.cmd.paper.publish:publish",
+        "Publish the paper in various formats.",
+    ),
+    "abstract": (
+        "storycraftr.cmd.paper.abstract:abstract",
+        "Generate an abstract for the paper.",
+    ),
+}
+
+# CLI-specific command configuration
+if cli_name == "storycraftr":
+    _LAZY_COMMANDS = {**_COMMON_COMMANDS, **_STORY_COMMANDS}
+elif cli_name == "papercraftr":
+    _LAZY_COMMANDS = {**_COMMON_COMMANDS, **_PAPER_COMMANDS}
+else:
+    console.print(
+        "[red]Unknown CLI tool name. Use 'storycraftr' or 'papercraftr'.[/red]"
+    )
+    sys.exit(1)
+
+
 # Verify if the directory contains storycraftr.json
 def verify_book_path(book_path=None):
     """
@@ -102,7 +209,7 @@ def project_not_initialized_error(book_path):
     )
 
 
-@click.group()
+@click.group(cls=LazyGroup, lazy_commands=_LAZY_COMMANDS)
 @click.option("--debug", is_flag=True, help="Enable debug mode.")
 def cli(debug):
     """
@@ -319,19 +426,28 @@ def init(
 @click.option(
     "--book-path", type=click.Path(), help="Path to the book directory", required=False
 )
-def reload_files(book_path):
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="Re-embed every file instead of only the ones that changed.",
+)
+def reload_files(book_path, force):
     """
     Reloads the agent files for the given book path.
 
     Args:
         book_path (str): Path to the book project.
+        force (bool): Rebuild the whole vector store from scratch.
     """
     book_path = book_path or os.getcwd()
     if not load_book_config(book_path):
         return
     if is_initialized(book_path):
+        from storycraftr.agent.agents import create_or_get_assistant, update_agent_files
+
         assistant = create_or_get_assistant(book_path)
-        update_agent_files(book_path, assistant)
+        update_agent_files(book_path, assistant, force=force)
         console.print(
             f"[green]Agent files reloaded successfully for project: {book_path}[/green]"
         )
@@ -339,6 +455,64 @@ def reload_files(book_path):
         project_not_initialized_error(book_path)
 
 
+@click.command(name="index-stats")
+@click.option(
+    "--book-path", type=click.Path(), help="Path to the book directory", required=False
+)
+@click.option(
+    "--show-files", is_flag=True, default=False, help="List every indexed file."
+)
+def index_stats(book_path, show_files):
+    """Show which files are indexed, which are skipped and why."""
+    book_path = book_path or os.getcwd()
+    if not load_book_config(book_path):
+        return
+    if not is_initialized(book_path):
+        project_not_initialized_error(book_path)
+        return
+
+    from rich.table import Table
+
+    from storycraftr.agent.agents import index_stats as collect_index_stats
+
+    stats = collect_index_stats(book_path)
+    duplicate_chunks = stats.chunks - stats.unique_chunks
+    console.print(
+        f"[bold]Indexed files:[/bold] {len(stats.included)}   "
+        f"[bold]Chunks:[/bold] {stats.chunks} "
+        f"({stats.unique_chunks} unique, {duplicate_chunks} deduplicated)"
+    )
+    pending = stats.pending
+    if pending.is_empty:
+        console.print("[green]Index is up to date.[/green]")
+    else:
+        console.print(
+            f"[yellow]Pending reindex: {len(pending.added)} added, "
+            f"{len(pending.changed)} changed, {len(pending.removed)} removed "
+            "(run reload-files).[/yellow]"
+        )
+
+    if show_files:
+        for source in stats.included:
+            console.print(f"  {source}")
+
+    if stats.excluded:
+        table = Table(title="Skipped paths")
+        table.add_column("Path")
+        table.add_column("Reason")
+        for path, reason in sorted(stats.excluded.items()):
+            table.add_row(path, reason)
+        console.print(table)
+
+    if stats.duplicates:
+        table = Table(title="Repeated chunks (stored once)")
+        table.add_column("Chunk")
+        table.add_column("Sources")
+        for identifier, sources in sorted(stats.duplicates.items())[:20]:
+            table.add_row(identifier[:12], ", ".join(sorted(set(sources))))
+        console.print(table)
+
+
 @click.command()
 @click.option(
     "--book-path", type=click.Path(), help="Path to the book directory", required=False
@@ -398,38 +572,12 @@ def sub_agents_seed(book_path, language, force):
         )
 
 
-# Add common commands to CLI
+# Add common commands to CLI; module-backed commands are loaded lazily.
 cli.add_command(init, name="init")
 cli.add_command(reload_files)
-cli.add_command(chat)
-cli.add_command(publish)
+cli.add_command(index_stats)
 cli.add_command(cleanup)
 cli.add_command(sub_agents)
 
-# CLI-specific group configuration
-if cli_name == "storycraftr":
-    cli.add_command(story_worldbuilding)
-    cli.add_command(story_outline)
-    cli.add_command(story_chapters)
-    cli.add_command(story_iterate)
-    cli.add_command(publish)
-    cli.add_command(chat)
-    cli.add_command(reload_files)
-elif cli_name == "papercraftr":
-    cli.add_command(paper_organize_lit)
-    cli.add_command(paper_outline)
-    cli.add_command(paper_generate)
-    cli.add_command(paper_references)
-    cli.add_command(paper_iterate)
-    cli.add_command(paper_publish)
-    cli.add_command(paper_abstract)
-    cli.add_command(chat)
-    cli.add_command(reload_files)
-else:
-    console.print(
-        "[red]Unknown CLI tool name. Use 'storycraftr' or 'papercraftr'.[/red]"
-    )
-    sys.exit(1)
-
 if __name__ == "__main__":
     cli()
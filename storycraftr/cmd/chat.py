@@ -19,6 +19,8 @@ from storycraftr.chat.render import (
     render_session_loaded,
     render_subagent_event,
     render_turn,
+    render_user_turn,
+    stream_answer,
 )
 from storycraftr.chat.session import SessionManager
 from storycraftr.chat.module_runner import ModuleCommandError, run_module_command
@@ -32,8 +34,10 @@ from storycraftr.agent.agents import (
     create_message,
     create_or_get_assistant,
     get_thread,
+    hold_assistant,
 )
 from storycraftr.utils.core import load_book_config
+from storycraftr.vectorstores.chunking import describe_location
 
 console = Console()
 
@@ -51,29 +55,49 @@ def _summarise_documents(documents, limit: int = 5, max_chars: int = 400) -> Lis
         excerpt = excerpt.strip()
         if len(excerpt) > max_chars:
             excerpt = excerpt[: max_chars - 1].rstrip() + "…"
-        source = getattr(doc, "metadata", {}).get("source", "context")
+        source = describe_location(getattr(doc, "metadata", {}))
         summaries.append({"source": source, "excerpt": excerpt})
     return summaries
 
 
 def _run_turn(
-    book_path, assistant, thread, user_text: str, force_single_answer: bool = True
+    book_path,
+    assistant,
+    thread,
+    user_text: str,
+    force_single_answer: bool = True,
+    *,
+    turn_index: Optional[int] = None,
+    emitter=None,
 ):
+    """
+    Run one chat turn, streaming the answer into a live panel as it arrives.
+    """
     formatted_prompt = _format_user_prompt(user_text)
     start = time.perf_counter()
-    answer = create_message(
-        book_path,
-        thread_id=thread.id,
-        content=formatted_prompt,
-        assistant=assistant,
-        force_single_answer=force_single_answer,
-    )
+
+    with stream_answer(console, turn_index or 0) as show_delta:
+
+        def on_token(delta: str) -> None:
+            show_delta(delta)
+            if emitter:
+                emitter.emit("chat.turn.delta", {"turn": turn_index, "delta": delta})
+
+        answer = create_message(
+            book_path,
+            thread_id=thread.id,
+            content=formatted_prompt,
+            assistant=assistant,
+            force_single_answer=force_single_answer,
+            on_token=on_token,
+        )
     duration = time.perf_counter() - start
     documents = _summarise_documents(assistant.last_documents)
     return {
         "user": user_text,
         "answer": answer,
         "duration": duration,
+        "timings": dict(getattr(assistant, "last_timings", None) or {}),
         "documents": documents,
     }
 
@@ -98,12 +122,27 @@ def _print_inline_help() -> None:
     )
 
 
-def _render_session_footer(job_manager: SubAgentJobManager, footer_meta: dict) -> None:
+def _index_status(assistant) -> Optional[str]:
+    build = getattr(assistant, "index_build", None)
+    if build is None:
+        return None
+    if build.error is not None:
+        return f"Index: build failed ({build.error}); answering from keyword search"
+    if build.running:
+        done = f"{build.done}/{build.total} chunks" if build.total else "scanning files"
+        return f"Index: building ({done}); answering from keyword search meanwhile"
+    return "Index: ready"
+
+
+def _render_session_footer(
+    job_manager: SubAgentJobManager, footer_meta: dict, assistant=None
+) -> None:
     if not job_manager:
         return
     render_footer(
         console,
         job_stats=job_manager.job_stats(),
+        index_status=_index_status(assistant),
         **footer_meta,
     )
 
@@ -112,6 +151,7 @@ def _drain_subagent_events(
     event_queue: Queue,
     job_manager: SubAgentJobManager,
     footer_meta: dict,
+    assistant=None,
 ) -> None:
     flushed = False
     while True:
@@ -122,7 +162,7 @@ def _drain_subagent_events(
         render_subagent_event(console, event)
         flushed = True
     if flushed:
-        _render_session_footer(job_manager, footer_meta)
+        _render_session_footer(job_manager, footer_meta, assistant)
 
 
 @click.command()
@@ -140,6 +180,7 @@ def _drain_subagent_events(
     help="Load or autosave conversation under this name.",
 )
 def chat(book_path=None, prompt=None, session_name=None):
+    """Chat with the assistant about the project."""
     if not book_path:
         book_path = os.getcwd()
 
@@ -165,9 +206,32 @@ def chat(book_path=None, prompt=None, session_name=None):
                 f"{VS_CODE_EXTENSION_ID}' later to enable editor integration.[/dim]"
             )
 
-    assistant = create_or_get_assistant(book_path)
-    thread = get_thread(book_path)
+    try:
+        # Interactive sessions start right away; the index is built in the
+        # background while the first turns fall back to keyword search.
+        assistant = create_or_get_assistant(book_path, background_index=prompt is None)
+        thread = get_thread(book_path)
+        # Held for the whole session: cache eviction (LRU/TTL) then defers
+        # closing the assistant until the chat ends.
+        with hold_assistant(assistant):
+            _chat_session(
+                book_path,
+                prompt,
+                session_name,
+                config,
+                assistant,
+                thread,
+                vscode_emitter,
+            )
+    finally:
+        # Also on errors and interrupts, so queued events reach the file.
+        if vscode_emitter:
+            vscode_emitter.close()
 
+
+def _chat_session(
+    book_path, prompt, session_name, config, assistant, thread, vscode_emitter
+) -> None:
     footer_meta = {
         "book_name": getattr(config, "book_name", Path(book_path).name),
         "language": getattr(config, "primary_language", "en"),
@@ -187,6 +251,8 @@ def chat(book_path=None, prompt=None, session_name=None):
         console,
         event_queue=subagent_events,
         event_callback=_forward_job_event,
+        # One-shot prompts leave queued jobs for the next interactive session.
+        resume=prompt is None,
     )
     session_manager = SessionManager(book_path)
     if session_name:
@@ -215,8 +281,17 @@ def chat(book_path=None, prompt=None, session_name=None):
             )
 
     if prompt is not None:
-        turn = _run_turn(book_path, assistant, thread, prompt)
-        render_turn(console, turn, len(transcript) + 1)
+        turn_index = len(transcript) + 1
+        render_user_turn(console, prompt, turn_index)
+        turn = _run_turn(
+            book_path,
+            assistant,
+            thread,
+            prompt,
+            turn_index=turn_index,
+            emitter=vscode_emitter,
+        )
+        render_turn(console, turn, turn_index, include_user=False)
         if vscode_emitter:
             vscode_emitter.emit(
                 "chat.turn",
@@ -225,10 +300,11 @@ def chat(book_path=None, prompt=None, session_name=None):
                     "answer": turn.get("answer"),
                     "documents": turn.get("documents"),
                     "duration": turn.get("duration"),
+                    "timings": turn.get("timings"),
                 },
             )
-        _drain_subagent_events(subagent_events, job_manager, footer_meta)
-        _render_session_footer(job_manager, footer_meta)
+        _drain_subagent_events(subagent_events, job_manager, footer_meta, assistant)
+        _render_session_footer(job_manager, footer_meta, assistant)
         job_manager.shutdown()
         return
 
@@ -236,12 +312,12 @@ def chat(book_path=None, prompt=None, session_name=None):
         f"Starting chat for [bold]{book_path}[/bold]. Type [bold green]exit()[/bold green] to quit."
     )
     _print_inline_help()
-    _render_session_footer(job_manager, footer_meta)
+    _render_session_footer(job_manager, footer_meta, assistant)
 
     session = PromptSession(history=InMemoryHistory())
 
     while True:
-        _drain_subagent_events(subagent_events, job_manager, footer_meta)
+        _drain_subagent_events(subagent_events, job_manager, footer_meta, assistant)
         try:
             user_input = session.prompt("You: ").strip()
 
@@ -254,8 +330,10 @@ def chat(book_path=None, prompt=None, session_name=None):
 
             if user_input.lower() == "help()":
                 _print_inline_help()
-                _drain_subagent_events(subagent_events, job_manager, footer_meta)
-                _render_session_footer(job_manager, footer_meta)
+                _drain_subagent_events(
+                    subagent_events, job_manager, footer_meta, assistant
+                )
+                _render_session_footer(job_manager, footer_meta, assistant)
                 continue
 
             if user_input.startswith(":"):
@@ -289,8 +367,10 @@ def chat(book_path=None, prompt=None, session_name=None):
                     _run_command()
                 if command_result is not None:
                     transcript[:] = command_result
-                _drain_subagent_events(subagent_events, job_manager, footer_meta)
-                _render_session_footer(job_manager, footer_meta)
+                _drain_subagent_events(
+                    subagent_events, job_manager, footer_meta, assistant
+                )
+                _render_session_footer(job_manager, footer_meta, assistant)
                 continue
 
             if user_input.startswith("!"):
@@ -304,13 +384,24 @@ def chat(book_path=None, prompt=None, session_name=None):
                     )
                 with patch_stdout(raw=True):
                     _execute_module_command(user_input[1:], book_path=book_path)
-                _drain_subagent_events(subagent_events, job_manager, footer_meta)
-                _render_session_footer(job_manager, footer_meta)
+                _drain_subagent_events(
+                    subagent_events, job_manager, footer_meta, assistant
+                )
+                _render_session_footer(job_manager, footer_meta, assistant)
                 continue
 
-            turn = _run_turn(book_path, assistant, thread, user_input)
+            turn_index = len(transcript) + 1
+            render_user_turn(console, user_input, turn_index)
+            turn = _run_turn(
+                book_path,
+                assistant,
+                thread,
+                user_input,
+                turn_index=turn_index,
+                emitter=vscode_emitter,
+            )
             transcript.append(turn)
-            render_turn(console, turn, len(transcript))
+            render_turn(console, turn, turn_index, include_user=False)
             session_manager.autosave(transcript)
             if vscode_emitter:
                 vscode_emitter.emit(
@@ -320,16 +411,21 @@ def chat(book_path=None, prompt=None, session_name=None):
                         "answer": turn.get("answer"),
                         "documents": turn.get("documents"),
                         "duration": turn.get("duration"),
+                        "timings": turn.get("timings"),
                     },
                 )
-            _drain_subagent_events(subagent_events, job_manager, footer_meta)
-            _render_session_footer(job_manager, footer_meta)
+            _drain_subagent_events(subagent_events, job_manager, footer_meta, assistant)
+            _render_session_footer(job_manager, footer_meta, assistant)
 
         except KeyboardInterrupt:
             console.print("[bold red]Exiting chat...[/bold red]")
             break
         except Exception as exc:
             console.print(f"[bold red]Error: {exc}[/bold red]")
+    build = getattr(assistant, "index_build", None)
+    if build is not None and build.running:
+        console.print("[dim]Finishing the index build before exiting...[/dim]")
+        build.wait()
     job_manager.shutdown()
     if vscode_emitter:
         vscode_emitter.emit(
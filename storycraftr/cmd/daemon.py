@@ -0,0 +1,115 @@
+import subprocess  # nosec B404
+import sys
+import time
+
+import click
+from rich.console import Console
+
+from storycraftr.daemon import (
+    DaemonError,
+    connect_daemon,
+    daemon_supported,
+    default_socket_path,
+)
+
+console = Console()
+
+
+@click.group()
+def daemon():
+    """
+    Run a resident process that keeps assistants warm.
+
+    While the daemon is running, chat, chapter and iterate commands forward
+    their requests to it and skip loading embeddings and the vector store.
+    """
+    pass
+
+
+@daemon.command()
+@click.option(
+    "--foreground",
+    is_flag=True,
+    default=False,
+    help="Serve in the current terminal instead of detaching.",
+)
+@click.option(
+    "--wait",
+    type=float,
+    default=15.0,
+    show_default=True,
+    help="Seconds to wait for a detached daemon to accept connections.",
+)
+def start(foreground: bool, wait: float):
+    """Start the daemon if it is not already running."""
+    if not daemon_supported():
+        console.print("[red]The daemon requires Unix domain socket support.[/red]")
+        return
+    if connect_daemon() is not None:
+        console.print(
+            f"[yellow]Daemon already running at {default_socket_path()}.[/yellow]"
+        )
+        return
+
+    if foreground:
+        from storycraftr.daemon.server import main
+
+        main([])
+        return
+
+    socket_path = default_socket_path()
+    log_path = socket_path.with_suffix(".log")
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with log_path.open("ab") as log_file:
+        subprocess.Popen(  # nosec B603
+            [sys.executable, "-m", "storycraftr.daemon.server"],
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if connect_daemon() is not None:
+            console.print(f"[green]Daemon started at {socket_path}.[/green]")
+            return
+        time.sleep(0.2)
+    console.print(f"[red]Daemon did not start in time; see {log_path}.[/red]")
+
+
+@daemon.command()
+def stop():
+    """Stop the running daemon."""
+    client = connect_daemon()
+    if client is None:
+        console.print("[yellow]No daemon is running.[/yellow]")
+        return
+    try:
+        client.shutdown()
+    except DaemonError as exc:
+        console.print(f"[red]{exc}[/red]")
+        return
+    console.print("[green]Daemon stopped.[/green]")
+
+
+@daemon.command()
+def status():
+    """Show whether the daemon is running and which projects are warm."""
+    client = connect_daemon()
+    if client is None:
+        console.print("[yellow]No daemon is running.[/yellow]")
+        return
+    info = client.ping()
+    console.print(
+        f"[green]Daemon running[/green] (pid {info.get('pid')}, "
+        f"up {info.get('uptime', 0):.0f}s) at {client.socket_path}"
+    )
+    for book in info.get("books", []):
+        console.print(f"  • {book}")
+    for name, stats in info.get("caches", {}).items():
+        console.print(
+            f"  {name}: {stats['entries']} cached, ~{stats['bytes'] // 1024} KiB, "
+            f"{stats['evictions']} evicted ({stats['hits']} hits, "
+            f"{stats['misses']} misses)"
+        )
@@ -0,0 +1,19 @@
+"""
+Opt-in resident process that keeps assistants warm across CLI invocations.
+
+When ``storycraftr daemon start`` is running, ``create_or_get_assistant``
+returns a ``RemoteAssistant`` and turns are forwarded over a Unix domain
+socket instead of loading embeddings and Chroma in every process.
+"""
+
+from .client import DaemonClient, DaemonError, RemoteAssistant, connect_daemon
+from .protocol import daemon_supported, default_socket_path
+
+__all__ = [
+    "DaemonClient",
+    "DaemonError",
+    "RemoteAssistant",
+    "connect_daemon",
+    "daemon_supported",
+    "default_socket_path",
+]
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import os
+import socket
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .protocol import (
+    DISABLE_ENV,
+    daemon_supported,
+    default_socket_path,
+    documents_from_payload,
+    read_messages,
+    write_message,
+)
+
+
+class DaemonError(RuntimeError):
+    """Raised when the daemon reports a failure or cannot be reached."""
+
+
+class DaemonClient:
+    """
+    Thin client for the StoryCraftr daemon.
+
+    Every request uses its own connection, so a client can be shared between
+    threads (e.g. the chapter worker pool or sub-agent jobs).
+    """
+
+    def __init__(self, socket_path: str | Path | None = None, timeout: float = 2.0):
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.timeout = timeout
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(str(self.socket_path))
+        except OSError:
+            sock.close()
+            raise
+        # Generation can take minutes; only the connect is time-bounded.
+        sock.settimeout(None)
+        return sock
+
+    def request(self, op: str, **params) -> Iterator[dict]:
+        """Send a request and yield response frames; errors raise ``DaemonError``."""
+        try:
+            sock = self._connect()
+        except OSError as exc:
+            raise DaemonError(
+                f"StoryCraftr daemon is not reachable at {self.socket_path}: {exc}"
+            ) from exc
+        with sock, sock.makefile("rwb") as stream:
+            write_message(stream, {"op": op, **params})
+            for frame in read_messages(stream):
+                if frame.get("event") == "error":
+                    raise DaemonError(frame.get("error", "Unknown daemon error."))
+                yield frame
+                if frame.get("event") == "done":
+                    return
+        raise DaemonError("StoryCraftr daemon closed the connection unexpectedly.")
+
+    def call(self, op: str, **params) -> dict:
+        """Send a request and return its final ``done`` frame."""
+        result: dict = {}
+        for frame in self.request(op, **params):
+            result = frame
+        return result
+
+    def ping(self) -> dict:
+        return self.call("ping")
+
+    def attach(self, book_path: str, config) -> "RemoteAssistant":
+        result = self.call("attach", book_path=book_path)
+        return RemoteAssistant(
+            id=result.get("id", f"assistant:{Path(book_path).name}"),
+            book_path=book_path,
+            config=config,
+            client=self,
+        )
+
+    def forget(self, book_path: str) -> None:
+        self.call("forget", book_path=book_path)
+
+    def shutdown(self) -> None:
+        self.call("shutdown")
+
+
+@dataclass
+class RemoteAssistant:
+    """
+    Stand-in for ``LangChainAssistant`` whose model, embeddings and vector store
+    live in the daemon. ``create_message``/``stream_message`` forward to it.
+    """
+
+    id: str
+    book_path: str
+    config: object
+    client: DaemonClient
+    last_documents: List[object] = field(default_factory=list)
+    last_timings: Dict[str, object] = field(default_factory=dict)
+
+    def stream(
+        self,
+        thread_id: str,
+        content: str,
+        file_path: Optional[str] = None,
+        force_single_answer: bool = False,
+    ) -> Iterator[dict]:
+        """
+        Start a turn in the daemon and return its graph-style chunk iterator.
+
+        Blocks until the daemon has assembled the prompt (and read
+        ``file_path``), so callers may overwrite the file while streaming.
+        """
+        frames = self.client.request(
+            "message",
+            book_path=self.book_path,
+            thread_id=thread_id,
+            content=content,
+            file_path=os.path.abspath(file_path) if file_path else None,
+            force_single_answer=force_single_answer,
+        )
+        for frame in frames:
+            if frame.get("event") == "started":
+                break
+
+        def chunks() -> Iterator[dict]:
+            for frame in frames:
+                if frame.get("event") == "delta":
+                    yield {"answer": frame.get("text", "")}
+                elif frame.get("event") == "done":
+                    yield {
+                        "documents": documents_from_payload(frame.get("documents")),
+                        "timings": frame.get("timings") or {},
+                    }
+
+        return chunks()
+
+    def ensure_vector_store(self, force: bool = False) -> None:
+        self.client.call("reindex", book_path=self.book_path, force=force)
+
+
+def connect_daemon(socket_path: str | Path | None = None) -> Optional[DaemonClient]:
+    """
+    Return a client when a daemon is listening, otherwise ``None``.
+
+    Costs a single ``stat`` when no daemon socket exists. Setting
+    ``STORYCRAFTR_NO_DAEMON`` disables forwarding entirely.
+    """
+    if os.getenv(DISABLE_ENV) or not daemon_supported():
+        return None
+    client = DaemonClient(socket_path)
+    if not client.socket_path.exists():
+        return None
+    try:
+        client._connect().close()
+    except OSError:
+        return None
+    return client
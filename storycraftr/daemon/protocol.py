@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+SOCKET_ENV = "STORYCRAFTR_DAEMON_SOCKET"
+DISABLE_ENV = "STORYCRAFTR_NO_DAEMON"
+
+
+def default_socket_path() -> Path:
+    """Return the daemon socket path (``~/.storycraftr/daemon.sock`` by default)."""
+    override = os.getenv(SOCKET_ENV)
+    if override:
+        return Path(override).expanduser()
+    return Path.home() / ".storycraftr" / "daemon.sock"
+
+
+def daemon_supported() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+def write_message(stream: BinaryIO, payload: dict) -> None:
+    """Send one JSON-lines frame and flush it immediately."""
+    stream.write(json.dumps(payload, default=str).encode("utf-8") + b"\n")
+    stream.flush()
+
+
+def read_messages(stream: BinaryIO) -> Iterator[dict]:
+    """Yield JSON-lines frames until the peer closes the connection."""
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line.decode("utf-8"))
+
+
+def documents_to_payload(documents) -> list:
+    return [
+        {"page_content": doc.page_content, "metadata": dict(doc.metadata)}
+        for doc in documents or []
+    ]
+
+
+def documents_from_payload(payload) -> list:
+    from langchain_core.documents import Document
+
+    return [
+        Document(page_content=item["page_content"], metadata=item.get("metadata", {}))
+        for item in payload or []
+    ]
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import argparse
+import os
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from rich.console import Console
+
+from .protocol import (
+    DISABLE_ENV,
+    default_socket_path,
+    documents_to_payload,
+    read_messages,
+    write_message,
+)
+
+console = Console()
+
+_CONFIG_FILES = ("papercraftr.json", "storycraftr.json")
+
+
+def _config_stamp(book_path: str) -> Optional[float]:
+    for name in _CONFIG_FILES:
+        path = Path(book_path) / name
+        if path.exists():
+            return path.stat().st_mtime
+    return None
+
+
+class AssistantDaemon:
+    """
+    Keeps one warm ``LangChainAssistant`` per book and serves requests for it.
+
+    Assistants live in the regular ``_ASSISTANT_CACHE`` of this process. A
+    project is rebuilt when its configuration file changes, and every
+    ``attach`` runs the incremental index sync a fresh process would do.
+    Each book has its own lock, so a cold index build of one project does
+    not hold up requests for the others.
+    """
+
+    def __init__(self, socket_path: str | Path | None = None):
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._book_locks: Dict[str, threading.Lock] = {}
+        self._stamps: Dict[str, Optional[float]] = {}
+        self._server: Optional[socketserver.BaseServer] = None
+
+    # -- assistant management -------------------------------------------------
+
+    def _book_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._book_locks.setdefault(key, threading.Lock())
+
+    def _assistant(self, book_path: str, sync: bool = False):
+        from storycraftr.agent import agents
+
+        key = str(Path(book_path).resolve())
+        with self._book_lock(key):
+            stamp = _config_stamp(key)
+            if key in self._stamps and self._stamps[key] != stamp:
+                agents.close_assistant(key)
+            warm = key in agents._ASSISTANT_CACHE
+            assistant = agents.create_or_get_assistant(key, use_daemon=False)
+            self._stamps[key] = stamp
+            if warm and sync:
+                assistant.sync_vector_store()
+        return assistant
+
+    def books(self):
+        from storycraftr.agent import agents
+
+        return sorted(agents._ASSISTANT_CACHE)
+
+    # -- request handling -----------------------------------------------------
+
+    def handle(self, request: dict, send: Callable[[dict], None]) -> None:
+        op = request.get("op")
+        handler = getattr(self, f"_op_{op}", None)
+        if handler is None:
+            send({"event": "error", "error": f"Unknown daemon operation '{op}'."})
+            return
+        try:
+            handler(request, send)
+        except Exception as exc:
+            send({"event": "error", "error": f"{type(exc).__name__}: {exc}"})
+
+    def _op_ping(self, request: dict, send) -> None:
+        from storycraftr.agent import agents
+
+        send(
+            {
+                "event": "done",
+                "pid": os.getpid(),
+                "uptime": time.time() - self.started_at,
+                "books": self.books(),
+                "caches": agents.cache_stats(),
+            }
+        )
+
+    def _op_attach(self, request: dict, send) -> None:
+        assistant = self._assistant(request["book_path"], sync=True)
+        send({"event": "done", "id": assistant.id})
+
+    def _op_message(self, request: dict, send) -> None:
+        from storycraftr.agent.agents import stream_message
+
+        assistant = self._assistant(request["book_path"])
+        stream = stream_message(
+            assistant.book_path,
+            thread_id=request.get("thread_id") or "",
+            content=request["content"],
+            assistant=assistant,
+            file_path=request.get("file_path"),
+            force_single_answer=bool(request.get("force_single_answer")),
+        )
+        send({"event": "started"})
+        for delta in stream:
+            send({"event": "delta", "text": delta})
+        send(
+            {
+                "event": "done",
+                "documents": documents_to_payload(stream.documents),
+                "timings": stream.timings,
+            }
+        )
+
+    def _op_reindex(self, request: dict, send) -> None:
+        from storycraftr.agent.agents import update_agent_files
+
+        assistant = self._assistant(request["book_path"])
+        update_agent_files(
+            assistant.book_path, assistant, force=bool(request.get("force"))
+        )
+        send({"event": "done"})
+
+    def _op_forget(self, request: dict, send) -> None:
+        from storycraftr.agent import agents
+
+        key = str(Path(request["book_path"]).resolve())
+        with self._book_lock(key):
+            agents.close_assistant(key)
+            self._stamps.pop(key, None)
+        send({"event": "done"})
+
+    def _op_shutdown(self, request: dict, send) -> None:
+        send({"event": "done"})
+        if self._server is not None:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    # -- socket server --------------------------------------------------------
+
+    def build_server(self) -> socketserver.BaseServer:
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                def send(payload: dict) -> None:
+                    write_message(self.wfile, payload)
+
+                for request in read_messages(self.rfile):
+                    daemon.handle(request, send)
+                    break
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = Server(str(self.socket_path), Handler)
+        finally:
+            os.umask(previous_umask)
+        return self._server
+
+    def serve_forever(self) -> None:
+        server = self._server or self.build_server()
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self.socket_path.unlink(missing_ok=True)
+
+
+def main(argv=None) -> None:
+    from storycraftr.llm.credentials import load_local_credentials
+
+    parser = argparse.ArgumentParser(description="Run the StoryCraftr daemon.")
+    parser.add_argument("--socket", default=None, help="Unix socket path.")
+    args = parser.parse_args(argv)
+
+    # Requests handled here must never be forwarded back to this daemon.
+    os.environ[DISABLE_ENV] = "1"
+    load_local_credentials()
+    daemon = AssistantDaemon(args.socket)
+    daemon.build_server()
+    console.print(
+        f"[green]StoryCraftr daemon listening on {daemon.socket_path}[/green]"
+    )
+    daemon.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
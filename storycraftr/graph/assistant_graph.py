@@ -1,30 +1,79 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+from contextlib import nullcontext
 from typing import List
 
 from langchain_core.documents import Document
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import (
     RunnableLambda,
     RunnableParallel,
     RunnablePassthrough,
 )
 
+from storycraftr.llm.context import ContextBudget
+from storycraftr.utils.timing import activate, current_timer, stage
+from storycraftr.vectorstores.chunking import describe_location
+from storycraftr.vectorstores.keyword import reciprocal_rank_fusion
+
+logger = logging.getLogger(__name__)
+
 
 def _format_context(documents: List[Document]) -> str:
     if not documents:
         return ""
     snippets = []
     for doc in documents:
-        source = doc.metadata.get("source", "context")
+        source = describe_location(doc.metadata)
         text = doc.page_content.strip()
         snippets.append(f"Source: {source}\n{text}")
     return "\n\n".join(snippets)
 
 
+def _inline(func) -> RunnableLambda:
+    """
+    Wrap a cheap pure function so async runs call it on the event loop
+    instead of handing it to a thread pool.
+    """
+
+    async def afunc(value):
+        return func(value)
+
+    return RunnableLambda(func, afunc=afunc)
+
+
 def build_assistant_graph(assistant):
-    """Create a LangChain runnable graph for the assistant."""
+    """
+    Create a LangChain runnable graph for the assistant.
+
+    ``graph.invoke`` returns ``{"answer", "documents"}``; ``graph.stream`` (and
+    ``astream``) yields ``{"documents": [...]}`` once retrieval finishes and then
+    ``{"answer": delta}`` chunks as the model generates tokens. ``ainvoke`` and
+    ``astream`` run natively on the event loop: retrieval goes through the
+    retriever's ``ainvoke`` and the model through its async API.
+
+    Besides ``question`` the payload may carry ``file_text`` (a file the
+    question refers to) and ``history`` (earlier messages of the thread).
+    The assistant's ``context_budget`` sizes the file, the retrieved
+    documents and the history against the model's context window before
+    the call; ``documents`` in the output are the ones that were sent. How
+    many documents and history messages were dropped is logged and recorded
+    on the ``timer``. A file or question that does not fit raises
+    ``ContextOverflowError`` rather than being shortened.
+    A ``timer`` (``TurnTimer``) in the payload records the embedding,
+    search, keyword and prompt-assembly stages; pass ``timer.config()`` as
+    the run config to also time the model call.
+
+    When the assistant has a ``keyword_index`` the dense hits are fused with
+    BM25 keyword hits using reciprocal-rank fusion. While a background index
+    build is running, dense retrieval failures are tolerated and the answer
+    relies on keyword hits and the partially built store. Retrieval holds a
+    read lease on the assistant's index ``generation`` so a concurrent
+    rebuild never deletes the store under it.
+    """
 
     if not assistant.retriever:
         raise RuntimeError("Assistant retriever is not initialised.")
@@ -32,54 +81,140 @@ def build_assistant_graph(assistant):
     prompt = ChatPromptTemplate.from_messages(
         [
             ("system", "{system_prompt}"),
+            MessagesPlaceholder("history", optional=True),
             ("human", "{question}"),
         ]
     )
+    budget = getattr(assistant, "context_budget", None) or ContextBudget()
 
     prompt_chain = prompt | assistant.llm | StrOutputParser()
 
-    def ensure_inputs(payload):
+    def validate(payload) -> dict:
         if isinstance(payload, str):
             payload = {"question": payload}
         elif not isinstance(payload, dict):
             raise ValueError("Graph input must be a question string or a dict payload.")
 
-        question = payload.get("question")
-        if not question:
+        if not payload.get("question"):
             raise ValueError("Missing 'question' in graph payload.")
+        return payload
+
+    def with_documents(payload: dict, documents) -> dict:
+        if not isinstance(documents, list):
+            documents = [documents]
+        payload["documents"] = documents
+        return payload
 
+    def lease():
+        generation = getattr(assistant, "generation", None)
+        return generation.reading() if generation is not None else nullcontext()
+
+    def ensure_inputs(payload):
+        payload = validate(payload)
         documents = payload.get("documents")
         if not documents:
-            documents = assistant.retriever.invoke(question)
+            with activate(payload.get("timer")), lease():
+                documents = fuse(payload["question"], dense(payload["question"]))
+        return with_documents(payload, documents)
 
+    async def aensure_inputs(payload):
+        payload = validate(payload)
+        documents = payload.get("documents")
+        if not documents:
+            with activate(payload.get("timer")), lease():
+                question = payload["question"]
+                documents = await adense(question)
+                # The keyword index is a local SQLite query; keep it off the
+                # event loop all the same.
+                documents = await asyncio.to_thread(fuse, question, documents)
+        return with_documents(payload, documents)
+
+    def dense(question: str) -> List[Document]:
+        try:
+            with stage("search", exclude=("embed",)):
+                return assistant.retriever.invoke(question)
+        except Exception:
+            return tolerate_build_failure()
+
+    async def adense(question: str) -> List[Document]:
+        try:
+            with stage("search", exclude=("embed",)):
+                return await assistant.retriever.ainvoke(question)
+        except Exception:
+            return tolerate_build_failure()
+
+    def tolerate_build_failure() -> List[Document]:
+        build = getattr(assistant, "index_build", None)
+        if build is None or not build.running:
+            raise
+        return []
+
+    def fuse(question: str, documents) -> List[Document]:
         if not isinstance(documents, list):
             documents = [documents]
-
-        payload["question"] = question
-        payload["documents"] = documents
-        return payload
+        keyword_index = getattr(assistant, "keyword_index", None)
+        if keyword_index is not None:
+            # Dense search misses exact proper nouns; BM25 catches them.
+            limit = getattr(assistant, "retrieval_k", 6)
+            with stage("keyword"):
+                documents = reciprocal_rank_fusion(
+                    [documents, keyword_index.search(question, k=limit)], limit
+                )
+        return documents
 
     def prepare_prompt_inputs(payload):
-        documents = payload["documents"]
-        context = _format_context(documents)
+        with activate(payload.get("timer")), stage("prompt"):
+            return assemble_prompt(payload)
+
+    def assemble_prompt(payload):
         system_prompt = assistant.system_prompt
+        fitted = budget.fit(
+            system_prompt,
+            payload["question"],
+            documents=payload["documents"],
+            file_text=payload.get("file_text"),
+            history=payload.get("history") or [],
+        )
+        report_dropped(fitted)
+        context = _format_context(fitted.documents)
         if context:
             system_prompt = f"{system_prompt}\n\nContext:\n{context}"
         return {
             "prompt_inputs": {
                 "system_prompt": system_prompt,
-                "question": payload["question"],
+                "history": fitted.history,
+                "question": budget.render_question(fitted),
             },
-            "documents": documents,
+            "documents": fitted.documents,
         }
 
+    def report_dropped(fitted) -> None:
+        dropped = {
+            "documents": fitted.dropped_documents,
+            "messages": fitted.dropped_messages,
+        }
+        dropped = {name: count for name, count in dropped.items() if count}
+        if not dropped:
+            return
+        # Trimming old turns is routine in long chats; losing passages is not.
+        logger.log(
+            logging.WARNING if fitted.dropped_documents else logging.INFO,
+            "Context window full: dropped %d retrieved passage(s) and %d history "
+            "message(s).",
+            fitted.dropped_documents,
+            fitted.dropped_messages,
+        )
+        timer = current_timer()
+        if timer is not None:
+            timer.dropped.update(dropped)
+
     graph = (
         RunnablePassthrough()
-        | RunnableLambda(ensure_inputs)
-        | RunnableLambda(prepare_prompt_inputs)
+        | RunnableLambda(ensure_inputs, afunc=aensure_inputs)
+        | _inline(prepare_prompt_inputs)
         | RunnableParallel(
-            answer=RunnableLambda(lambda x: x["prompt_inputs"]) | prompt_chain,
-            documents=RunnableLambda(lambda x: x["documents"]),
+            answer=_inline(lambda x: x["prompt_inputs"]) | prompt_chain,
+            documents=_inline(lambda x: x["documents"]),
         )
     )
 
@@ -3,7 +3,6 @@ import json
 from rich.console import Console
 from pathlib import Path
 import storycraftr.templates.folder_story
-from storycraftr.agent.agents import create_or_get_assistant
 from storycraftr.subagents import seed_default_roles
 from storycraftr.templates.tex import TEMPLATE_TEX
 from storycraftr.templates.paper_tex import TEMPLATE_PAPER_TEX
@@ -128,6 +127,9 @@ def init_structure_story(
     ensure_local_docs(book_path, filenames)
 
     seed_default_roles(book_path, language=primary_language, force=False)
+
+    from storycraftr.agent.agents import create_or_get_assistant
+
     create_or_get_assistant(book_path)
 
 
@@ -205,4 +207,6 @@ def init_structure_paper(
     console.print(f"[green]IEEE template created: {ieee_template_file}[/green]")
 
     # Initialize the assistant
+    from storycraftr.agent.agents import create_or_get_assistant
+
     create_or_get_assistant(paper_path)
@@ -3,6 +3,7 @@ from .vscode import (
     create_vscode_event_emitter,
     install_vscode_extension,
     is_running_in_vscode,
+    read_events,
     VS_CODE_EXTENSION_ID,
 )
 
@@ -11,5 +12,6 @@ __all__ = [
     "create_vscode_event_emitter",
     "install_vscode_extension",
     "is_running_in_vscode",
+    "read_events",
     "VS_CODE_EXTENSION_ID",
 ]
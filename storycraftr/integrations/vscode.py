@@ -1,15 +1,41 @@
 from __future__ import annotations
 
+import atexit
+import bisect
 import json
+import logging
 import os
 import shutil
 import subprocess  # nosec B404
 import threading
+import time
+import weakref
 from pathlib import Path
-from typing import Optional
+from queue import Empty, Queue
+from typing import IO, Iterator, List, Optional, Tuple
 
 from rich.console import Console
 
+logger = logging.getLogger(__name__)
+
+EVENTS_FILENAME = "vscode-events.jsonl"
+INDEX_FILENAME = "vscode-events.idx"
+FLUSH_INTERVAL = 0.25
+FLUSH_BYTES = 64 * 1024
+MAX_QUEUED_EVENTS = 10_000
+SEGMENT_BYTES = 4 * 1024 * 1024
+KEEP_SEGMENTS = 3
+
+# Emitters still open at interpreter exit are closed so that events queued
+# by a session that ended with an exception are not lost with the writer.
+_OPEN_EMITTERS: "weakref.WeakSet[VSCodeEventEmitter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_emitters() -> None:
+    for emitter in list(_OPEN_EMITTERS):
+        emitter.close()
+
 
 _VS_CODE_SENTINELS = {
     "TERM_PROGRAM": "vscode",
@@ -40,27 +66,255 @@ class VSCodeEventEmitter:
     """
     Emits JSON lines describing StoryCraftr events so a VS Code extension
     can mirror chat output, background jobs, etc.
+
+    ``emit`` only numbers and serialises the event; a background thread
+    appends queued events in batches, once ``flush_bytes`` are waiting or
+    ``flush_interval`` seconds after the first one, keeping the file open
+    in between. The queue holds at most ``max_queue`` events, after which
+    ``emit`` blocks until the writer catches up. Call ``flush`` to wait for
+    everything emitted so far and ``close`` at the end of the session;
+    emitters left open are closed at interpreter exit.
+
+    Every event carries an increasing ``seq``. When the stream reaches
+    ``segment_bytes`` it is renamed to ``vscode-events.<first seq>.jsonl``
+    and a new one is started; only the newest ``keep_segments`` rotated
+    segments are kept. ``vscode-events.idx`` records where each batch
+    starts, so ``read_events`` resumes after a sequence number without
+    rescanning the stream.
     """
 
-    def __init__(self, book_path: str):
+    def __init__(
+        self,
+        book_path: str,
+        *,
+        flush_interval: float = FLUSH_INTERVAL,
+        flush_bytes: int = FLUSH_BYTES,
+        max_queue: int = MAX_QUEUED_EVENTS,
+        segment_bytes: int = SEGMENT_BYTES,
+        keep_segments: int = KEEP_SEGMENTS,
+    ):
         self._book_path = Path(book_path)
-        self._events_path = self._book_path / ".storycraftr" / "vscode-events.jsonl"
+        self._events_path = self._book_path / ".storycraftr" / EVENTS_FILENAME
         self._events_path.parent.mkdir(parents=True, exist_ok=True)
+        self._index_path = self._events_path.parent / INDEX_FILENAME
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.segment_bytes = segment_bytes
+        self.keep_segments = keep_segments
         self._lock = threading.Lock()
+        self._queue: Queue = Queue(maxsize=max(1, max_queue))
+        self._handle: Optional[IO[bytes]] = None
+        self._index: Optional[IO[bytes]] = None
+        self._seq, self._segment = self._restore()
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._run, name="vscode-events", daemon=True
+        )
+        self._writer.start()
+        _OPEN_EMITTERS.add(self)
 
     @property
     def path(self) -> Path:
         return self._events_path
 
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the latest emitted event."""
+        return self._seq
+
     def emit(self, event_type: str, payload: dict) -> None:
-        entry = {
-            "event": event_type,
-            "payload": payload,
-        }
-        data = json.dumps(entry, ensure_ascii=False)
         with self._lock:
-            with self._events_path.open("a", encoding="utf-8") as handle:
-                handle.write(data + "\n")
+            if self._closed:
+                return
+            self._seq += 1
+            entry = {
+                "seq": self._seq,
+                "event": event_type,
+                "payload": payload,
+            }
+            data = json.dumps(entry, ensure_ascii=False) + "\n"
+            self._queue.put((self._seq, data.encode("utf-8")))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every event emitted so far is written to the file."""
+        done = threading.Event()
+        with self._lock:
+            if self._closed:
+                return not self._writer.is_alive()
+            self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Write the remaining events and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        _OPEN_EMITTERS.discard(self)
+        self._writer.join(timeout)
+
+    # Writer thread --------------------------------------------------------------
+
+    def _run(self) -> None:
+        batch: List[Tuple[int, bytes]] = []
+        waiters: List[threading.Event] = []
+        size = 0
+        deadline = 0.0
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except Empty:
+                item = None
+            if isinstance(item, tuple):
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+                size += len(item[1])
+                if size < self.flush_bytes:
+                    continue
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            try:
+                if batch:
+                    self._write(batch)
+            except OSError as exc:  # pragma: no cover - disk full, etc.
+                logger.warning("Could not write VS Code events: %s", exc)
+            batch, size = [], 0
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+            if item is _STOP:
+                break
+        for handle in (self._handle, self._index):
+            if handle is not None:
+                handle.close()
+
+    def _write(self, batch: List[Tuple[int, bytes]]) -> None:
+        if self._handle is None:
+            self._handle = self._events_path.open("ab")
+            self._index = self._index_path.open("ab")
+        offset = self._handle.tell()
+        if offset >= self.segment_bytes:
+            self._rotate(first_seq=batch[0][0])
+            offset = 0
+        if self._segment is None:
+            self._segment = batch[0][0]
+        self._index.write(_index_record(batch[0][0], self._segment, offset))
+        self._index.flush()
+        self._handle.write(b"".join(data for _, data in batch))
+        self._handle.flush()
+
+    def _rotate(self, first_seq: int) -> None:
+        self._handle.close()
+        self._index.close()
+        segment = self._segment or 1
+        os.replace(self._events_path, _segment_path(self._events_path, segment))
+        rotated = sorted(
+            int(path.name.split(".")[1])
+            for path in self._events_path.parent.glob("vscode-events.*.jsonl")
+        )
+        kept = set(rotated[-self.keep_segments :] if self.keep_segments > 0 else [])
+        for old in rotated:
+            if old not in kept:
+                _segment_path(self._events_path, old).unlink(missing_ok=True)
+        # Drop index records of deleted segments.
+        records = [
+            record for record in _read_index(self._index_path) if record[1] in kept
+        ]
+        tmp_path = self._index_path.with_suffix(".idx.tmp")
+        tmp_path.write_bytes(b"".join(_index_record(*record) for record in records))
+        os.replace(tmp_path, self._index_path)
+        self._segment = first_seq
+        self._handle = self._events_path.open("ab")
+        self._index = self._index_path.open("ab")
+
+    def _restore(self) -> Tuple[int, Optional[int]]:
+        """Continue the sequence numbers of a previous session."""
+        records = _read_index(self._index_path)
+        if not records:
+            return 0, None
+        seq, segment, offset = records[-1]
+        try:
+            with self._events_path.open("rb") as handle:
+                handle.seek(offset)
+                for line in handle:
+                    seq = max(seq, _line_seq(line))
+        except OSError:
+            # The stream was deleted to reset the integration.
+            self._index_path.unlink(missing_ok=True)
+            return 0, None
+        return seq, segment
+
+
+_STOP = object()
+_INDEX_FIELD = 12
+_INDEX_RECORD = 3 * (_INDEX_FIELD + 1)
+
+
+def _index_record(seq: int, segment: int, offset: int) -> bytes:
+    """Fixed-width ``<first seq> <segment> <byte offset>`` line."""
+    return f"{seq:012d} {segment:012d} {offset:012d}\n".encode("ascii")
+
+
+def _read_index(path: Path) -> List[Tuple[int, int, int]]:
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return []
+    records = []
+    for start in range(0, len(data) - _INDEX_RECORD + 1, _INDEX_RECORD):
+        fields = data[start : start + _INDEX_RECORD].split()
+        if len(fields) == 3:
+            records.append((int(fields[0]), int(fields[1]), int(fields[2])))
+    return records
+
+
+def _segment_path(events_path: Path, segment: int) -> Path:
+    return events_path.with_name(f"vscode-events.{segment:012d}.jsonl")
+
+
+def _line_seq(line: bytes) -> int:
+    try:
+        return int(json.loads(line).get("seq", 0))
+    except (ValueError, AttributeError):
+        return 0
+
+
+def read_events(book_path: str, after_seq: int = 0) -> Iterator[dict]:
+    """
+    Events with a ``seq`` above ``after_seq`` from a book's event stream,
+    oldest first, across rotated segments. The index locates the batch to
+    start from with a binary search; events already pruned are skipped.
+    """
+    events_path = Path(book_path) / ".storycraftr" / EVENTS_FILENAME
+    records = _read_index(events_path.parent / INDEX_FILENAME)
+    if not records:
+        starts = [(None, 0)]
+    else:
+        position = bisect.bisect_right([seq for seq, _, _ in records], after_seq + 1)
+        first = records[max(0, position - 1)]
+        active = records[-1][1]
+        segments = sorted({segment for _, segment, _ in records if segment >= first[1]})
+        starts = [
+            (
+                None if segment == active else segment,
+                first[2] if segment == first[1] else 0,
+            )
+            for segment in segments
+        ]
+    for segment, offset in starts:
+        path = events_path if segment is None else _segment_path(events_path, segment)
+        try:
+            handle = path.open("rb")
+        except OSError:
+            continue  # pruned while reading
+        with handle:
+            handle.seek(offset)
+            for line in handle:
+                if _line_seq(line) > after_seq:
+                    yield json.loads(line)
 
 
 def create_vscode_event_emitter(
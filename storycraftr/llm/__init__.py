@@ -6,5 +6,58 @@ infrastructure from the project configuration while keeping provider-specific
 details isolated from the rest of the codebase.
 """
 
-from .factory import build_chat_model, LLMSettings  # noqa: F401
-from .embeddings import build_embedding_model, EmbeddingSettings  # noqa: F401
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Exports are resolved on first access so that importing lightweight helpers
+# (credentials, settings) does not pull LangChain into CLI startup.
+_EXPORTS = {
+    "build_chat_model": ".factory",
+    "ContextBudget": ".context",
+    "ContextOverflowError": ".context",
+    "CachedChatModel": ".cache",
+    "LLMCacheMissError": ".cache",
+    "LLMSettings": ".factory",
+    "build_embedding_model": ".embeddings",
+    "CachedEmbeddings": ".embeddings",
+    "EmbeddingSettings": ".embeddings",
+    "HashEmbeddings": ".embeddings",
+    "EmbeddingPool": ".embeddings",
+    "embedding_pool_stats": ".embeddings",
+    "release_embedding_model": ".embeddings",
+    "unload_embedding_models": ".embeddings",
+    "RateLimitedChatModel": ".ratelimit",
+    "RateLimits": ".ratelimit",
+    "rate_limit_stats": ".ratelimit",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .cache import CachedChatModel, LLMCacheMissError  # noqa: F401
+    from .context import ContextBudget, ContextOverflowError  # noqa: F401
+    from .embeddings import (  # noqa: F401
+        CachedEmbeddings,
+        EmbeddingPool,
+        EmbeddingSettings,
+        HashEmbeddings,
+        build_embedding_model,
+        embedding_pool_stats,
+        release_embedding_model,
+        unload_embedding_models,
+    )
+    from .factory import LLMSettings, build_chat_model  # noqa: F401
+    from .ratelimit import (  # noqa: F401
+        RateLimitedChatModel,
+        RateLimits,
+        rate_limit_stats,
+    )
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.callbacks.manager import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    message_to_dict,
+    messages_from_dict,
+    messages_to_dict,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import ConfigDict, Field
+
+CACHE_MODES = ("off", "on", "replay")
+
+
+class LLMCacheMissError(RuntimeError):
+    """Raised in replay mode when a request has no recorded response."""
+
+
+class CachedChatModel(BaseChatModel):
+    """
+    Chat model wrapper that records responses in a persistent store.
+
+    Requests are keyed by ``namespace`` (provider, model and temperature), the
+    full message list and stop sequences. A hit is served without contacting
+    the provider; in replay-only mode a miss raises ``LLMCacheMissError``
+    instead of calling the underlying model.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    underlying: BaseChatModel
+    store: Any = Field(exclude=True)
+    namespace: str
+    replay_only: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return f"cached-{self.underlying._llm_type}"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"namespace": self.namespace, "replay_only": self.replay_only}
+
+    def cache_key(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None
+    ) -> str:
+        payload = json.dumps(
+            {
+                "namespace": self.namespace,
+                "messages": messages_to_dict(messages),
+                "stop": stop or [],
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _lookup(self, key: str) -> Optional[ChatResult]:
+        blob = self.store.get(key)
+        if blob is None:
+            return None
+        data = json.loads(blob.decode("utf-8"))
+        generations = [
+            ChatGeneration(
+                message=messages_from_dict([item["message"]])[0],
+                generation_info=item.get("info"),
+            )
+            for item in data["generations"]
+        ]
+        return ChatResult(generations=generations, llm_output=data.get("llm_output"))
+
+    def _record(self, key: str, result: ChatResult) -> None:
+        payload = {
+            "generations": [
+                {"message": message_to_dict(gen.message), "info": gen.generation_info}
+                for gen in result.generations
+            ],
+            "llm_output": result.llm_output,
+        }
+        self.store.put(key, json.dumps(payload, default=str).encode("utf-8"))
+
+    def _miss(self, key: str) -> None:
+        if self.replay_only:
+            raise LLMCacheMissError(
+                f"No recorded response for request {key[:12]} "
+                f"({self.namespace}); disable replay mode to call the provider."
+            )
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs,
+    ) -> ChatResult:
+        key = self.cache_key(messages, stop)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        self._miss(key)
+        result = self.underlying._generate(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+        self._record(key, result)
+        return result
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs,
+    ) -> Iterator[ChatGenerationChunk]:
+        key = self.cache_key(messages, stop)
+        cached = self._lookup(key)
+        if cached is None:
+            self._miss(key)
+            if type(self.underlying)._stream is BaseChatModel._stream:
+                # Models without native streaming answer in a single chunk.
+                cached = self.underlying._generate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+                self._record(key, cached)
+            else:
+                parts: List[str] = []
+                for chunk in self.underlying._stream(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                ):
+                    parts.append(chunk.text)
+                    yield chunk
+                message = AIMessage(content="".join(parts))
+                self._record(
+                    key, ChatResult(generations=[ChatGeneration(message=message)])
+                )
+                return
+
+        text = cached.generations[0].text if cached.generations else ""
+        if run_manager:
+            run_manager.on_llm_new_token(text)
+        yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs,
+    ) -> ChatResult:
+        key = self.cache_key(messages, stop)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        self._miss(key)
+        result = await self.underlying._agenerate(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+        self._record(key, result)
+        return result
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        key = self.cache_key(messages, stop)
+        cached = self._lookup(key)
+        if cached is None:
+            self._miss(key)
+            underlying = type(self.underlying)
+            if (
+                underlying._astream is BaseChatModel._astream
+                and underlying._stream is BaseChatModel._stream
+            ):
+                cached = await self.underlying._agenerate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+                self._record(key, cached)
+            else:
+                parts: List[str] = []
+                async for chunk in self.underlying._astream(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                ):
+                    parts.append(chunk.text)
+                    yield chunk
+                message = AIMessage(content="".join(parts))
+                self._record(
+                    key, ChatResult(generations=[ChatGeneration(message=message)])
+                )
+                return
+
+        text = cached.generations[0].text if cached.generations else ""
+        if run_manager:
+            await run_manager.on_llm_new_token(text)
+        yield ChatGenerationChunk(message=AIMessageChunk(content=text))
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+from storycraftr.vectorstores.chunking import count_tokens, describe_location
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from langchain_core.documents import Document
+    from langchain_core.messages import BaseMessage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTEXT_WINDOW = 8192
+DEFAULT_OUTPUT_TOKENS = 2048
+# Per-message framing (role markers, separators) added by chat templates.
+MESSAGE_OVERHEAD_TOKENS = 4
+# Joins the file a request refers to (``file_path``) onto the question.
+FILE_SECTION = "\n\nHere is the existing content to adjust:\n"
+
+# Longest matching prefix wins; names are compared lower-cased and without
+# an OpenRouter-style ``vendor/`` prefix. A prefix only matches up to a
+# separator, so ``llama3`` does not claim ``llama3.2``.
+_MODEL_WINDOWS: Tuple[Tuple[str, int], ...] = (
+    ("gpt-4.1", 1_047_576),
+    ("gpt-4o", 128_000),
+    ("gpt-4-turbo", 128_000),
+    ("gpt-4-32k", 32_768),
+    ("gpt-4", 8_192),
+    ("gpt-3.5-turbo", 16_385),
+    ("o1", 200_000),
+    ("o3", 200_000),
+    ("o4", 200_000),
+    ("claude", 200_000),
+    ("gemini", 1_000_000),
+    ("mistral", 32_768),
+    ("mixtral", 32_768),
+    ("llama3.1", 131_072),
+    ("llama-3.1", 131_072),
+    ("llama3.2", 131_072),
+    ("llama-3.2", 131_072),
+    ("llama3.3", 131_072),
+    ("llama-3.3", 131_072),
+    ("llama3", 8_192),
+    ("llama-3", 8_192),
+    ("qwen", 32_768),
+    ("qwen2", 32_768),
+    ("qwen2.5", 32_768),
+    ("qwen3", 32_768),
+)
+
+
+class ContextOverflowError(ValueError):
+    """The question or the file being revised does not fit the window."""
+
+
+def _matches(name: str, prefix: str) -> bool:
+    if not name.startswith(prefix):
+        return False
+    rest = name[len(prefix) :]
+    return not rest or not (rest[0].isalnum() or rest[0] == ".")
+
+
+def context_window_for(model: str, default: int = DEFAULT_CONTEXT_WINDOW) -> int:
+    """Best-known context window of ``model`` in tokens, else ``default``."""
+    name = (model or "").lower().rsplit("/", 1)[-1]
+    best: Optional[Tuple[str, int]] = None
+    for prefix, window in _MODEL_WINDOWS:
+        if _matches(name, prefix) and (best is None or len(prefix) > len(best[0])):
+            best = (prefix, window)
+    return best[1] if best else default
+
+
+def document_tokens(document: Document) -> int:
+    source = describe_location(document.metadata)
+    return count_tokens(f"Source: {source}\n{document.page_content.strip()}") + 2
+
+
+def message_tokens(message: BaseMessage) -> int:
+    return count_tokens(str(message.content)) + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass
+class FittedContext:
+    """What ``ContextBudget.fit`` kept for one request."""
+
+    question: str
+    documents: List[Document] = field(default_factory=list)
+    file_text: Optional[str] = None
+    history: List[BaseMessage] = field(default_factory=list)
+    prompt_tokens: int = 0
+    dropped_documents: int = 0
+    dropped_messages: int = 0
+
+
+@dataclass
+class ContextBudget:
+    """
+    Sizes one request against the model's context window.
+
+    ``output_tokens`` are kept free for the answer. The system prompt, the
+    question and the injected file always go in whole: commands save the
+    answer over that file, so shortening it would lose text for good.
+    ``fit`` raises ``ContextOverflowError`` when they do not fit. The rest
+    of the budget goes, in priority order, to retrieved documents in rank
+    order (skipping any that do not fit) and then to the most recent
+    conversation turns that still fit.
+
+    ``window_assumed`` marks a window guessed for an unknown model.
+    """
+
+    window: int = DEFAULT_CONTEXT_WINDOW
+    output_tokens: int = DEFAULT_OUTPUT_TOKENS
+    model: str = ""
+    window_assumed: bool = False
+
+    @classmethod
+    def from_config(cls, config) -> "ContextBudget":
+        model = getattr(config, "llm_model", "") or ""
+        window = int(getattr(config, "llm_context_window", 0) or 0)
+        assumed = False
+        if window <= 0:
+            window = context_window_for(model, default=0)
+        if window <= 0:
+            window, assumed = DEFAULT_CONTEXT_WINDOW, True
+            logger.warning(
+                "Unknown context window for model '%s'; assuming %d tokens. "
+                "Set llm_context_window in storycraftr.json.",
+                model,
+                window,
+            )
+        output_tokens = int(
+            getattr(config, "llm_max_output_tokens", DEFAULT_OUTPUT_TOKENS)
+            or DEFAULT_OUTPUT_TOKENS
+        )
+        return cls(
+            window=window,
+            output_tokens=min(output_tokens, window // 2),
+            model=model,
+            window_assumed=assumed,
+        )
+
+    @property
+    def prompt_tokens(self) -> int:
+        return max(0, self.window - self.output_tokens)
+
+    def render_question(self, fitted: FittedContext) -> str:
+        if not fitted.file_text:
+            return fitted.question
+        return f"{fitted.question}{FILE_SECTION}{fitted.file_text}"
+
+    def fit(
+        self,
+        system_prompt: str,
+        question: str,
+        documents: Sequence[Document] = (),
+        file_text: Optional[str] = None,
+        history: Sequence[BaseMessage] = (),
+    ) -> FittedContext:
+        available = self.prompt_tokens - count_tokens(system_prompt)
+        available -= 2 * MESSAGE_OVERHEAD_TOKENS
+        fitted = FittedContext(question=question, file_text=file_text or None)
+        required = count_tokens(self.render_question(fitted))
+        if required > available:
+            raise ContextOverflowError(self._overflow_message(required, available))
+        available -= required
+
+        for document in documents:
+            size = document_tokens(document)
+            if size <= available:
+                fitted.documents.append(document)
+                available -= size
+            else:
+                fitted.dropped_documents += 1
+
+        kept: List[BaseMessage] = []
+        messages = list(history)
+        # Whole turns only, newest first, so the history never starts with
+        # an orphaned answer.
+        while len(messages) >= 2:
+            turn = messages[-2:]
+            size = sum(message_tokens(message) for message in turn)
+            if size > available:
+                break
+            kept[:0] = turn
+            available -= size
+            del messages[-2:]
+        fitted.history = kept
+        fitted.dropped_messages = len(history) - len(kept)
+        fitted.prompt_tokens = self.prompt_tokens - available
+        return fitted
+
+    def _overflow_message(self, required: int, available: int) -> str:
+        message = (
+            f"The request and the file it revises need about {required} tokens, "
+            f"but only {max(0, available)} fit in the {self.window}-token context "
+            f"window after reserving {self.output_tokens} for the answer. "
+        )
+        if self.window_assumed:
+            return message + (
+                f"The window of model '{self.model}' is unknown; set "
+                "llm_context_window in storycraftr.json."
+            )
+        return message + (
+            "Split the file, or use a model with a larger context window "
+            "(llm_context_window)."
+        )
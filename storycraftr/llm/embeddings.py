@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import hashlib
+import math
 import os
+import re
+import threading
+from array import array
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
-from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_core.embeddings import Embeddings
+
+from storycraftr.utils.sqlite_cache import SQLiteLRUCache
+from storycraftr.utils.timing import stage
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
 
 
 @dataclass
@@ -15,6 +25,8 @@ class EmbeddingSettings:
     device: str = "auto"
     cache_dir: Optional[str] = None
     normalize: Optional[bool] = None
+    vector_cache_path: Optional[str] = None
+    vector_cache_size: int = 200_000
 
 
 def _should_normalize(model_name: str, explicit: Optional[bool]) -> bool:
@@ -23,12 +35,45 @@ def _should_normalize(model_name: str, explicit: Optional[bool]) -> bool:
     return "bge" in model_name.lower()
 
 
-def build_embedding_model(settings: EmbeddingSettings):
+def build_embedding_model(settings: EmbeddingSettings, shared: bool = True):
     """
     Build a HuggingFace embedding model with sane defaults for local usage.
+
+    The model name ``hash`` (or ``hash:<dimensions>``) selects the
+    deterministic ``HashEmbeddings`` used by tests and benchmarks.
+
+    With ``shared`` (the default) model weights come from the process-wide
+    ``EmbeddingPool``, so projects using the same model share one copy; hand
+    the result to ``release_embedding_model`` when the project is closed.
+    The stateless hash model is never pooled. The per-project vector cache
+    is always layered on top.
     """
 
+    if shared and not _is_hash_model(settings.model_name):
+        model = _POOL.acquire(settings)
+    else:
+        model = _load_embedding_model(settings)
+
+    if not settings.vector_cache_path:
+        return model
+    return CachedEmbeddings(
+        model,
+        SQLiteLRUCache(settings.vector_cache_path, settings.vector_cache_size),
+        namespace=f"{settings.model_name}|normalize="
+        f"{_should_normalize(settings.model_name, settings.normalize)}",
+    )
+
+
+def _is_hash_model(model_name: str) -> bool:
+    name = model_name.lower()
+    return name == "hash" or name.startswith("hash:")
+
+
+def _load_embedding_model(settings: EmbeddingSettings) -> Embeddings:
     model_name_lower = settings.model_name.lower()
+    if _is_hash_model(model_name_lower):
+        _, _, dimensions = model_name_lower.partition(":")
+        return HashEmbeddings(int(dimensions) if dimensions else 384)
     if model_name_lower in {"fake", "offline", "offline-placeholder"}:
         raise RuntimeError(
             "Embedding provider is set to a placeholder model. Configure a valid embedding model."
@@ -46,7 +91,9 @@ def build_embedding_model(settings: EmbeddingSettings):
         encode_kwargs["normalize_embeddings"] = True
 
     try:
-        return HuggingFaceEmbeddings(
+        from langchain_huggingface import HuggingFaceEmbeddings
+
+        model = HuggingFaceEmbeddings(
             model_name=settings.model_name,
             model_kwargs=model_kwargs,
             encode_kwargs=encode_kwargs,
@@ -56,3 +103,209 @@ def build_embedding_model(settings: EmbeddingSettings):
             f"Failed to load embedding model '{settings.model_name}'. "
             "Install prerequisites or provide a reachable model."
         ) from exc
+    return model
+
+
+PoolKey = Tuple[str, str, bool]
+
+
+class SharedEmbeddings(Embeddings):
+    """
+    One loaded embedding model shared by every project in the process.
+
+    Calls are serialised with a lock, so concurrent index builds and
+    retrievals can use the same instance safely.
+    """
+
+    def __init__(self, key: PoolKey, underlying: Embeddings):
+        self.key = key
+        self.underlying = underlying
+        self.refs = 0
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            return self.underlying.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        with stage("embed"), self._lock:
+            return self.underlying.embed_query(text)
+
+
+class EmbeddingPool:
+    """
+    Reference-counted registry of loaded embedding models keyed by
+    ``(model, device, normalize)``.
+
+    Released models stay loaded so the next project that needs them starts
+    instantly; ``unload`` frees the ones nobody holds.
+    """
+
+    def __init__(self, loader: Callable[[EmbeddingSettings], Embeddings]):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._models: Dict[PoolKey, SharedEmbeddings] = {}
+
+    @staticmethod
+    def key_for(settings: EmbeddingSettings) -> PoolKey:
+        return (
+            settings.model_name,
+            settings.device or "auto",
+            _should_normalize(settings.model_name, settings.normalize),
+        )
+
+    def acquire(self, settings: EmbeddingSettings) -> SharedEmbeddings:
+        key = self.key_for(settings)
+        with self._lock:
+            shared = self._models.get(key)
+            if shared is None:
+                # Loading under the lock keeps two projects from loading the
+                # same weights at once.
+                shared = SharedEmbeddings(key, self._loader(settings))
+                self._models[key] = shared
+            shared.refs += 1
+            return shared
+
+    def release(self, model: Embeddings) -> None:
+        if isinstance(model, CachedEmbeddings):
+            model = model.underlying
+        if not isinstance(model, SharedEmbeddings):
+            return
+        with self._lock:
+            if self._models.get(model.key) is model and model.refs > 0:
+                model.refs -= 1
+
+    def unload(self, model_name: Optional[str] = None) -> List[str]:
+        """
+        Drop loaded models that no project holds (optionally only
+        ``model_name``) and return their names.
+        """
+        with self._lock:
+            idle = [
+                key
+                for key, shared in self._models.items()
+                if shared.refs == 0 and model_name in (None, key[0])
+            ]
+            for key in idle:
+                del self._models[key]
+        return [key[0] for key in idle]
+
+    def stats(self) -> Dict[PoolKey, int]:
+        with self._lock:
+            return {key: shared.refs for key, shared in self._models.items()}
+
+
+_POOL = EmbeddingPool(_load_embedding_model)
+
+
+def release_embedding_model(model: Embeddings) -> None:
+    """Give back a model obtained from ``build_embedding_model``."""
+    _POOL.release(model)
+
+
+def unload_embedding_models(model_name: Optional[str] = None) -> List[str]:
+    """Free shared embedding models that no open project uses."""
+    return _POOL.unload(model_name)
+
+
+def embedding_pool_stats() -> Dict[PoolKey, int]:
+    """Return the reference count of every loaded shared model."""
+    return _POOL.stats()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that persists vectors keyed by model and text hash.
+
+    Cached rows are served in bulk and only the misses reach the underlying
+    model, so re-indexing unchanged text costs no inference at all.
+    """
+
+    def __init__(self, underlying: Embeddings, store: SQLiteLRUCache, namespace: str):
+        self.underlying = underlying
+        self.store = store
+        self.namespace = namespace
+
+    def close(self) -> None:
+        """Flush and close the vector cache; the model itself is untouched."""
+        self.store.close()
+
+    def _key(self, kind: str, text: str) -> str:
+        raw = f"{self.namespace}\0{kind}\0{text}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    @staticmethod
+    def _encode(vector: List[float]) -> bytes:
+        return array("f", vector).tobytes()
+
+    @staticmethod
+    def _decode(blob: bytes) -> List[float]:
+        values = array("f")
+        values.frombytes(blob)
+        return values.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key("document", text) for text in texts]
+        cached = self.store.get_many(keys)
+
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in pending:
+                pending[key] = text
+
+        vectors: Dict[str, List[float]] = {
+            key: self._decode(blob) for key, blob in cached.items()
+        }
+        if pending:
+            computed = self.underlying.embed_documents(list(pending.values()))
+            fresh = dict(zip(pending.keys(), computed))
+            self.store.put_many(
+                {key: self._encode(vector) for key, vector in fresh.items()}
+            )
+            vectors.update(fresh)
+
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        with stage("embed"):
+            key = self._key("query", text)
+            blob = self.store.get(key)
+            if blob is not None:
+                return self._decode(blob)
+            vector = self.underlying.embed_query(text)
+            self.store.put(key, self._encode(vector))
+            return vector
+
+
+class HashEmbeddings(Embeddings):
+    """
+    Deterministic, dependency-free embeddings based on feature hashing.
+
+    Each lower-cased word is hashed into one of ``dimensions`` signed buckets
+    and the result is L2-normalised, so texts sharing vocabulary are close.
+    Intended for tests and benchmarks that must not download or run a model.
+    """
+
+    def __init__(self, dimensions: int = 384):
+        if dimensions <= 0:
+            raise ValueError("HashEmbeddings requires a positive dimension count.")
+        self.dimensions = dimensions
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for token in _WORD_RE.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "big")
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dimensions] += sign
+        norm = math.sqrt(sum(component * component for component in vector))
+        if not norm:
+            return vector
+        return [component / norm for component in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        with stage("embed"):
+            return self._embed(text)
@@ -2,16 +2,13 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass, field
-from typing import Dict, Optional, List
-
-from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_openai import ChatOpenAI
-from langchain_community.chat_models import ChatOllama
-from langchain_core.messages import AIMessage, BaseMessage
-from langchain_core.outputs import ChatGeneration, ChatResult
-from langchain_core.callbacks.manager import CallbackManagerForLLMRun
+from typing import TYPE_CHECKING, Dict, Optional
+
 from rich.console import Console
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from langchain_core.language_models.chat_models import BaseChatModel
+
 console = Console()
 
 
@@ -36,6 +33,14 @@ class LLMSettings:
     temperature: float = 0.7
     request_timeout: Optional[float] = None
     default_headers: Dict[str, str] = field(default_factory=dict)
+    response_cache_path: Optional[str] = None
+    response_cache_size: int = 10_000
+    response_cache_mode: str = "off"
+    requests_per_minute: float = 0
+    tokens_per_minute: float = 0
+    max_retries: int = 4
+    retry_base_delay: float = 1.0
+    retry_max_delay: float = 60.0
 
 
 def _resolve_api_key(provider: str, explicit_env: Optional[str]) -> Optional[str]:
@@ -54,11 +59,71 @@ def build_chat_model(settings: LLMSettings) -> BaseChatModel:
     """
     Build a LangChain chat model according to the supplied settings.
 
+    Provider models are scheduled through a ``RateLimitedChatModel`` that
+    enforces the requests/tokens per minute budget and retries rate-limit
+    and transient errors. When a response cache is configured the model is
+    wrapped so identical requests are answered from disk (or, in ``replay``
+    mode, only from disk) without consuming that budget.
+
     Raises:
         RuntimeError: if required credentials are missing.
-        ValueError: if the provider is unsupported.
+        ValueError: if the provider or cache mode is unsupported.
     """
 
+    mode = (settings.response_cache_mode or "off").lower()
+    if mode == "off" or not settings.response_cache_path:
+        return _build_scheduled_model(settings)
+
+    from storycraftr.utils.sqlite_cache import SQLiteLRUCache
+
+    from .cache import CACHE_MODES, CachedChatModel
+
+    if mode not in CACHE_MODES:
+        raise ValueError(
+            f"Unsupported LLM cache mode '{settings.response_cache_mode}'. "
+            f"Expected one of: {', '.join(CACHE_MODES)}."
+        )
+    if mode == "replay":
+        # Replay never reaches the provider, so credentials are not required.
+        from .offline import OfflineChatModel
+
+        underlying = OfflineChatModel(template="{prompt}")
+    else:
+        underlying = _build_scheduled_model(settings)
+    return CachedChatModel(
+        underlying=underlying,
+        store=SQLiteLRUCache(
+            settings.response_cache_path, settings.response_cache_size
+        ),
+        namespace=f"{settings.provider.lower()}|{settings.model}|{settings.temperature}",
+        replay_only=mode == "replay",
+    )
+
+
+def _build_scheduled_model(settings: LLMSettings) -> BaseChatModel:
+    from .ratelimit import RateLimitedChatModel, RateLimits, get_rate_limiter
+
+    model = _build_provider_model(settings)
+    limits = RateLimits(
+        requests_per_minute=float(settings.requests_per_minute or 0),
+        tokens_per_minute=float(settings.tokens_per_minute or 0),
+        max_retries=int(settings.max_retries or 0),
+        retry_base_delay=float(settings.retry_base_delay),
+        retry_max_delay=float(settings.retry_max_delay),
+    )
+    provider = settings.provider.lower()
+    # The offline model never fails; only schedule it when limits are set
+    # (benchmarks use that to simulate a throttled provider).
+    if not limits.enabled or (
+        provider == "fake"
+        and not (limits.requests_per_minute or limits.tokens_per_minute)
+    ):
+        return model
+    limiter = get_rate_limiter(f"{provider}|{settings.endpoint or ''}", limits)
+    return RateLimitedChatModel(underlying=model, limiter=limiter)
+
+
+def _build_provider_model(settings: LLMSettings) -> BaseChatModel:
     provider = settings.provider.lower()
 
     if provider in ("openai", "openrouter"):
@@ -74,6 +139,9 @@ def build_chat_model(settings: LLMSettings) -> BaseChatModel:
             params["timeout"] = settings.request_timeout
         if base_url:
             params["base_url"] = base_url
+        if settings.max_retries:
+            # Retries are scheduled by RateLimitedChatModel instead.
+            params["max_retries"] = 0
 
         headers: Dict[str, str] = {}
         headers.update(settings.default_headers or {})
@@ -88,6 +156,8 @@ def build_chat_model(settings: LLMSettings) -> BaseChatModel:
         if headers:
             params["default_headers"] = headers
 
+        from langchain_openai import ChatOpenAI
+
         return ChatOpenAI(api_key=api_key, **params)
 
     if provider == "ollama":
@@ -101,45 +171,22 @@ def build_chat_model(settings: LLMSettings) -> BaseChatModel:
         if settings.request_timeout:
             params["timeout"] = settings.request_timeout
 
+        from langchain_community.chat_models import ChatOllama
+
         return ChatOllama(**params)
 
     if provider == "fake":
-        return _OfflineChatModel(
+        from .offline import OfflineChatModel
+
+        return OfflineChatModel(
             template=(
                 "Offline placeholder response for '{prompt}'. "
                 "Set llm_provider to openai/openrouter/ollama for real generations."
-            )
+            ),
+            latency=float(os.getenv("STORYCRAFTR_FAKE_LATENCY", "0") or 0),
+            tokens_per_second=float(
+                os.getenv("STORYCRAFTR_FAKE_TOKENS_PER_SECOND", "0") or 0
+            ),
         )
 
     raise ValueError(f"Unsupported LLM provider '{settings.provider}'.")
-
-
-class _OfflineChatModel(BaseChatModel):
-    """Minimal offline chat model that returns placeholder responses."""
-
-    template: str = (
-        "Offline placeholder response for '{prompt}'. "
-        "Set llm_provider to openai/openrouter/ollama for real generations."
-    )
-
-    def __init__(self, template: str):
-        super().__init__(template=template)
-
-    def _generate(
-        self,
-        messages: List[BaseMessage],
-        stop: Optional[List[str]] = None,
-        run_manager: Optional[CallbackManagerForLLMRun] = None,
-        **kwargs,
-    ) -> ChatResult:
-        prompt_text = ""
-        if messages:
-            last_message = messages[-1]
-            prompt_text = getattr(last_message, "content", str(last_message))
-        content = self.template.format(prompt=prompt_text)
-        generation = ChatGeneration(message=AIMessage(content=content))
-        return ChatResult(generations=[generation])
-
-    @property
-    def _llm_type(self) -> str:
-        return "offline-placeholder"
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from typing import AsyncIterator, Iterator, List, Optional
+
+from langchain_core.callbacks.manager import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+_TOKEN_RE = re.compile(r"\S+\s*|\s+")
+
+
+class OfflineChatModel(BaseChatModel):
+    """
+    Minimal offline chat model that returns placeholder responses.
+
+    ``latency`` (seconds before the first token) and ``tokens_per_second``
+    simulate a remote provider for benchmarks; both default to instant.
+    """
+
+    template: str = (
+        "Offline placeholder response for '{prompt}'. "
+        "Set llm_provider to openai/openrouter/ollama for real generations."
+    )
+    latency: float = 0.0
+    tokens_per_second: float = 0.0
+
+    def __init__(
+        self, template: str, latency: float = 0.0, tokens_per_second: float = 0.0
+    ):
+        super().__init__(
+            template=template, latency=latency, tokens_per_second=tokens_per_second
+        )
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        prompt_text = ""
+        if messages:
+            last_message = messages[-1]
+            prompt_text = getattr(last_message, "content", str(last_message))
+        return self.template.format(prompt=prompt_text)
+
+    def _token_delay(self) -> float:
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs,
+    ) -> ChatResult:
+        content = self._respond(messages)
+        delay = self.latency + self._token_delay() * len(_TOKEN_RE.findall(content))
+        if delay > 0:
+            time.sleep(delay)
+        generation = ChatGeneration(message=AIMessage(content=content))
+        return ChatResult(generations=[generation])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs,
+    ) -> Iterator[ChatGenerationChunk]:
+        content = self._respond(messages)
+        if self.latency > 0:
+            time.sleep(self.latency)
+        delay = self._token_delay()
+        for token in _TOKEN_RE.findall(content):
+            if delay:
+                time.sleep(delay)
+            if run_manager:
+                run_manager.on_llm_new_token(token)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs,
+    ) -> ChatResult:
+        content = self._respond(messages)
+        delay = self.latency + self._token_delay() * len(_TOKEN_RE.findall(content))
+        if delay > 0:
+            await asyncio.sleep(delay)
+        generation = ChatGeneration(message=AIMessage(content=content))
+        return ChatResult(generations=[generation])
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        content = self._respond(messages)
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        delay = self._token_delay()
+        for token in _TOKEN_RE.findall(content):
+            if delay:
+                await asyncio.sleep(delay)
+            if run_manager:
+                await run_manager.on_llm_new_token(token)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    @property
+    def _llm_type(self) -> str:
+        return "offline-placeholder"
@@ -0,0 +1,410 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks.manager import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from pydantic import ConfigDict, Field
+
+from storycraftr.vectorstores.chunking import count_tokens
+
+# Reserved for the answer until the provider reports actual usage.
+DEFAULT_COMPLETION_TOKENS = 1024
+_RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+_RETRY_NAMES = ("RateLimit", "Timeout", "APIConnectionError", "ServiceUnavailable")
+
+
+@dataclass
+class RateLimits:
+    """Per-provider request budget and retry policy (``0`` disables a limit)."""
+
+    requests_per_minute: float = 0
+    tokens_per_minute: float = 0
+    max_retries: int = 4
+    retry_base_delay: float = 1.0
+    retry_max_delay: float = 60.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(
+            self.requests_per_minute or self.tokens_per_minute or self.max_retries
+        )
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at ``per_minute / 60`` units per second, holding at
+    most one minute of budget.
+
+    ``reserve`` always succeeds and may drive the balance negative; the
+    caller sleeps for the returned delay, so concurrent callers queue up in
+    arrival order instead of polling.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        self._refill()
+        self._tokens -= amount
+        return max(0.0, -self._tokens / self.rate)
+
+    def refund(self, amount: float) -> None:
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+
+@dataclass
+class SchedulerStats:
+    """Counters of one ``RateLimiter`` for monitoring."""
+
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    failures: int = 0
+    queue_wait_total: float = 0.0
+    queue_wait_max: float = 0.0
+
+    @property
+    def queue_wait_mean(self) -> float:
+        return self.queue_wait_total / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        data = asdict(self)
+        data["queue_wait_mean"] = self.queue_wait_mean
+        return data
+
+
+class RateLimiter:
+    """
+    Shared admission control for one provider endpoint.
+
+    Every request reserves one request and its estimated tokens; a
+    ``Retry-After`` from the provider pauses all callers until it passes.
+    """
+
+    def __init__(self, limits: RateLimits, clock: Callable[[], float] = time.monotonic):
+        self.limits = limits
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._requests = (
+            TokenBucket(limits.requests_per_minute, clock)
+            if limits.requests_per_minute
+            else None
+        )
+        self._tokens = (
+            TokenBucket(limits.tokens_per_minute, clock)
+            if limits.tokens_per_minute
+            else None
+        )
+        self._blocked_until = 0.0
+        self._stats = SchedulerStats()
+
+    def reserve(self, tokens: int) -> float:
+        """Book a request of ``tokens`` and return how long to wait first."""
+        with self._lock:
+            wait = max(0.0, self._blocked_until - self._clock())
+            if self._requests is not None:
+                wait = max(wait, self._requests.reserve(1))
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.reserve(tokens))
+            self._stats.requests += 1
+            self._stats.queue_wait_total += wait
+            self._stats.queue_wait_max = max(self._stats.queue_wait_max, wait)
+        return wait
+
+    def settle(self, reserved: int, used: Optional[int]) -> None:
+        """Correct a reservation once the provider reports actual usage."""
+        if self._tokens is None or used is None:
+            return
+        with self._lock:
+            if used < reserved:
+                self._tokens.refund(reserved - used)
+            elif used > reserved:
+                self._tokens.reserve(used - reserved)
+
+    def block(self, seconds: float) -> None:
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+            self._stats.throttled += 1
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self._stats.retries += 1
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._stats.failures += 1
+
+    def backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential delay, never shorter than ``retry_after``."""
+        ceiling = min(
+            self.limits.retry_max_delay,
+            self.limits.retry_base_delay * (2**attempt),
+        )
+        delay = random.uniform(0, ceiling)  # nosec B311 - jitter, not crypto
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def stats(self) -> SchedulerStats:
+        with self._lock:
+            return SchedulerStats(**asdict(self._stats))
+
+
+_LIMITERS: Dict[str, RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(key: str, limits: RateLimits) -> RateLimiter:
+    """
+    Return the process-wide limiter for ``key`` (provider and endpoint), so
+    every project using the same account shares one budget. A limiter is
+    recreated when its limits change.
+    """
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None or limiter.limits != limits:
+            limiter = RateLimiter(limits)
+            _LIMITERS[key] = limiter
+        return limiter
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, float]]:
+    """Return request, retry, throttling and queue-wait counters per provider."""
+    with _LIMITERS_LOCK:
+        limiters = dict(_LIMITERS)
+    return {key: limiter.stats().as_dict() for key, limiter in limiters.items()}
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Read ``Retry-After`` (seconds or HTTP date) or ``retry-after-ms``."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    status = _status_code(exc)
+    if status is not None:
+        return status in _RETRY_STATUS
+    name = type(exc).__name__
+    return any(marker in name for marker in _RETRY_NAMES)
+
+
+def _estimate_tokens(messages: List[BaseMessage]) -> int:
+    prompt = sum(count_tokens(str(message.content)) for message in messages)
+    return prompt + DEFAULT_COMPLETION_TOKENS
+
+
+def _used_tokens(result: ChatResult) -> Optional[int]:
+    for generation in result.generations:
+        usage = getattr(generation.message, "usage_metadata", None)
+        if usage and usage.get("total_tokens"):
+            return int(usage["total_tokens"])
+    usage = (result.llm_output or {}).get("token_usage") or {}
+    total = usage.get("total_tokens")
+    return int(total) if total else None
+
+
+def _single_chunk(result: ChatResult) -> ChatGenerationChunk:
+    text = result.generations[0].text if result.generations else ""
+    return ChatGenerationChunk(message=AIMessageChunk(content=text))
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """
+    Chat model wrapper that schedules calls through a ``RateLimiter``.
+
+    Each call waits for request and token budget, then retries retryable
+    provider errors (429, 5xx, timeouts) with jittered exponential backoff
+    that honours ``Retry-After``. A stream is retried only before its first
+    chunk has been delivered.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    underlying: BaseChatModel
+    limiter: Any = Field(exclude=True)
+
+    @property
+    def _llm_type(self) -> str:
+        return f"rate-limited-{self.underlying._llm_type}"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"underlying": self.underlying._llm_type}
+
+    def _failed(self, exc: BaseException, attempt: int) -> float:
+        """Return the delay before the next attempt or re-raise ``exc``."""
+        if not is_retryable(exc) or attempt >= self.limiter.limits.max_retries:
+            self.limiter.record_failure()
+            raise exc
+        delay_hint = retry_after(exc)
+        if _status_code(exc) == 429 or delay_hint is not None:
+            self.limiter.block(delay_hint or 0.0)
+        self.limiter.record_retry()
+        return self.limiter.backoff(attempt, delay_hint)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs,
+    ) -> ChatResult:
+        estimate = _estimate_tokens(messages)
+        attempt = 0
+        while True:
+            wait = self.limiter.reserve(estimate)
+            if wait:
+                time.sleep(wait)
+            try:
+                result = self.underlying._generate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+            except Exception as exc:
+                time.sleep(self._failed(exc, attempt))
+                attempt += 1
+                continue
+            self.limiter.settle(estimate, _used_tokens(result))
+            return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs,
+    ) -> ChatResult:
+        estimate = _estimate_tokens(messages)
+        attempt = 0
+        while True:
+            wait = self.limiter.reserve(estimate)
+            if wait:
+                await asyncio.sleep(wait)
+            try:
+                result = await self.underlying._agenerate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+            except Exception as exc:
+                await asyncio.sleep(self._failed(exc, attempt))
+                attempt += 1
+                continue
+            self.limiter.settle(estimate, _used_tokens(result))
+            return result
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs,
+    ) -> Iterator[ChatGenerationChunk]:
+        if type(self.underlying)._stream is BaseChatModel._stream:
+            # Models without native streaming answer in a single chunk.
+            result = self._generate(messages, stop, run_manager, **kwargs)
+            yield _single_chunk(result)
+            return
+        estimate = _estimate_tokens(messages)
+        attempt = 0
+        while True:
+            wait = self.limiter.reserve(estimate)
+            if wait:
+                time.sleep(wait)
+            started = False
+            try:
+                for chunk in self.underlying._stream(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                ):
+                    started = True
+                    yield chunk
+                return
+            except Exception as exc:
+                if started:
+                    self.limiter.record_failure()
+                    raise
+                time.sleep(self._failed(exc, attempt))
+                attempt += 1
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        underlying = type(self.underlying)
+        if (
+            underlying._astream is BaseChatModel._astream
+            and underlying._stream is BaseChatModel._stream
+        ):
+            result = await self._agenerate(messages, stop, run_manager, **kwargs)
+            yield _single_chunk(result)
+            return
+        estimate = _estimate_tokens(messages)
+        attempt = 0
+        while True:
+            wait = self.limiter.reserve(estimate)
+            if wait:
+                await asyncio.sleep(wait)
+            started = False
+            try:
+                async for chunk in self.underlying._astream(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                ):
+                    started = True
+                    yield chunk
+                return
+            except Exception as exc:
+                if started:
+                    self.limiter.record_failure()
+                    raise
+                await asyncio.sleep(self._failed(exc, attempt))
+                attempt += 1
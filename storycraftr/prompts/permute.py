@@ -49,3 +49,9 @@ longer_date_formats = [
     "{date} was the formal timestamp for this prompt’s generation, created within the regular refinement loop.",
     "For the session on {date}, this prompt was generated, marking an iteration step in the process.",
 ]
+
+# Used instead of a dated phrase when prompts must be byte-identical across
+# days (deterministic prompts, response caching).
+undated_session_phrase = (
+    "Prompt generated during this refinement session, without any additional context."
+)
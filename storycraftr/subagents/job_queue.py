@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+JOB_QUEUE_NAME = "jobs.sqlite"
+# Prunes that delete at least this many jobs also compact the file.
+COMPACT_THRESHOLD = 1000
+_MAX_QUERY_TERMS = 16
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Statuses a job can no longer leave.
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled", "timed_out")
+
+_COLUMNS = (
+    "job_id",
+    "role",
+    "command_text",
+    "status",
+    "priority",
+    "timeout",
+    "created_at",
+    "started_at",
+    "finished_at",
+    "output",
+    "error",
+    "log_path",
+    "owner",
+)
+
+
+def _match_expression(query: str) -> str:
+    """Every word of ``query`` must appear (FTS5 implicit AND)."""
+    terms = list(dict.fromkeys(token.lower() for token in _TOKEN_RE.findall(query)))
+    return " ".join(f'"{term}"' for term in terms[:_MAX_QUERY_TERMS])
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:  # exists but belongs to someone else
+        return True
+    return True
+
+
+class JobQueue:
+    """
+    Durable sub-agent job queue and log store in
+    ``.storycraftr/subagents/jobs.sqlite``.
+
+    Rows are plain dicts keyed by column name. Pending jobs are served by
+    descending ``priority`` and then in submission order. ``claim`` moves a
+    job to ``running`` atomically and records the claiming process in
+    ``owner``, so two chat sessions on the same book never run the same
+    job; ``requeue_orphans`` returns jobs whose owner died (a closed or
+    crashed session) to ``pending``.
+
+    ``finish`` records a job's final state and indexes its command, output
+    and error in an FTS5 table for ``search``. ``latest`` reads the newest
+    finished jobs of a role from an index, and ``prune`` applies retention
+    by age and by count per role.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, timeout=30
+        )
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "job_id TEXT UNIQUE NOT NULL, role TEXT NOT NULL, "
+                "command_text TEXT NOT NULL, status TEXT NOT NULL, "
+                "priority INTEGER NOT NULL DEFAULT 0, timeout REAL, "
+                "created_at TEXT NOT NULL, started_at TEXT, finished_at TEXT, "
+                "output TEXT NOT NULL DEFAULT '', error TEXT, log_path TEXT, "
+                "owner INTEGER)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_pending "
+                "ON jobs(status, priority DESC, seq)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_role_finished "
+                "ON jobs(role, finished_at)"
+            )
+            # rowid mirrors jobs.seq so deletes are index lookups.
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS job_logs USING fts5("
+                "command_text, output, error, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def add(self, row: dict) -> None:
+        columns = [column for column in _COLUMNS if row.get(column) is not None]
+        placeholders = ",".join("?" * len(columns))
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO jobs ({','.join(columns)}) VALUES ({placeholders})",  # nosec B608
+                [row[column] for column in columns],
+            )
+
+    def update(self, job_id: str, **fields) -> None:
+        unknown = set(fields) - set(_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE job_id = ?",  # nosec B608
+                [*fields.values(), job_id],
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def find(self, prefix: str) -> List[dict]:
+        """Jobs whose id starts with ``prefix`` (the status table shows 8 chars)."""
+        pattern = prefix.replace("%", "").replace("_", "") + "%"
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE job_id LIKE ? ORDER BY seq", (pattern,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def pending(self) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE status = 'pending' "
+                "ORDER BY priority DESC, seq"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def recent(self, limit: int = 50) -> List[dict]:
+        """Unfinished jobs plus the ``limit`` most recently submitted others."""
+        placeholders = ",".join("?" * len(FINISHED_STATUSES))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM jobs WHERE status NOT IN ({placeholders}) "  # nosec B608
+                "UNION SELECT * FROM (SELECT * FROM jobs ORDER BY seq DESC LIMIT ?) "
+                "ORDER BY seq",
+                [*FINISHED_STATUSES, limit],
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def cancel_pending(self, job_id: str) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled' "
+                "WHERE job_id = ? AND status = 'pending'",
+                (job_id,),
+            )
+        return cursor.rowcount == 1
+
+    def claim(self, job_id: str, started_at: str) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, owner = ? "
+                "WHERE job_id = ? AND status = 'pending'",
+                (started_at, os.getpid(), job_id),
+            )
+        return cursor.rowcount == 1
+
+    def finish(self, job_id: str, **fields) -> None:
+        """Store a job's final fields and add it to the full-text index."""
+        if fields:
+            self.update(job_id, **fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_logs (rowid, command_text, output, error) "
+                "SELECT seq, command_text, output, COALESCE(error, '') FROM jobs "
+                "WHERE job_id = ?",
+                (job_id,),
+            )
+
+    def latest(self, role: str, limit: int = 5) -> List[dict]:
+        """Newest finished jobs of ``role``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE role = ? AND finished_at IS NOT NULL "
+                "ORDER BY finished_at DESC LIMIT ?",
+                (role, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def search(
+        self, query: str, role: Optional[str] = None, limit: int = 10
+    ) -> List[Tuple[dict, str]]:
+        """Finished jobs matching every word of ``query`` with a text snippet."""
+        expression = _match_expression(query)
+        if not expression:
+            return []
+        sql = (
+            "SELECT jobs.*, snippet(job_logs, -1, '[', ']', '…', 12) AS snippet "
+            "FROM job_logs JOIN jobs ON jobs.seq = job_logs.rowid "
+            "WHERE job_logs MATCH ?"
+        )
+        params: list = [expression]
+        if role:
+            sql += " AND jobs.role = ?"
+            params.append(role)
+        sql += " ORDER BY bm25(job_logs) LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        results = []
+        for row in rows:
+            data = dict(row)
+            snippet = data.pop("snippet") or ""
+            results.append((data, snippet))
+        return results
+
+    def prune(self, max_age_days: float = 0, max_per_role: int = 0) -> int:
+        """
+        Delete finished jobs older than ``max_age_days`` and beyond the
+        newest ``max_per_role`` of each role (``0`` disables a rule).
+        Returns how many jobs were removed; large prunes compact the file.
+        """
+        placeholders = ",".join("?" * len(FINISHED_STATUSES))
+        doomed: set = set()
+        with self._lock:
+            if max_age_days > 0:
+                cutoff = time.strftime(
+                    "%Y-%m-%dT%H:%M:%S",
+                    time.gmtime(time.time() - max_age_days * 86400),
+                )
+                rows = self._conn.execute(
+                    f"SELECT seq FROM jobs WHERE status IN ({placeholders}) "  # nosec B608
+                    "AND finished_at < ?",
+                    [*FINISHED_STATUSES, cutoff],
+                ).fetchall()
+                doomed.update(row[0] for row in rows)
+            if max_per_role > 0:
+                roles = [
+                    row[0]
+                    for row in self._conn.execute("SELECT DISTINCT role FROM jobs")
+                ]
+                for role in roles:
+                    rows = self._conn.execute(
+                        "SELECT seq FROM jobs WHERE role = ? "
+                        "AND finished_at IS NOT NULL "
+                        "ORDER BY finished_at DESC LIMIT -1 OFFSET ?",
+                        (role, max_per_role),
+                    ).fetchall()
+                    doomed.update(row[0] for row in rows)
+        if not doomed:
+            return 0
+        batches = sorted(doomed)
+        with self._lock, self._conn:
+            for start in range(0, len(batches), 500):
+                batch = batches[start : start + 500]
+                marks = ",".join("?" * len(batch))
+                self._conn.execute(
+                    f"DELETE FROM job_logs WHERE rowid IN ({marks})",  # nosec B608
+                    batch,
+                )
+                self._conn.execute(
+                    f"DELETE FROM jobs WHERE seq IN ({marks})", batch  # nosec B608
+                )
+        if len(doomed) >= COMPACT_THRESHOLD:
+            self.compact()
+        return len(doomed)
+
+    def compact(self) -> None:
+        """Merge the full-text index segments and reclaim free pages."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO job_logs (job_logs) VALUES ('optimize')"
+                )
+            self._conn.execute("VACUUM")
+
+    def import_legacy_logs(self, logs_root: Path) -> int:
+        """
+        One-time import of the ``<role>/<timestamp>-<id>.json`` job records
+        written before the log store existed. The files are left in place.
+        """
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT 1 FROM meta WHERE key = 'legacy_logs_imported'"
+            ).fetchone()
+        if done:
+            return 0
+        imported = 0
+        for path in sorted(Path(logs_root).glob("*/*.json")):
+            try:
+                record = json.loads(path.read_text(encoding="utf-8"))
+                job_id = record["job_id"]
+            except (OSError, ValueError, KeyError):
+                continue
+            row = {column: record.get(column) for column in _COLUMNS}
+            row["role"] = record.get("role") or path.parent.name
+            row["status"] = record.get("status") or "failed"
+            row["output"] = record.get("output") or ""
+            row["owner"] = None
+            if row["status"] not in FINISHED_STATUSES or not row["created_at"]:
+                continue
+            try:
+                self.add(row)
+            except sqlite3.IntegrityError:
+                continue  # already imported
+            self.finish(job_id)
+            imported += 1
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) "
+                "VALUES ('legacy_logs_imported', ?)",
+                (str(imported),),
+            )
+        return imported
+
+    def requeue_orphans(self) -> List[str]:
+        """Return running jobs of dead sessions to the queue; their ids."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, owner FROM jobs WHERE status = 'running'"
+            ).fetchall()
+        orphans = [row["job_id"] for row in rows if not _pid_alive(row["owner"])]
+        if orphans:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "UPDATE jobs SET status = 'pending', started_at = NULL, "
+                    "owner = NULL WHERE job_id = ? AND status = 'running'",
+                    [(job_id,) for job_id in orphans],
+                )
+        return orphans
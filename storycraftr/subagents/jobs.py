@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import json
 import logging
+import os
 import shlex
+import subprocess  # nosec B404 - runs our own worker module
+import sys
 import threading
 import uuid
-from concurrent.futures import ThreadPoolExecutor
 from contextlib import redirect_stderr, redirect_stdout
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -13,24 +14,33 @@ from importlib import import_module
 from io import StringIO
 from pathlib import Path
 from queue import Queue
-from typing import Callable, Dict, List, Optional
+from typing import IO, Callable, Dict, List, Optional, Tuple
 
 from rich.console import Console
 
 from storycraftr.chat.module_runner import ModuleCommandError, run_module_command
 from storycraftr.utils.core import load_book_config
 
+from .job_queue import FINISHED_STATUSES, JOB_QUEUE_NAME, JobQueue
 from .models import SubAgentRole
 from .storage import LOGS_DIRNAME, ensure_storage_dirs, load_roles, seed_default_roles
 
 
 logger = logging.getLogger(__name__)
 
+EXECUTOR_MODES = ("thread", "process")
+# Seconds a cancelled or timed-out worker gets to exit before it is killed.
+TERMINATE_GRACE = 5.0
+
 
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
 @dataclass
 class SubAgentJob:
     job_id: str
@@ -43,6 +53,10 @@ class SubAgentJob:
     output: str = ""
     error: Optional[str] = None
     log_path: Optional[Path] = None
+    priority: int = 0
+    timeout: Optional[float] = None
+    # "cancelled" or "timed_out" once the manager asked the job to stop.
+    stop_reason: Optional[str] = field(default=None, repr=False)
 
     def to_dict(self) -> dict:
         return {
@@ -51,6 +65,8 @@ class SubAgentJob:
             "role_name": self.role.name,
             "command_text": self.command_text,
             "status": self.status,
+            "priority": self.priority,
+            "timeout": self.timeout,
             "created_at": self.created_at.isoformat(),
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "finished_at": self.finished_at.isoformat() if self.finished_at else None,
@@ -59,10 +75,59 @@ class SubAgentJob:
             "log_path": str(self.log_path) if self.log_path else None,
         }
 
+    def to_row(self) -> dict:
+        row = self.to_dict()
+        row["role"] = self.role.slug
+        return row
+
+    @classmethod
+    def from_row(cls, row: dict, role: SubAgentRole) -> "SubAgentJob":
+        return cls(
+            job_id=row["job_id"],
+            role=role,
+            command_text=row["command_text"],
+            status=row["status"],
+            created_at=_parse_time(row["created_at"]) or _utcnow(),
+            started_at=_parse_time(row.get("started_at")),
+            finished_at=_parse_time(row.get("finished_at")),
+            output=row.get("output") or "",
+            error=row.get("error"),
+            log_path=Path(row["log_path"]) if row.get("log_path") else None,
+            priority=int(row.get("priority") or 0),
+            timeout=row.get("timeout"),
+        )
+
 
 class SubAgentJobManager:
     """
     Coordinates role discovery, job submission, and logging for sub-agents.
+
+    Jobs are kept in a durable queue (``.storycraftr/subagents/jobs.sqlite``)
+    and started by descending ``priority``, then in submission order, within
+    ``max_workers`` and each role's ``max_concurrency``. Jobs still pending
+    when the session ends, and jobs whose session died while running them,
+    are resumed by the next manager for the book (unless ``resume`` is
+    false). ``cancel`` drops a pending job or stops a running one, and a
+    job's ``timeout`` (or its role's) stops it when it runs too long.
+
+    With the ``thread`` executor (the default) jobs run in this process and
+    their output is captured by swapping the module consoles, so concurrent
+    jobs can interleave. A running thread job cannot be interrupted, so
+    ``cancel`` refuses it and jobs with a timeout always run in a worker
+    process. The ``process`` executor runs each job in its own worker process
+    (``storycraftr.subagents.worker``) with private stdout and stderr pipes
+    that are streamed back line by line: ``job.output`` grows while the job
+    runs and ``event_callback`` receives an ``output`` event per line;
+    cancelling or timing out terminates the worker. The mode, pool size and
+    default timeout come from the book's ``subagent_executor``,
+    ``subagent_max_workers`` and ``subagent_job_timeout`` settings.
+
+    Finished jobs double as the log store: ``role_logs`` reads the latest
+    runs of a role from an index and ``search_logs`` searches their
+    commands and output. Old runs are pruned when the manager starts
+    (``subagent_log_retention_days`` / ``subagent_log_max_per_role``).
+    Markdown copies are written with ``export_log``, or for every job when
+    ``subagent_log_markdown`` is set.
     """
 
     def __init__(
@@ -72,6 +137,9 @@ class SubAgentJobManager:
         *,
         event_queue: Optional[Queue] = None,
         event_callback: Optional[Callable[[str, dict], None]] = None,
+        executor: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        resume: bool = True,
     ):
         self.book_path = Path(book_path)
         self.console = console
@@ -79,22 +147,53 @@ class SubAgentJobManager:
         self.root = ensure_storage_dirs(book_path)
         self.logs_root = self.root / LOGS_DIRNAME
         self.lock = threading.Lock()
-        self.executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="subagent")
-        self.roles = self._ensure_roles()
-        self.jobs: Dict[str, SubAgentJob] = {}
+        config = load_book_config(str(self.book_path))
+        self.executor_mode = (
+            executor or getattr(config, "subagent_executor", None) or "thread"
+        ).lower()
+        if self.executor_mode not in EXECUTOR_MODES:
+            raise ValueError(
+                f"Unknown sub-agent executor '{self.executor_mode}'; "
+                f"use one of {', '.join(EXECUTOR_MODES)}."
+            )
+        workers = max_workers or int(getattr(config, "subagent_max_workers", 3) or 3)
+        self.max_workers = max(1, workers)
+        self.default_timeout = float(getattr(config, "subagent_job_timeout", 0) or 0)
+        self.write_markdown = bool(getattr(config, "subagent_log_markdown", False))
+        self.roles = self._ensure_roles(config)
         self.event_callback = event_callback
+        self.queue = JobQueue(self.root / JOB_QUEUE_NAME)
+        self.queue.requeue_orphans()
+        self.queue.import_legacy_logs(self.logs_root)
+        self.queue.prune(
+            max_age_days=float(getattr(config, "subagent_log_retention_days", 0) or 0),
+            max_per_role=int(getattr(config, "subagent_log_max_per_role", 0) or 0),
+        )
+        self.jobs: Dict[str, SubAgentJob] = {
+            row["job_id"]: SubAgentJob.from_row(row, self._role_for(row["role"]))
+            for row in self.queue.recent()
+        }
+        self._active: Dict[str, threading.Thread] = {}
+        self._processes: Dict[str, subprocess.Popen] = {}
+        self._closed = False
+        if resume:
+            self._dispatch()
 
     def shutdown(self) -> None:
-        self.executor.shutdown(wait=False, cancel_futures=True)
+        """
+        Stop starting jobs. Pending jobs stay queued for the next session;
+        running ones are left to finish.
+        """
+        with self.lock:
+            self._closed = True
 
     # Role management -----------------------------------------------------------------
 
-    def _ensure_roles(self) -> Dict[str, SubAgentRole]:
+    def _ensure_roles(self, config) -> Dict[str, SubAgentRole]:
         roles = load_roles(str(self.book_path))
         if roles:
             return roles
         language = "en"
-        config = load_book_config(str(self.book_path))
         if config and getattr(config, "primary_language", None):
             language = config.primary_language
         seed_default_roles(str(self.book_path), language=language, force=False)
@@ -121,7 +220,13 @@ class SubAgentJobManager:
         command_token: str,
         args: List[str],
         role_slug: Optional[str] = None,
+        priority: int = 0,
+        timeout: Optional[float] = None,
     ) -> SubAgentJob:
+        """
+        Queue a module command for a role. Higher ``priority`` jobs start
+        first; ``timeout`` (seconds) defaults to the role's, then the book's.
+        """
         if not command_token.startswith("!"):
             raise ValueError("Command token must start with '!'.")
 
@@ -134,13 +239,62 @@ class SubAgentJobManager:
 
         payload_tokens = [command_token[1:]] + args
         command_text = shlex.join(payload_tokens)
-        job = SubAgentJob(job_id=uuid.uuid4().hex, role=role, command_text=command_text)
+        if timeout is None:
+            timeout = role.timeout or self.default_timeout
+        job = SubAgentJob(
+            job_id=uuid.uuid4().hex,
+            role=role,
+            command_text=command_text,
+            priority=int(priority),
+            timeout=float(timeout) if timeout and timeout > 0 else None,
+        )
 
         with self.lock:
+            self.queue.add(job.to_row())
             self.jobs[job.job_id] = job
 
         self._emit_event("queued", job)
-        self.executor.submit(self._run_job, job)
+        self._dispatch()
+        return job
+
+    def cancel(self, job_ref: str) -> SubAgentJob:
+        """
+        Cancel a job by id or unique id prefix. Pending jobs are dropped from
+        the queue; running jobs are asked to stop (see the class docstring).
+        """
+        job = self._find_job(job_ref)
+        with self.lock:
+            if job.status == "pending":
+                if not self.queue.cancel_pending(job.job_id):
+                    raise ValueError(
+                        f"Job {job.job_id[:8]} was just started by another session."
+                    )
+                job.status = "cancelled"
+                job.finished_at = _utcnow()
+                job.error = "Cancelled before it started."
+                self.queue.finish(
+                    job.job_id,
+                    status=job.status,
+                    finished_at=job.finished_at.isoformat(),
+                    error=job.error,
+                )
+                finished = True
+            elif job.job_id in self._active:
+                if not self._runs_in_process(job):
+                    raise ValueError(
+                        f"Job {job.job_id[:8]} runs on a thread and cannot be "
+                        "interrupted; set subagent_executor to 'process' to "
+                        "cancel running jobs."
+                    )
+                finished = False
+            elif job.status == "running":
+                raise ValueError(f"Job {job.job_id[:8]} is running in another session.")
+            else:
+                raise ValueError(f"Job {job.job_id[:8]} already {job.status}.")
+        if finished:
+            self._emit_event("cancelled", job)
+        else:
+            self._stop(job, "cancelled")
         return job
 
     def list_jobs(self) -> List[SubAgentJob]:
@@ -151,7 +305,14 @@ class SubAgentJobManager:
 
     def job_stats(self) -> Dict[str, int]:
         with self.lock:
-            stats = {"pending": 0, "running": 0, "succeeded": 0, "failed": 0}
+            stats = {
+                "pending": 0,
+                "running": 0,
+                "succeeded": 0,
+                "failed": 0,
+                "cancelled": 0,
+                "timed_out": 0,
+            }
             for job in self.jobs.values():
                 if job.status in stats:
                     stats[job.status] += 1
@@ -170,80 +331,294 @@ class SubAgentJobManager:
                     return role
         return None
 
+    def _role_for(self, slug: str) -> SubAgentRole:
+        role = self.roles.get(slug)
+        if role is None:
+            # The role file was removed since the job was queued.
+            role = SubAgentRole(
+                slug=slug,
+                name=slug.title(),
+                description="",
+                command_whitelist=[],
+                system_prompt="",
+            )
+        return role
+
+    def _find_job(self, job_ref: str) -> SubAgentJob:
+        job_ref = job_ref.strip().lower()
+        if not job_ref:
+            raise ValueError("Give a job id (or its first characters).")
+        with self.lock:
+            matches = [job for key, job in self.jobs.items() if key.startswith(job_ref)]
+            if not matches:
+                for row in self.queue.find(job_ref):
+                    job = SubAgentJob.from_row(row, self._role_for(row["role"]))
+                    self.jobs.setdefault(job.job_id, job)
+                    matches.append(self.jobs[job.job_id])
+        if not matches:
+            raise ValueError(f"No sub-agent job matches '{job_ref}'.")
+        if len(matches) > 1:
+            raise ValueError(
+                f"'{job_ref}' matches {len(matches)} jobs; give more of the id."
+            )
+        return matches[0]
+
+    def _dispatch(self) -> None:
+        """Start queued jobs while workers and role limits allow."""
+        started: List[SubAgentJob] = []
+        with self.lock:
+            if self._closed:
+                return
+            per_role: Dict[str, int] = {}
+            for job_id in self._active:
+                slug = self.jobs[job_id].role.slug
+                per_role[slug] = per_role.get(slug, 0) + 1
+            for row in self.queue.pending():
+                if len(self._active) >= self.max_workers:
+                    break
+                role = self._role_for(row["role"])
+                if (
+                    role.max_concurrency
+                    and per_role.get(role.slug, 0) >= role.max_concurrency
+                ):
+                    continue
+                started_at = _utcnow()
+                if not self.queue.claim(row["job_id"], started_at.isoformat()):
+                    continue  # another session took it
+                job = self.jobs.get(row["job_id"]) or SubAgentJob.from_row(row, role)
+                self.jobs[job.job_id] = job
+                job.status = "running"
+                job.started_at = started_at
+                per_role[role.slug] = per_role.get(role.slug, 0) + 1
+                worker = threading.Thread(
+                    target=self._run_job,
+                    args=(job,),
+                    name=f"subagent-{job.job_id[:8]}",
+                )
+                self._active[job.job_id] = worker
+                started.append(job)
+        for job in started:
+            self._active[job.job_id].start()
+
+    def _stop(self, job: SubAgentJob, reason: str) -> None:
+        with self.lock:
+            if job.job_id not in self._active or job.stop_reason:
+                return
+            job.stop_reason = reason
+            process = self._processes.get(job.job_id)
+        self._emit_event("stopping", job)
+        if process is None:
+            return  # the worker is terminated as soon as it has started
+        process.terminate()
+        killer = threading.Timer(TERMINATE_GRACE, _kill_if_running, args=(process,))
+        killer.daemon = True
+        killer.start()
+
     def _run_job(self, job: SubAgentJob) -> None:
-        job.started_at = _utcnow()
-        job.status = "running"
         self._emit_event("running", job)
+        watchdog = None
+        if job.timeout:
+            watchdog = threading.Timer(job.timeout, self._stop, args=(job, "timed_out"))
+            watchdog.daemon = True
+            watchdog.start()
+        stdout_text, stderr_text = "", ""
+        try:
+            if self._runs_in_process(job):
+                stdout_text, stderr_text = self._run_in_process(job)
+            else:
+                stdout_text, stderr_text = self._run_in_thread(job)
+        except Exception as exc:  # pragma: no cover - safety net
+            job.status = "failed"
+            job.error = repr(exc)
+        finally:
+            if watchdog is not None:
+                watchdog.cancel()
+            job.finished_at = _utcnow()
+            # A job that completed before the stop reached it keeps its result.
+            stopped = job.status != "succeeded"
+            if stopped and job.stop_reason == "cancelled":
+                job.status, job.error = "cancelled", "Cancelled while running."
+            elif stopped and job.stop_reason == "timed_out":
+                job.status = "timed_out"
+                job.error = f"Timed out after {job.timeout:g}s."
+            if stderr_text:
+                stdout_text = f"{stdout_text}\n\n[stderr]\n{stderr_text}".strip()
+            job.output = stdout_text.strip()
+            if self.write_markdown:
+                self._persist_job(job)
+            with self.lock:
+                self.queue.finish(
+                    job.job_id,
+                    status=job.status,
+                    finished_at=job.finished_at.isoformat(),
+                    output=job.output,
+                    error=job.error,
+                    log_path=str(job.log_path) if job.log_path else None,
+                )
+                self._active.pop(job.job_id, None)
+                self._processes.pop(job.job_id, None)
+            self._emit_event(job.status, job)
+            self._dispatch()
+
+    def _runs_in_process(self, job: SubAgentJob) -> bool:
+        # Only a worker process can be stopped, so timed jobs always use one.
+        return self.executor_mode == "process" or job.timeout is not None
+
+    def _run_in_thread(self, job: SubAgentJob) -> Tuple[str, str]:
         buffer_out = StringIO()
         buffer_err = StringIO()
         job_console = Console(file=buffer_out, force_terminal=False, color_system=None)
 
         swaps = _swap_storycraftr_consoles(job_console)
         try:
-            try:
-                with redirect_stdout(buffer_out), redirect_stderr(buffer_err):
-                    run_module_command(
-                        job.command_text,
-                        console=job_console,
-                        book_path=str(self.book_path),
-                    )
-                job.status = "succeeded"
-            except ModuleCommandError as exc:
-                job.status = "failed"
-                job.error = str(exc)
-            except Exception as exc:  # pragma: no cover - safety net
-                job.status = "failed"
-                job.error = repr(exc)
-            finally:
-                job.finished_at = _utcnow()
-                stdout_text = buffer_out.getvalue()
-                stderr_text = buffer_err.getvalue()
-                if stderr_text:
-                    stdout_text = f"{stdout_text}\n\n[stderr]\n{stderr_text}".strip()
-                job.output = stdout_text.strip()
-                self._persist_job(job)
-                self._emit_event(job.status, job)
+            with redirect_stdout(buffer_out), redirect_stderr(buffer_err):
+                run_module_command(
+                    job.command_text,
+                    console=job_console,
+                    book_path=str(self.book_path),
+                )
+            job.status = "succeeded"
+        except ModuleCommandError as exc:
+            job.status = "failed"
+            job.error = str(exc)
+        except Exception as exc:  # pragma: no cover - safety net
+            job.status = "failed"
+            job.error = repr(exc)
         finally:
             _restore_storycraftr_consoles(swaps)
-
-    def _persist_job(self, job: SubAgentJob) -> None:
+        return buffer_out.getvalue(), buffer_err.getvalue()
+
+    def _worker_command(self, job: SubAgentJob) -> List[str]:
+        return [
+            sys.executable,
+            "-m",
+            "storycraftr.subagents.worker",
+            str(self.book_path),
+            job.command_text,
+        ]
+
+    def _run_in_process(self, job: SubAgentJob) -> Tuple[str, str]:
+        env = dict(os.environ, PYTHONUNBUFFERED="1", PYTHONIOENCODING="utf-8")
+        process = subprocess.Popen(  # nosec B603 - fixed argv, no shell
+            self._worker_command(job),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            env=env,
+        )
+        with self.lock:
+            self._processes[job.job_id] = process
+        if job.stop_reason:  # cancelled or timed out while starting
+            process.terminate()
+        stdout_lines: List[str] = []
+        stderr_lines: List[str] = []
+        stderr_reader = threading.Thread(
+            target=self._pump,
+            args=(job, process.stderr, "stderr", stderr_lines),
+            daemon=True,
+        )
+        stderr_reader.start()
+        self._pump(job, process.stdout, "stdout", stdout_lines)
+        stderr_reader.join()
+        returncode = process.wait()
+
+        stderr_text = "".join(stderr_lines)
+        if returncode == 0:
+            job.status = "succeeded"
+        else:
+            job.status = "failed"
+            last_line = stderr_text.strip().splitlines()[-1:] or [""]
+            job.error = last_line[0] or f"Worker exited with status {returncode}."
+        return "".join(stdout_lines), stderr_text
+
+    def _pump(
+        self, job: SubAgentJob, pipe: IO[str], stream: str, lines: List[str]
+    ) -> None:
+        for line in pipe:
+            lines.append(line)
+            if stream == "stdout":
+                job.output += line
+            self._emit_output(job, stream, line.rstrip("\n"))
+        pipe.close()
+
+    def _persist_job(self, job: SubAgentJob) -> Path:
         log_dir = self.logs_root / job.role.slug
         log_dir.mkdir(parents=True, exist_ok=True)
         timestamp = (job.finished_at or _utcnow()).strftime("%Y%m%d-%H%M%S")
-        log_base = f"{timestamp}-{job.job_id}"
-        md_path = log_dir / f"{log_base}.md"
-        metadata_path = log_dir / f"{log_base}.json"
-
-        if job.output or job.error:
-            md_body = [
-                f"# Sub-Agent Run · {job.role.name}",
-                f"- Role: {job.role.slug}",
-                f"- Command: {job.command_text}",
-                f"- Status: {job.status}",
-                f"- Started: {job.started_at or job.created_at}",
-                f"- Finished: {job.finished_at or ''}",
-                "",
-                "## Output",
-                job.output or "_No output recorded._",
-            ]
-            if job.error:
-                md_body.extend(["", "## Error", job.error])
-            md_path.write_text("\n".join(md_body), encoding="utf-8")
-            job.log_path = md_path
-
-        metadata_path.write_text(json.dumps(job.to_dict(), indent=2), encoding="utf-8")
+        md_path = log_dir / f"{timestamp}-{job.job_id}.md"
+        md_body = [
+            f"# Sub-Agent Run · {job.role.name}",
+            f"- Role: {job.role.slug}",
+            f"- Command: {job.command_text}",
+            f"- Status: {job.status}",
+            f"- Started: {job.started_at or job.created_at}",
+            f"- Finished: {job.finished_at or ''}",
+            "",
+            "## Output",
+            job.output or "_No output recorded._",
+        ]
+        if job.error:
+            md_body.extend(["", "## Error", job.error])
+        md_path.write_text("\n".join(md_body), encoding="utf-8")
+        job.log_path = md_path
+        return md_path
 
     # Logs ----------------------------------------------------------------------------
 
-    def role_logs(self, role_slug: str, limit: int = 5) -> List[Path]:
-        role_dir = self.logs_root / role_slug.lower()
-        if not role_dir.exists():
-            return []
-        files = sorted(role_dir.glob("*.md"), reverse=True)
-        return files[:limit]
+    def role_logs(self, role_slug: str, limit: int = 5) -> List[SubAgentJob]:
+        """Most recently finished jobs of a role, newest first."""
+        role = self._role_for(role_slug.lower())
+        return [
+            SubAgentJob.from_row(row, role)
+            for row in self.queue.latest(role.slug, limit)
+        ]
+
+    def search_logs(
+        self, query: str, role_slug: Optional[str] = None, limit: int = 10
+    ) -> List[Tuple[SubAgentJob, str]]:
+        """
+        Finished jobs whose command, output or error contain every word of
+        ``query``, best match first, each with a highlighted snippet.
+        """
+        role = role_slug.lower() if role_slug else None
+        return [
+            (SubAgentJob.from_row(row, self._role_for(row["role"])), snippet)
+            for row, snippet in self.queue.search(query, role=role, limit=limit)
+        ]
+
+    def export_log(self, job_ref: str) -> Path:
+        """Write a finished job's log to ``logs/<role>/`` as Markdown."""
+        job = self._find_job(job_ref)
+        if job.status not in FINISHED_STATUSES:
+            raise ValueError(f"Job {job.job_id[:8]} has not finished yet.")
+        path = self._persist_job(job)
+        with self.lock:
+            self.queue.update(job.job_id, log_path=str(path))
+        return path
 
     # Internal helpers -------------------------------------------------------
 
+    def _emit_output(self, job: SubAgentJob, stream: str, line: str) -> None:
+        # Lines go to the callback (VS Code feed) only; the chat queue gets
+        # the lifecycle events and the finished log.
+        if not self.event_callback:
+            return
+        try:
+            self.event_callback(
+                "output",
+                {
+                    "job_id": job.job_id,
+                    "role": job.role.slug,
+                    "stream": stream,
+                    "line": line,
+                },
+            )
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.debug("Sub-agent output callback failed: %s", exc)
+
     def _emit_event(self, event_type: str, job: SubAgentJob) -> None:
         payload = {
             "type": event_type,
@@ -258,6 +633,11 @@ class SubAgentJobManager:
                 logger.debug("Sub-agent event callback failed: %s", exc)
 
 
+def _kill_if_running(process: subprocess.Popen) -> None:
+    if process.poll() is None:
+        process.kill()
+
+
 _CONSOLE_MODULES = [
     "storycraftr.cmd.story.chapters",
     "storycraftr.cmd.story.iterate",
@@ -272,7 +652,6 @@ _CONSOLE_MODULES = [
     "storycraftr.cmd.paper.publish",
     "storycraftr.cmd.paper.abstract",
     "storycraftr.agent.agents",
-    "storycraftr.agent.retrieval",
     "storycraftr.agent.story.chapters",
     "storycraftr.agent.story.iterate",
     "storycraftr.agent.story.outline",
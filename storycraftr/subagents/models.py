@@ -14,6 +14,10 @@ class SubAgentRole:
     language: str = "en"
     persona: str = ""
     temperature: float = 0.2
+    # Jobs of this role running at once (0: only the manager's limit).
+    max_concurrency: int = 0
+    # Default per-job timeout in seconds (0: none).
+    timeout: float = 0.0
 
     @classmethod
     def from_dict(cls, slug: str, data: dict) -> "SubAgentRole":
@@ -26,6 +30,8 @@ class SubAgentRole:
             language=data.get("language", "en"),
             persona=data.get("persona", ""),
             temperature=float(data.get("temperature", 0.2)),
+            max_concurrency=int(data.get("max_concurrency", 0) or 0),
+            timeout=float(data.get("timeout", 0) or 0),
         )
 
     def to_dict(self) -> dict:
@@ -38,4 +44,6 @@ class SubAgentRole:
             "language": self.language,
             "persona": self.persona,
             "temperature": self.temperature,
+            "max_concurrency": self.max_concurrency,
+            "timeout": self.timeout,
         }
@@ -0,0 +1,39 @@
+"""
+Entry point of process-isolated sub-agent jobs.
+
+``python -m storycraftr.subagents.worker <book_path> <command_text>`` runs one
+module command with stdout and stderr connected to pipes owned by the job
+manager, which streams them back line by line.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import List, Optional
+
+from rich.console import Console
+
+from storycraftr.chat.module_runner import ModuleCommandError, run_module_command
+
+# Exit status for a command the runner rejected; the message is on stderr.
+EXIT_COMMAND_ERROR = 2
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 2:
+        print("Usage: worker <book_path> <command_text>", file=sys.stderr)
+        return EXIT_COMMAND_ERROR
+    book_path, command_text = args
+    sys.stdout.reconfigure(line_buffering=True)
+    console = Console(file=sys.stdout, force_terminal=False, color_system=None)
+    try:
+        run_module_command(command_text, console=console, book_path=book_path)
+    except ModuleCommandError as exc:
+        print(str(exc), file=sys.stderr)
+        return EXIT_COMMAND_ERROR
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - exercised through subprocesses
+    sys.exit(main())
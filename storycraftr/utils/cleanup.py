@@ -5,6 +5,9 @@ from pathlib import Path
 
 from rich.console import Console
 
+from storycraftr.daemon import connect_daemon
+from storycraftr.vectorstores.manifest import MANIFEST_PATH
+
 console = Console()
 
 
@@ -13,6 +16,12 @@ def cleanup_vector_stores(book_path: str) -> None:
     Remove the embedded Chroma vector store for the given project path.
     """
 
+    daemon = connect_daemon()
+    if daemon is not None:
+        # Release the warm assistant so the daemon does not keep the old store.
+        daemon.forget(book_path)
+
+    (Path(book_path) / MANIFEST_PATH).unlink(missing_ok=True)
     vector_dir = Path(book_path) / "vector_store"
     if vector_dir.exists():
         shutil.rmtree(vector_dir, ignore_errors=True)
@@ -1,58 +1,54 @@
 import os
 import secrets  # Para generar números aleatorios seguros
-import yaml
 import json
-from typing import NamedTuple
+from typing import TYPE_CHECKING, NamedTuple
 from rich.console import Console
 from rich.markdown import Markdown  # Importar soporte de Markdown de Rich
-from storycraftr.prompts.permute import longer_date_formats
+from storycraftr.prompts.permute import longer_date_formats, undated_session_phrase
 from storycraftr.state import debug_state  # Importar el estado de debug
+from storycraftr.utils.prompt_log import get_prompt_log
+from storycraftr.vectorstores.chunking import (
+    DEFAULT_CHUNK_OVERLAP,
+    DEFAULT_CHUNK_TOKENS,
+)
+from storycraftr.vectorstores.scope import DEFAULT_INDEX_EXCLUDE, DEFAULT_INDEX_INCLUDE
 from pathlib import Path
 from types import SimpleNamespace
-from storycraftr.llm.factory import LLMSettings
-from storycraftr.llm.embeddings import EmbeddingSettings
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from storycraftr.llm.embeddings import EmbeddingSettings
+    from storycraftr.llm.factory import LLMSettings
 
 console = Console()
 
 
-def generate_prompt_with_hash(original_prompt: str, date: str, book_path: str) -> str:
+def generate_prompt_with_hash(
+    original_prompt: str, date: str, book_path: str, deterministic: bool = False
+) -> str:
     """
     Generates a modified prompt by combining a random phrase from a list,
-    a date, and the original prompt. Logs the prompt details in a YAML file.
+    a date, and the original prompt. Logs the prompt details in the project's
+    append-only ``prompts.jsonl`` journal.
 
     Args:
         original_prompt (str): The original prompt to be modified.
         date (str): The current date to be used in the prompt.
-        book_path (str): Path to the book's directory where prompts.yaml will be saved.
+        book_path (str): Path to the book's directory where prompts.jsonl is written.
+        deterministic (bool): Use a fixed, undated phrase so identical requests stay
+            byte-identical on any day (cache friendly). The date is still logged.
 
     Returns:
         str: The modified prompt with the date and random phrase.
     """
-    # Selecciona una frase aleatoria segura de la lista
-    random_phrase = secrets.choice(longer_date_formats).format(date=date)
-    modified_prompt = f"{random_phrase}\n\n{original_prompt}"
-
-    # Define la ruta del archivo YAML
-    yaml_path = Path(book_path) / "prompts.yaml"
-
-    # Nueva entrada de log con fecha y prompt original
-    log_entry = {"date": str(date), "original_prompt": original_prompt}
-
-    # Verifica si el archivo YAML existe y carga los datos
-    if yaml_path.exists():
-        with yaml_path.open("r", encoding="utf-8") as file:
-            existing_data = (
-                yaml.safe_load(file) or []
-            )  # Carga una lista vacía si está vacío
+    if deterministic:
+        random_phrase = undated_session_phrase
     else:
-        existing_data = []
-
-    # Añade la nueva entrada al log
-    existing_data.append(log_entry)
+        # Selecciona una frase aleatoria segura de la lista
+        random_phrase = secrets.choice(longer_date_formats).format(date=date)
+    modified_prompt = f"{random_phrase}\n\n{original_prompt}"
 
-    # Guarda los datos actualizados en el archivo YAML
-    with yaml_path.open("w", encoding="utf-8") as file:
-        yaml.dump(existing_data, file, default_flow_style=False)
+    # Registra el prompt original en el diario JSONL (solo añade una línea)
+    get_prompt_log(book_path).append(date, original_prompt)
 
     # Imprime el prompt modificado en Markdown si el modo debug está activado
     if debug_state.is_debug():
@@ -83,9 +79,38 @@ class BookConfig(NamedTuple):
         llm_api_key_env (str): Optional environment variable override for API key lookup.
         temperature (float): Sampling temperature for completions.
         request_timeout (int): Timeout in seconds for LLM calls.
+        llm_max_concurrency (int): Maximum parallel LLM calls for multi-file commands.
+        llm_context_window (int): Model context window in tokens (0 infers it from llm_model).
+        llm_max_output_tokens (int): Tokens of the context window kept free for the answer.
+        llm_requests_per_minute (float): Request budget per provider (0 disables).
+        llm_tokens_per_minute (float): Prompt plus completion token budget per provider (0 disables).
+        llm_max_retries (int): Retries for rate-limited or transient provider errors.
+        llm_retry_base_delay (float): First backoff ceiling in seconds (doubles per retry).
+        llm_retry_max_delay (float): Upper bound for a single backoff in seconds.
+        llm_cache (str): Response cache mode (off, on, replay).
+        llm_cache_size (int): Maximum number of cached responses (LRU eviction).
+        deterministic_prompts (bool): Derive the prompt date phrase from the prompt itself.
+        prompt_log_max_bytes (int): Size at which prompts.jsonl is rotated (0 disables).
+        prompt_log_compress (bool): Gzip rotated prompt journals.
         embed_model (str): Hugging Face model name for embeddings.
         embed_device (str): Device directive passed to the embedding runtime.
         embed_cache_dir (str): Local cache directory for embeddings.
+        embed_vector_cache (bool): Persist computed vectors between index rebuilds.
+        embed_vector_cache_size (int): Maximum number of cached vectors (LRU eviction).
+        hybrid_retrieval (bool): Fuse BM25 keyword hits with dense retrieval.
+        index_include (list): Globs (relative to the book) of Markdown files to index.
+        index_exclude (list): Globs excluded from indexing; these win over includes.
+        chunk_tokens (int): Maximum tokens per indexed chunk.
+        chunk_overlap_tokens (int): Tokens of trailing paragraphs repeated in the next chunk.
+        vector_backend (str): Vector index backend, "chroma" or "flat" (memory-mapped NumPy).
+        vector_dtype (str): Storage precision of the flat backend, "float32" or "float16".
+        subagent_executor (str): Where sub-agent jobs run, "thread" or "process" (one
+            worker process per job with its own output pipes).
+        subagent_max_workers (int): Sub-agent jobs run at the same time.
+        subagent_job_timeout (float): Default sub-agent job timeout in seconds (0 disables).
+        subagent_log_retention_days (float): Days finished sub-agent jobs are kept (0 keeps all).
+        subagent_log_max_per_role (int): Finished jobs kept per role (0 keeps all).
+        subagent_log_markdown (bool): Also write each job log as a Markdown file.
     """
 
     book_path: str
@@ -105,9 +130,37 @@ class BookConfig(NamedTuple):
     llm_api_key_env: str
     temperature: float
     request_timeout: int
+    llm_max_concurrency: int
+    llm_context_window: int
+    llm_max_output_tokens: int
+    llm_requests_per_minute: float
+    llm_tokens_per_minute: float
+    llm_max_retries: int
+    llm_retry_base_delay: float
+    llm_retry_max_delay: float
+    llm_cache: str
+    llm_cache_size: int
+    deterministic_prompts: bool
+    prompt_log_max_bytes: int
+    prompt_log_compress: bool
     embed_model: str
     embed_device: str
     embed_cache_dir: str
+    embed_vector_cache: bool
+    embed_vector_cache_size: int
+    hybrid_retrieval: bool
+    index_include: list
+    index_exclude: list
+    chunk_tokens: int
+    chunk_overlap_tokens: int
+    vector_backend: str
+    vector_dtype: str
+    subagent_executor: str
+    subagent_max_workers: int
+    subagent_job_timeout: float
+    subagent_log_retention_days: float
+    subagent_log_max_per_role: int
+    subagent_log_markdown: bool
 
 
 def load_book_config(book_path: str):
@@ -157,9 +210,37 @@ def load_book_config(book_path: str):
             "llm_api_key_env": "",
             "temperature": 0.7,
             "request_timeout": 120,
+            "llm_max_concurrency": 4,
+            "llm_context_window": 0,
+            "llm_max_output_tokens": 2048,
+            "llm_requests_per_minute": 0,
+            "llm_tokens_per_minute": 0,
+            "llm_max_retries": 4,
+            "llm_retry_base_delay": 1.0,
+            "llm_retry_max_delay": 60.0,
+            "llm_cache": "off",
+            "llm_cache_size": 10000,
+            "deterministic_prompts": False,
+            "prompt_log_max_bytes": 8388608,
+            "prompt_log_compress": True,
             "embed_model": "BAAI/bge-large-en-v1.5",
             "embed_device": "auto",
             "embed_cache_dir": "",
+            "embed_vector_cache": True,
+            "embed_vector_cache_size": 200000,
+            "hybrid_retrieval": True,
+            "index_include": list(DEFAULT_INDEX_INCLUDE),
+            "index_exclude": list(DEFAULT_INDEX_EXCLUDE),
+            "chunk_tokens": DEFAULT_CHUNK_TOKENS,
+            "chunk_overlap_tokens": DEFAULT_CHUNK_OVERLAP,
+            "vector_backend": "chroma",
+            "vector_dtype": "float32",
+            "subagent_executor": "thread",
+            "subagent_max_workers": 3,
+            "subagent_job_timeout": 0,
+            "subagent_log_retention_days": 90,
+            "subagent_log_max_per_role": 200,
+            "subagent_log_markdown": False,
         }
 
         # Update default config with actual config data
@@ -173,10 +254,11 @@ def load_book_config(book_path: str):
         return None
 
 
-def llm_settings_from_config(config: BookConfig) -> LLMSettings:
+def llm_settings_from_config(config: BookConfig) -> "LLMSettings":
     """
     Map the persisted configuration to normalized LLM settings.
     """
+    from storycraftr.llm.factory import LLMSettings
 
     return LLMSettings(
         provider=getattr(config, "llm_provider", "openai"),
@@ -185,18 +267,27 @@ def llm_settings_from_config(config: BookConfig) -> LLMSettings:
         api_key_env=getattr(config, "llm_api_key_env", ""),
         temperature=getattr(config, "temperature", 0.7),
         request_timeout=getattr(config, "request_timeout", 120),
+        response_cache_mode=getattr(config, "llm_cache", "off") or "off",
+        response_cache_size=int(getattr(config, "llm_cache_size", 10000)),
+        requests_per_minute=float(getattr(config, "llm_requests_per_minute", 0) or 0),
+        tokens_per_minute=float(getattr(config, "llm_tokens_per_minute", 0) or 0),
+        max_retries=int(getattr(config, "llm_max_retries", 4)),
+        retry_base_delay=float(getattr(config, "llm_retry_base_delay", 1.0)),
+        retry_max_delay=float(getattr(config, "llm_retry_max_delay", 60.0)),
     )
 
 
-def embedding_settings_from_config(config: BookConfig) -> EmbeddingSettings:
+def embedding_settings_from_config(config: BookConfig) -> "EmbeddingSettings":
     """
     Map the persisted configuration to embedding settings.
     """
+    from storycraftr.llm.embeddings import EmbeddingSettings
 
     return EmbeddingSettings(
         model_name=getattr(config, "embed_model", "BAAI/bge-large-en-v1.5"),
         device=getattr(config, "embed_device", "auto"),
         cache_dir=getattr(config, "embed_cache_dir", "") or None,
+        vector_cache_size=int(getattr(config, "embed_vector_cache_size", 200000)),
     )
 
 
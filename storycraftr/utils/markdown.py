@@ -1,4 +1,6 @@
+import asyncio
 import os
+import queue
 import re
 import shutil
 from pathlib import Path
@@ -24,7 +26,8 @@ def save_to_markdown(
         book_path (str): The path to the book's directory.
         file_name (str): The name of the markdown file to save.
         header (str): The header to add at the beginning of the content.
-        content (str): The content to save in the file.
+        content (str | Iterable[str]): The content to save in the file. An iterable of
+            chunks (e.g. a streamed assistant answer) is written progressively.
         progress (Progress, optional): Rich Progress object for updating progress.
         task (optional): Task associated with progress for updates.
 
@@ -52,7 +55,13 @@ def save_to_markdown(
         console.print(f"[bold blue]Saving content to {file_path}...[/bold blue]")
 
     with file_path.open("w", encoding="utf-8") as f:
-        f.write(f"# {header}\n\n{content}")
+        if isinstance(content, str):
+            f.write(f"# {header}\n\n{content}")
+        else:
+            f.write(f"# {header}\n\n")
+            for chunk in content:
+                f.write(chunk)
+                f.flush()
 
     if progress and task:
         progress.update(task, description=f"Content saved successfully to {file_name}")
@@ -64,6 +73,46 @@ def save_to_markdown(
     return str(file_path)
 
 
+_END_OF_CONTENT = object()
+
+
+async def asave_to_markdown(
+    book_path, file_name, header, content, progress: Progress = None, task=None
+) -> str:
+    """
+    Async counterpart of ``save_to_markdown``; the file I/O runs in a worker
+    thread so the event loop keeps serving other requests.
+
+    ``content`` may also be an async iterable of chunks (such as an
+    ``AsyncMessageStream``), which is written progressively as it arrives.
+
+    Returns:
+        str: The path to the saved markdown file.
+    """
+    if not hasattr(content, "__aiter__"):
+        return await asyncio.to_thread(
+            save_to_markdown, book_path, file_name, header, content, progress, task
+        )
+
+    chunks: queue.Queue = queue.Queue()
+
+    def drain():
+        while (chunk := chunks.get()) is not _END_OF_CONTENT:
+            yield chunk
+
+    writer = asyncio.ensure_future(
+        asyncio.to_thread(
+            save_to_markdown, book_path, file_name, header, drain(), progress, task
+        )
+    )
+    try:
+        async for chunk in content:
+            chunks.put(chunk)
+    finally:
+        chunks.put(_END_OF_CONTENT)
+    return await writer
+
+
 def append_to_markdown(book_path, folder_name, file_name, content):
     """
     Append content to an existing markdown file.
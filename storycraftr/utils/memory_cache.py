@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """Counters of a ``BoundedCache`` for monitoring."""
+
+    entries: int = 0
+    bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    evicted_lru: int = 0
+    evicted_ttl: int = 0
+    evicted_bytes: int = 0
+
+    @property
+    def evictions(self) -> int:
+        return self.evicted_lru + self.evicted_ttl + self.evicted_bytes
+
+    def as_dict(self) -> Dict[str, int]:
+        data = asdict(self)
+        data["evictions"] = self.evictions
+        return data
+
+
+def estimate_size(value: Any) -> int:
+    """Shallow ``sys.getsizeof`` of ``value`` plus its string contents."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes)):
+        return size
+    if isinstance(value, dict):
+        return size + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item) for item in value)
+    return size
+
+
+class BoundedCache(MutableMapping, Generic[K, V]):
+    """
+    Thread-safe in-memory mapping with LRU, TTL and byte-budget eviction.
+
+    Reads refresh an entry's recency and expiry. ``max_entries`` and
+    ``max_bytes`` of ``0`` and a ``ttl`` of ``None`` disable that limit.
+    Entry sizes come from ``sizeof`` and are re-measured by ``touch`` after
+    the caller mutates a value in place. ``on_evict(key, value)`` runs for
+    every entry that is evicted or explicitly removed, outside the lock.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 0,
+        ttl: Optional[float] = None,
+        max_bytes: int = 0,
+        sizeof: Callable[[V], int] = estimate_size,
+        on_evict: Optional[Callable[[K, V], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max(0, int(max_entries))
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self.max_bytes = max(0, int(max_bytes))
+        self._sizeof = sizeof
+        self._on_evict = on_evict
+        self._clock = clock
+        self._lock = threading.RLock()
+        # key -> (value, size, last access)
+        self._entries: "OrderedDict[K, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._stats = CacheStats()
+
+    def configure(
+        self,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        """Change limits at runtime and evict whatever no longer fits."""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max(0, int(max_entries))
+            if ttl is not None:
+                self.ttl = ttl if ttl > 0 else None
+            if max_bytes is not None:
+                self.max_bytes = max(0, int(max_bytes))
+            evicted = self._evict_locked()
+        self._notify(evicted)
+
+    # -- mapping interface ----------------------------------------------------
+
+    def __getitem__(self, key: K) -> V:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry):
+                self._stats.misses += 1
+                evicted = self._evict_locked()
+                found = False
+            else:
+                value, size, _ = entry
+                self._entries[key] = (value, size, self._clock())
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                evicted = []
+                found = True
+        self._notify(evicted)
+        if not found:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._expired(entry)
+
+    def __setitem__(self, key: K, value: V) -> None:
+        size = self._measure(value)
+        replaced = []
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+                if previous[0] is not value:
+                    replaced.append((key, previous[0]))
+            self._entries[key] = (value, size, self._clock())
+            self._bytes += size
+            evicted = self._evict_locked(protect=key)
+        self._notify(replaced + evicted)
+
+    def __delitem__(self, key: K) -> None:
+        with self._lock:
+            value, size, _ = self._entries.pop(key)
+            self._bytes -= size
+        self._notify([(key, value)])
+
+    def __iter__(self) -> Iterator[K]:
+        with self._lock:
+            return iter(
+                [k for k, entry in self._entries.items() if not self._expired(entry)]
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(
+                1 for entry in self._entries.values() if not self._expired(entry)
+            )
+
+    def items(self):
+        with self._lock:
+            return [
+                (key, entry[0])
+                for key, entry in self._entries.items()
+                if not self._expired(entry)
+            ]
+
+    def peek(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Return ``key`` without refreshing it or counting a hit."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry):
+                return default
+            return entry[0]
+
+    def touch(self, key: K) -> None:
+        """Re-measure ``key`` after in-place growth and enforce the budget."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            value, size, _ = entry
+            new_size = self._measure(value)
+            self._entries[key] = (value, new_size, self._clock())
+            self._entries.move_to_end(key)
+            self._bytes += new_size - size
+            evicted = self._evict_locked(protect=key)
+        self._notify(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            removed = [(key, entry[0]) for key, entry in self._entries.items()]
+            self._entries.clear()
+            self._bytes = 0
+        self._notify(removed)
+
+    def expire(self) -> int:
+        """Evict expired entries now and return how many were dropped."""
+        with self._lock:
+            evicted = self._evict_locked()
+        self._notify(evicted)
+        return len(evicted)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            stats = CacheStats(**asdict(self._stats))
+            stats.entries = len(self._entries)
+            stats.bytes = self._bytes
+        return stats
+
+    # -- helpers --------------------------------------------------------------
+
+    def _measure(self, value: V) -> int:
+        try:
+            return max(0, int(self._sizeof(value)))
+        except Exception:
+            return 0
+
+    def _expired(self, entry: tuple) -> bool:
+        return self.ttl is not None and self._clock() - entry[2] > self.ttl
+
+    def _evict_locked(self, protect: Optional[K] = None) -> List[tuple]:
+        evicted: List[tuple] = []
+
+        def drop(key: K) -> None:
+            value, size, _ = self._entries.pop(key)
+            self._bytes -= size
+            evicted.append((key, value))
+
+        if self.ttl is not None:
+            for key in [
+                k for k, entry in self._entries.items() if self._expired(entry)
+            ]:
+                if key != protect:
+                    drop(key)
+                    self._stats.evicted_ttl += 1
+        # The entry just written is never evicted for size; a single value
+        # larger than the budget stays until something newer displaces it.
+        while self.max_entries and len(self._entries) > self.max_entries:
+            key = next(iter(self._entries))
+            if key == protect:
+                break
+            drop(key)
+            self._stats.evicted_lru += 1
+        while self.max_bytes and self._bytes > self.max_bytes:
+            key = next(iter(self._entries))
+            if key == protect:
+                break
+            drop(key)
+            self._stats.evicted_bytes += 1
+        return evicted
+
+    def _notify(self, evicted: List[tuple]) -> None:
+        if self._on_evict is None:
+            return
+        for key, value in evicted:
+            try:
+                self._on_evict(key, value)
+            except Exception as exc:  # pragma: no cover - cleanup is best effort
+                logger.debug("Eviction hook failed for %r: %s", key, exc)
+
+
+def env_number(name: str, default: float) -> float:
+    """Read a numeric limit from the environment, ignoring invalid values."""
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import yaml
+
+try:  # pragma: no cover - platform dependent
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PROMPT_LOG_NAME = "prompts.jsonl"
+LEGACY_PROMPT_LOG_NAME = "prompts.yaml"
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+_LOGS: Dict[str, "PromptLog"] = {}
+_LOGS_LOCK = threading.Lock()
+
+
+class PromptLog:
+    """
+    Append-only JSONL journal of the prompts sent to the model.
+
+    Each entry is a single ``write`` of one line, so logging costs O(1)
+    regardless of history size. When the active file grows past
+    ``max_bytes`` it is renamed to a timestamped archive and a fresh file
+    is started; when ``compress`` is set the archive is gzipped by a
+    background thread so the turn that triggered rotation does not wait.
+
+    Appends and rotation hold an exclusive ``flock`` on a sidecar lock
+    file, so the chat process, the daemon and sub-agent workers never
+    rotate the same journal twice or write into an archive being moved.
+    """
+
+    def __init__(
+        self,
+        book_path: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        compress: bool = True,
+    ):
+        self.book_path = Path(book_path)
+        self.path = self.book_path / PROMPT_LOG_NAME
+        self.max_bytes = max(0, int(max_bytes))
+        self.compress = compress
+        self._lock = threading.Lock()
+        self._compressor: Optional[threading.Thread] = None
+        self._compress_requested = False
+
+    def append(self, date: str, original_prompt: str) -> None:
+        entry = {
+            "date": str(date),
+            "original_prompt": original_prompt,
+            "logged_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock, self._file_lock():
+            rotated = self._rotate_if_needed()
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+        if rotated and self.compress:
+            self._start_compressor()
+
+    def archives(self) -> List[Path]:
+        """Return rotated journal files, oldest first."""
+        stem = self.path.stem
+        paths = {}
+        for path in self.book_path.glob(f"{stem}-*.jsonl*"):
+            if path.suffix not in (".jsonl", ".gz"):
+                continue  # partial output of an interrupted compression
+            key = path.name[: -len(".gz")] if path.suffix == ".gz" else path.name
+            # While an archive is being compressed both copies are complete;
+            # prefer the plain one so entries are never read twice.
+            if key not in paths or path.suffix == ".jsonl":
+                paths[key] = path
+        return [paths[key] for key in sorted(paths)]
+
+    def wait_for_compression(self, timeout: Optional[float] = None) -> None:
+        """Block until archives queued for compression have been gzipped."""
+        compressor = self._compressor
+        if compressor is not None:
+            compressor.join(timeout)
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        self.book_path.mkdir(parents=True, exist_ok=True)
+        lock_path = self.path.with_name(self.path.name + ".lock")
+        with lock_path.open("a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _rotate_if_needed(self) -> bool:
+        if not self.max_bytes:
+            return False
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return False
+        if size < self.max_bytes:
+            return False
+
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        archive = self.path.with_name(f"{self.path.stem}-{stamp}.jsonl")
+        try:
+            os.replace(self.path, archive)
+        except FileNotFoundError:
+            # Without flock (Windows) another process may have won the race.
+            return False
+        return True
+
+    def _start_compressor(self) -> None:
+        with self._lock:
+            self._compress_requested = True
+            if self._compressor is not None and self._compressor.is_alive():
+                return
+            self._compressor = threading.Thread(
+                target=self._compress_archives,
+                name="storycraftr-prompt-log-gzip",
+                daemon=True,
+            )
+            self._compressor.start()
+
+    def _compress_archives(self) -> None:
+        """Gzip every plain archive, including ones left by an earlier exit."""
+        while True:
+            with self._lock:
+                if not self._compress_requested:
+                    return
+                self._compress_requested = False
+            for archive in self.archives():
+                if archive.suffix != ".jsonl":
+                    continue
+                try:
+                    _gzip_archive(archive)
+                except OSError as exc:
+                    logger.warning("Could not compress %s: %s", archive, exc)
+
+
+def _gzip_archive(archive: Path) -> None:
+    target = archive.with_name(archive.name + ".gz")
+    partial = archive.with_name(
+        f"{archive.name}.gz.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        with archive.open("rb") as source, gzip.open(partial, "wb") as sink:
+            shutil.copyfileobj(source, sink)
+    except FileNotFoundError:
+        partial.unlink(missing_ok=True)
+        return  # compressed by another process in the meantime
+    os.replace(partial, target)
+    archive.unlink(missing_ok=True)
+
+
+def get_prompt_log(book_path: str | Path) -> PromptLog:
+    """Return the shared journal for ``book_path``."""
+    key = str(Path(book_path).resolve())
+    with _LOGS_LOCK:
+        log = _LOGS.get(key)
+        if log is None:
+            log = _LOGS[key] = PromptLog(key)
+        return log
+
+
+def configure_prompt_log(
+    book_path: str | Path, max_bytes: int = DEFAULT_MAX_BYTES, compress: bool = True
+) -> PromptLog:
+    """Apply project settings to the shared journal for ``book_path``."""
+    log = get_prompt_log(book_path)
+    with log._lock:
+        log.max_bytes = max(0, int(max_bytes))
+        log.compress = compress
+    return log
+
+
+def read_prompt_log(book_path: str | Path) -> Iterator[dict]:
+    """
+    Yield every logged prompt in chronological order.
+
+    Entries from a legacy ``prompts.yaml`` come first, followed by rotated
+    archives and the active journal. Malformed lines are skipped.
+    """
+    book_path = Path(book_path)
+    legacy_path = book_path / LEGACY_PROMPT_LOG_NAME
+    if legacy_path.exists():
+        with legacy_path.open("r", encoding="utf-8") as handle:
+            for entry in yaml.safe_load(handle) or []:
+                if isinstance(entry, dict):
+                    yield entry
+
+    log = PromptLog(book_path)
+    for path in [*log.archives(), log.path]:
+        if not path.exists():
+            continue
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
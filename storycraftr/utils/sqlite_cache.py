@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional
+
+# SQLite caps the number of bound parameters per statement (999 on older builds).
+_BATCH_SIZE = 500
+# Cache hits are remembered in memory and their recency written in batches.
+_TOUCH_BATCH = 256
+# Eviction frees 1/_EVICT_SLACK of ``max_entries`` so that the following puts
+# do not have to count and evict again.
+_EVICT_SLACK = 10
+
+
+class SQLiteLRUCache:
+    """
+    Small persistent key/value store with least-recently-used eviction.
+
+    Values are opaque bytes; callers own the encoding. A single connection is
+    shared between threads and guarded by a lock, while WAL mode lets several
+    StoryCraftr processes read the same file concurrently.
+
+    Hits do not write: their access times are buffered and flushed in
+    batches, before eviction and on close. The row count is tracked in
+    memory as an upper bound and only recounted once it passes the cap, so
+    eviction may lag slightly behind writes from other processes.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = 100_000):
+        self.path = Path(path)
+        self.max_entries = max(0, int(max_entries))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._count: Optional[int] = None
+        self._closed = False
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, timeout=30
+        )
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_last_access "
+                "ON entries(last_access)"
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        return int(row[0])
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """Fetch every cached key in bulk and refresh its recency."""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, bytes] = {}
+        if not keys:
+            return found
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(keys), _BATCH_SIZE):
+                batch = keys[start : start + _BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM entries WHERE key IN ({placeholders})",  # nosec B608
+                    batch,
+                ).fetchall()
+                found.update({key: value for key, value in rows})
+            self._touched.update(dict.fromkeys(found, now))
+            if len(self._touched) >= _TOUCH_BATCH:
+                with self._conn:
+                    self._flush_touches_locked()
+        return found
+
+    def get(self, key: str) -> bytes | None:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Mapping[str, bytes]) -> None:
+        if not items or self.max_entries == 0:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, last_access) "
+                "VALUES (?, ?, ?)",
+                [(key, sqlite3.Binary(value), now) for key, value in items.items()],
+            )
+            for key in items:
+                self._touched.pop(key, None)
+            if self._count is None:
+                self._count = self._count_locked()
+            else:
+                # Replacing an existing key over-counts; recounting below fixes it.
+                self._count += len(items)
+            if self._count > self.max_entries:
+                self._evict_locked()
+
+    def put(self, key: str, value: bytes) -> None:
+        self.put_many({key: value})
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+            self._touched.clear()
+            self._count = 0
+
+    def flush(self) -> None:
+        """Write buffered access times to disk."""
+        with self._lock, self._conn:
+            self._flush_touches_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            with self._conn:
+                self._flush_touches_locked()
+            self._conn.close()
+
+    def _count_locked(self) -> int:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        return int(count)
+
+    def _flush_touches_locked(self) -> None:
+        if not self._touched:
+            return
+        self._conn.executemany(
+            "UPDATE entries SET last_access = ? WHERE key = ?",
+            [(when, key) for key, when in self._touched.items()],
+        )
+        self._touched.clear()
+
+    def _evict_locked(self) -> None:
+        count = self._count_locked()
+        if count <= self.max_entries:
+            self._count = count
+            return
+        self._flush_touches_locked()
+        keep = self.max_entries - self.max_entries // _EVICT_SLACK
+        self._conn.execute(
+            "DELETE FROM entries WHERE key IN ("
+            "SELECT key FROM entries ORDER BY last_access ASC LIMIT ?)",
+            (count - keep,),
+        )
+        self._count = keep
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from langchain_core.callbacks.base import BaseCallbackHandler
+
+# Stages in the order a turn goes through them.
+STAGES = (
+    "prompt_log",
+    "embed",
+    "search",
+    "keyword",
+    "prompt",
+    "first_token",
+    "generation",
+)
+
+_CURRENT: ContextVar[Optional["TurnTimer"]] = ContextVar(
+    "storycraftr_turn_timer", default=None
+)
+
+
+class TurnTimer:
+    """
+    Wall-clock spans and token counts for one assistant turn.
+
+    Spans with the same name accumulate, and a span nested in another of
+    the same name (e.g. a cached embedding model wrapping the shared one)
+    is only counted once. ``as_dict`` returns seconds per stage, the
+    prompt and completion token counts reported by the model, and how many
+    retrieved documents and history messages were ``dropped`` to fit the
+    context window.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.spans: Dict[str, float] = {}
+        self.tokens: Dict[str, Any] = {}
+        self.dropped: Dict[str, int] = {}
+        self._open: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, exclude: Sequence[str] = ()) -> Iterator[None]:
+        """
+        Time a block as ``name``. Time recorded under the ``exclude`` spans
+        while the block runs (e.g. embedding inside a vector search) is not
+        counted twice.
+        """
+        with self._lock:
+            nested = self._open.get(name, 0) > 0
+            self._open[name] = self._open.get(name, 0) + 1
+            before = sum(self.spans.get(other, 0.0) for other in exclude)
+        started = self.clock()
+        try:
+            yield
+        finally:
+            elapsed = self.clock() - started
+            with self._lock:
+                self._open[name] -= 1
+                inner = sum(self.spans.get(other, 0.0) for other in exclude) - before
+            if not nested:
+                self.add(name, elapsed - inner)
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.spans[name] = self.spans.get(name, 0.0) + max(0.0, seconds)
+
+    def callback(self) -> "TimingCallbackHandler":
+        """LangChain callback recording time-to-first-token and usage."""
+        return TimingCallbackHandler(self)
+
+    def config(self) -> Dict[str, Any]:
+        """Runnable config that attaches ``callback`` to a graph run."""
+        return {"callbacks": [self.callback()]}
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {name: self.spans[name] for name in STAGES if name in self.spans}
+            stages.update(
+                (name, seconds)
+                for name, seconds in self.spans.items()
+                if name not in stages
+            )
+            return {
+                "stages": stages,
+                "tokens": dict(self.tokens),
+                "dropped": dict(self.dropped),
+            }
+
+
+def current_timer() -> Optional[TurnTimer]:
+    return _CURRENT.get()
+
+
+@contextmanager
+def activate(timer: Optional[TurnTimer]) -> Iterator[Optional[TurnTimer]]:
+    """Make ``timer`` the target of ``stage`` in this context."""
+    token = _CURRENT.set(timer)
+    try:
+        yield timer
+    finally:
+        _CURRENT.reset(token)
+
+
+@contextmanager
+def stage(name: str, exclude: Sequence[str] = ()) -> Iterator[None]:
+    """Time a block against the active ``TurnTimer``; a no-op without one."""
+    timer = _CURRENT.get()
+    if timer is None:
+        yield
+        return
+    with timer.span(name, exclude):
+        yield
+
+
+class TimingCallbackHandler(BaseCallbackHandler):
+    """
+    Splits a chat model call into time-to-first-token and generation and
+    records its token usage on a ``TurnTimer``.
+
+    Non-streaming calls have no first token; the whole call is counted as
+    generation. When the provider reports no usage, tokens are counted
+    locally and ``tokens["estimated"]`` is set.
+    """
+
+    # Record on the caller's thread, also for async runs.
+    run_inline = True
+
+    def __init__(self, timer: TurnTimer):
+        self.timer = timer
+        self._started: Optional[float] = None
+        self._first_token: Optional[float] = None
+        self._prompt_text: List[str] = []
+
+    def on_chat_model_start(self, serialized, messages, **kwargs) -> None:
+        if self._started is not None:
+            return
+        self._started = self.timer.clock()
+        self._prompt_text = [
+            str(message.content) for batch in messages for message in batch
+        ]
+
+    def on_llm_new_token(self, token: str, **kwargs) -> None:
+        if self._started is not None and self._first_token is None:
+            self._first_token = self.timer.clock()
+            self.timer.add("first_token", self._first_token - self._started)
+
+    def on_llm_end(self, response, **kwargs) -> None:
+        if self._started is None:
+            return
+        generation_started = self._first_token or self._started
+        self.timer.add("generation", self.timer.clock() - generation_started)
+        self.timer.tokens.update(self._usage(response))
+        self._started = None
+
+    def on_llm_error(self, error, **kwargs) -> None:
+        self._started = None
+
+    def _usage(self, response) -> Dict[str, Any]:
+        generations = [g for batch in response.generations or [] for g in batch]
+        for generation in generations:
+            usage = getattr(
+                getattr(generation, "message", None), "usage_metadata", None
+            )
+            if usage:
+                return {
+                    "prompt": int(usage.get("input_tokens", 0)),
+                    "completion": int(usage.get("output_tokens", 0)),
+                }
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if usage:
+            return {
+                "prompt": int(usage.get("prompt_tokens", 0)),
+                "completion": int(usage.get("completion_tokens", 0)),
+            }
+        from storycraftr.vectorstores.chunking import count_tokens
+
+        return {
+            "prompt": sum(count_tokens(text) for text in self._prompt_text),
+            "completion": sum(count_tokens(g.text or "") for g in generations),
+            "estimated": True,
+        }
@@ -1 +1,48 @@
-from .chroma import build_chroma_store  # noqa: F401
+from pathlib import Path
+
+from .chroma import build_chroma_store, close_chroma_store  # noqa: F401
+
+VECTOR_BACKENDS = ("chroma", "flat")
+
+
+def build_vector_store(
+    project_path: str,
+    embedding_function,
+    backend: str = "chroma",
+    persist_subdir: str = "vector_store",
+    dtype: str = "float32",
+):
+    """
+    Create (or load) the project's vector store with the selected backend.
+
+    ``chroma`` is the persistent Chroma collection; ``flat`` is the
+    memory-mapped NumPy index (``dtype`` selects float32 or float16 storage).
+    """
+
+    if backend == "flat":
+        from .flat import FlatVectorStore
+
+        return FlatVectorStore(
+            Path(project_path) / persist_subdir, embedding_function, dtype=dtype
+        )
+    if backend != "chroma":
+        raise ValueError(
+            f"Unknown vector_backend '{backend}'. "
+            f"Choose one of: {', '.join(VECTOR_BACKENDS)}."
+        )
+    return build_chroma_store(
+        project_path, embedding_function, persist_subdir=persist_subdir
+    )
+
+
+def close_vector_store(store) -> None:
+    """Release the clients and file handles held by a vector store."""
+
+    if store is None:
+        return
+    if getattr(store, "_client", None) is not None:
+        close_chroma_store(store)
+        return
+    close = getattr(store, "close", None)
+    if close is not None:
+        close()
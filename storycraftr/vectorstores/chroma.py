@@ -1,12 +1,11 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 import shutil
 
-from langchain_chroma import Chroma
-from chromadb import PersistentClient
-from chromadb.config import Settings
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from langchain_chroma import Chroma
 
 
 def build_chroma_store(
@@ -20,6 +19,10 @@ def build_chroma_store(
     Create (or load) a persistent Chroma collection rooted inside the project directory.
     """
 
+    from chromadb import PersistentClient
+    from chromadb.config import Settings
+    from langchain_chroma import Chroma
+
     store_path = Path(project_path) / persist_subdir
     store_path.mkdir(parents=True, exist_ok=True)
 
@@ -40,3 +43,22 @@ def build_chroma_store(
         raise RuntimeError(
             f"Failed to initialise Chroma vector store at {store_path}: {exc}"
         ) from exc
+
+
+def close_chroma_store(store) -> None:
+    """
+    Stop the Chroma system backing ``store``.
+
+    Chroma keeps one system (SQLite handles, segment caches) per persist
+    directory for the life of the process unless it is stopped explicitly.
+    """
+
+    from chromadb.api.shared_system_client import SharedSystemClient
+
+    client = getattr(store, "_client", None)
+    identifier = getattr(client, "_identifier", None)
+    if identifier is None:
+        return
+    system = SharedSystemClient._identifier_to_system.pop(identifier, None)
+    if system is not None:
+        system.stop()
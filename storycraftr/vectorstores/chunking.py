@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, List, Mapping, Optional, Tuple
+
+from .manifest import chunk_id, chunk_key
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from langchain_core.documents import Document
+
+DEFAULT_CHUNK_TOKENS = 256
+DEFAULT_CHUNK_OVERLAP = 32
+HEADING_SEPARATOR = " > "
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+# ``***``, ``* * *``, ``---``, ``___``, a lone ``#`` and the asterism are the
+# usual ways manuscripts mark a scene change.
+_SCENE_BREAK_RE = re.compile(r"^\s*(?:(?:[*_-]\s*){3,}|#|⁂)\s*$")
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+_SENTENCE_RE = re.compile(r"(?:(?<=[.!?…])|(?<=[.!?…][\"'”’»)]))\s+")
+_APPROX_TOKEN_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+TIKTOKEN_ENCODING = "cl100k_base"
+APPROX_COUNTER = "approx"
+_TIKTOKEN_URL = (
+    "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken"
+)
+
+
+def _tiktoken_cache_path() -> Optional[str]:
+    """Where tiktoken keeps the downloaded encoding (mirrors its own lookup)."""
+    cache_dir = os.environ.get(
+        "TIKTOKEN_CACHE_DIR",
+        os.environ.get(
+            "DATA_GYM_CACHE_DIR", os.path.join(tempfile.gettempdir(), "data-gym-cache")
+        ),
+    )
+    if not cache_dir:
+        return None
+    key = hashlib.sha1(_TIKTOKEN_URL.encode(), usedforsecurity=False).hexdigest()
+    return os.path.join(cache_dir, key)
+
+
+@lru_cache(maxsize=1)
+def _tiktoken_counter() -> Optional[Callable[[str], int]]:
+    # tiktoken fetches encodings over the network on first use; only load one
+    # that is already cached so indexing and prompting work offline.
+    cache_path = _tiktoken_cache_path()
+    if cache_path is None or not os.path.exists(cache_path):
+        return None
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding(TIKTOKEN_ENCODING)
+    except Exception:  # pragma: no cover - corrupt cache or broken install
+        return None
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def token_counter_name() -> str:
+    """Name of the tokenizer used by :func:`count_tokens` in this process."""
+    return TIKTOKEN_ENCODING if _tiktoken_counter() is not None else APPROX_COUNTER
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens with ``tiktoken`` when its encoding is cached locally,
+    otherwise approximate with one token per word or punctuation mark.
+    """
+    counter = _tiktoken_counter()
+    if counter is not None:
+        return counter(text)
+    return len(_APPROX_TOKEN_RE.findall(text))
+
+
+def describe_location(metadata: Mapping, default: str = "context") -> str:
+    """Format ``source > heading path (scene N)`` for a chunk's metadata."""
+    location = metadata.get("source") or default
+    heading_path = metadata.get("heading_path")
+    if heading_path:
+        location = f"{location}{HEADING_SEPARATOR}{heading_path}"
+    if metadata.get("scene"):
+        location = f"{location} (scene {metadata['scene'] + 1})"
+    return location
+
+
+@dataclass
+class Section:
+    """A run of paragraphs sharing one heading path and scene."""
+
+    headings: Tuple[str, ...]
+    scene: int
+    paragraphs: List[str] = field(default_factory=list)
+
+    @property
+    def heading_path(self) -> str:
+        return HEADING_SEPARATOR.join(self.headings)
+
+
+def split_sections(text: str) -> List[Section]:
+    """
+    Split Markdown into sections at ATX headings and scene breaks.
+
+    Paragraphs are separated by blank lines; fenced code blocks are kept
+    whole. The heading line itself is not part of the section body since it
+    is carried in the heading path.
+    """
+    sections: List[Section] = []
+    headings: List[Tuple[int, str]] = []
+    current = Section(headings=(), scene=0)
+    buffer: List[str] = []
+    in_fence = False
+
+    def flush_paragraph() -> None:
+        if buffer:
+            paragraph = "\n".join(buffer).strip()
+            if paragraph:
+                current.paragraphs.append(paragraph)
+            buffer.clear()
+
+    def start(scene: int) -> Section:
+        flush_paragraph()
+        if current.paragraphs:
+            sections.append(current)
+        return Section(headings=tuple(title for _, title in headings), scene=scene)
+
+    for line in text.splitlines():
+        if _FENCE_RE.match(line):
+            in_fence = not in_fence
+            buffer.append(line)
+            continue
+        if in_fence:
+            buffer.append(line)
+            continue
+
+        heading = _HEADING_RE.match(line)
+        if heading and heading.group(2):
+            level = len(heading.group(1))
+            while headings and headings[-1][0] >= level:
+                headings.pop()
+            headings.append((level, heading.group(2)))
+            current = start(scene=0)
+        elif _SCENE_BREAK_RE.match(line):
+            current = start(scene=current.scene + 1)
+        elif not line.strip():
+            flush_paragraph()
+        else:
+            buffer.append(line)
+
+    flush_paragraph()
+    if current.paragraphs:
+        sections.append(current)
+    return sections
+
+
+@dataclass
+class MarkdownChunker:
+    """
+    Chunk Markdown along its structure instead of at fixed character counts.
+
+    Sections (headings and scene breaks) are never merged. Inside a section,
+    whole paragraphs are packed up to ``max_tokens``; a paragraph that is
+    longer on its own is split at sentence boundaries. Up to
+    ``overlap_tokens`` of trailing paragraphs are repeated at the start of the
+    next chunk of the same section.
+    """
+
+    max_tokens: int = DEFAULT_CHUNK_TOKENS
+    overlap_tokens: int = DEFAULT_CHUNK_OVERLAP
+
+    @classmethod
+    def from_config(cls, config) -> "MarkdownChunker":
+        return cls(
+            max_tokens=int(getattr(config, "chunk_tokens", DEFAULT_CHUNK_TOKENS)),
+            overlap_tokens=int(
+                getattr(config, "chunk_overlap_tokens", DEFAULT_CHUNK_OVERLAP)
+            ),
+        )
+
+    @property
+    def signature(self) -> str:
+        """Identifies the chunking parameters; a change forces a rebuild."""
+        return (
+            f"markdown:{self.max_tokens}:{self.overlap_tokens}:{token_counter_name()}"
+        )
+
+    def split_text(self, text: str) -> List[Tuple[Section, str]]:
+        chunks: List[Tuple[Section, str]] = []
+        for section in split_sections(text):
+            for body in self._pack(section.paragraphs):
+                chunks.append((section, body))
+        return chunks
+
+    def split_documents(self, documents: List[Document]) -> List[Document]:
+        """
+        Chunk documents, attaching the heading path, scene number and a
+        deterministic ``chunk_id`` to every chunk's metadata.
+        """
+        from langchain_core.documents import Document
+
+        chunks: List[Document] = []
+        for document in documents:
+            source = document.metadata.get("source", "")
+            for index, (section, body) in enumerate(
+                self.split_text(document.page_content)
+            ):
+                heading_path = section.heading_path
+                metadata = dict(document.metadata)
+                metadata.update(
+                    {
+                        "heading_path": heading_path,
+                        "scene": section.scene,
+                        "chunk_index": index,
+                        "content_hash": chunk_key(body),
+                        "chunk_id": chunk_id(source, heading_path, body),
+                    }
+                )
+                chunks.append(Document(page_content=body, metadata=metadata))
+        return chunks
+
+    def _pack(self, paragraphs: List[str]) -> List[str]:
+        pieces: List[Tuple[str, int]] = []
+        for paragraph in paragraphs:
+            tokens = count_tokens(paragraph)
+            if tokens <= self.max_tokens:
+                pieces.append((paragraph, tokens))
+            else:
+                pieces.extend(self._split_long(paragraph))
+
+        chunks: List[str] = []
+        current: List[Tuple[str, int]] = []
+        size = 0
+        for piece, tokens in pieces:
+            if current and size + tokens > self.max_tokens:
+                chunks.append("\n\n".join(text for text, _ in current))
+                current, size = self._overlap(current, tokens)
+            current.append((piece, tokens))
+            size += tokens
+        if current:
+            chunks.append("\n\n".join(text for text, _ in current))
+        return chunks
+
+    def _overlap(
+        self, previous: List[Tuple[str, int]], incoming: int
+    ) -> Tuple[List[Tuple[str, int]], int]:
+        carried: List[Tuple[str, int]] = []
+        size = 0
+        for text, tokens in reversed(previous[1:]):
+            if size + tokens > self.overlap_tokens:
+                break
+            if size + tokens + incoming > self.max_tokens:
+                break
+            carried.insert(0, (text, tokens))
+            size += tokens
+        return carried, size
+
+    def _split_long(self, paragraph: str) -> List[Tuple[str, int]]:
+        pieces: List[Tuple[str, int]] = []
+        current: List[str] = []
+        size = 0
+        for sentence in _SENTENCE_RE.split(paragraph):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            tokens = count_tokens(sentence)
+            if current and size + tokens > self.max_tokens:
+                pieces.append((" ".join(current), size))
+                current, size = [], 0
+            current.append(sentence)
+            size += tokens
+        if current:
+            pieces.append((" ".join(current), size))
+        return pieces
@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from uuid import uuid4
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+INDEX_FILE = "flat-index.json"
+_VECTORS_PREFIX = "flat-vectors-"
+_FORMAT_VERSION = 1
+
+
+def _normalise(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class FlatVectorStore(VectorStore):
+    """
+    Exact cosine search over a memory-mapped NumPy matrix.
+
+    Embeddings are stored L2-normalised in ``flat-vectors-*.npy`` (float32 or
+    float16) with ids, texts and metadata in ``flat-index.json``. A query is a
+    single matrix-vector product followed by a partial sort, which for a book
+    of a few thousand chunks is faster than starting a Chroma client.
+
+    Every write produces a new vectors file and atomically replaces the JSON
+    sidecar that names it, so readers in other processes always see a
+    consistent pair and pick up changes on their next search. Inside
+    ``deferred_writes()`` batches are only kept in memory and written once
+    when the block ends, so a build costs one write instead of one per
+    batch.
+    """
+
+    def __init__(
+        self,
+        persist_directory: str | Path,
+        embedding: Embeddings,
+        dtype: str = "float32",
+    ):
+        self._persist_directory = str(persist_directory)
+        self._embedding = embedding
+        self._dtype = np.dtype(dtype)
+        if self._dtype not in (np.float16, np.float32):
+            raise ValueError("FlatVectorStore supports float16 or float32 vectors.")
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._metadatas: List[dict] = []
+        self._positions: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._vectors_file: Optional[str] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        # Rows appended since the matrix was last materialised.
+        self._pending: List[np.ndarray] = []
+        self._deferred = 0
+        self._dirty = False
+        Path(self._persist_directory).mkdir(parents=True, exist_ok=True)
+        self._reload()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    @property
+    def _index_path(self) -> Path:
+        return Path(self._persist_directory) / INDEX_FILE
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._ids)
+
+    def close(self) -> None:
+        """Drop the memory map; the next access loads the index again."""
+        with self._lock:
+            if self._dirty:
+                self._dirty = False
+                self._save(self._vectors())
+            self._pending = []
+            self._ids, self._texts, self._metadatas = [], [], []
+            self._positions = {}
+            self._matrix, self._vectors_file, self._stamp = None, None, None
+
+    # -- persistence ----------------------------------------------------------
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self._index_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self) -> None:
+        # Unwritten changes of a deferred build are newer than the files.
+        if not self._dirty and self._file_stamp() != self._stamp:
+            self._reload()
+
+    @contextmanager
+    def deferred_writes(self) -> Iterator["FlatVectorStore"]:
+        """
+        Keep additions and deletions in memory and write the matrix and the
+        sidecar once when the block ends. Searches in this process see the
+        pending changes; other processes see them after the write.
+        """
+        with self._lock:
+            self._deferred += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._deferred -= 1
+                if not self._deferred and self._dirty:
+                    self._dirty = False
+                    self._save(self._vectors())
+
+    def _write(self) -> None:
+        if self._deferred:
+            self._dirty = True
+        else:
+            self._save(self._vectors())
+
+    def _vectors(self) -> Optional[np.ndarray]:
+        """The full matrix, including rows appended since it was last built."""
+        if self._pending:
+            parts = [] if self._matrix is None else [self._matrix]
+            self._matrix = np.concatenate(parts + self._pending)
+            self._pending = []
+        return self._matrix
+
+    def _reload(self) -> None:
+        stamp = self._file_stamp()
+        self._ids, self._texts, self._metadatas = [], [], []
+        self._matrix, self._vectors_file = None, None
+        if stamp is not None:
+            data = json.loads(self._index_path.read_text(encoding="utf-8"))
+            self._ids = list(data["ids"])
+            self._texts = list(data["texts"])
+            self._metadatas = list(data["metadatas"])
+            self._vectors_file = data.get("vectors")
+            if self._ids and self._vectors_file:
+                self._matrix = np.load(
+                    Path(self._persist_directory) / self._vectors_file,
+                    mmap_mode="r",
+                )
+        self._positions = {identifier: i for i, identifier in enumerate(self._ids)}
+        self._stamp = stamp
+
+    def _save(self, matrix: Optional[np.ndarray]) -> None:
+        directory = Path(self._persist_directory)
+        vectors_file = None
+        if matrix is not None and len(matrix):
+            vectors_file = f"{_VECTORS_PREFIX}{uuid4().hex[:12]}.npy"
+            with (directory / vectors_file).open("wb") as handle:
+                np.save(handle, matrix.astype(self._dtype, copy=False))
+
+        payload = {
+            "version": _FORMAT_VERSION,
+            "dtype": self._dtype.name,
+            "vectors": vectors_file,
+            "ids": self._ids,
+            "texts": self._texts,
+            "metadatas": self._metadatas,
+        }
+        tmp_path = self._index_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload, default=str), encoding="utf-8")
+        os.replace(tmp_path, self._index_path)
+
+        # Keep the previous vectors file for readers that loaded the old
+        # sidecar but have not mapped its matrix yet.
+        previous = self._vectors_file
+        for path in directory.glob(f"{_VECTORS_PREFIX}*.npy"):
+            if path.name not in (vectors_file, previous):
+                path.unlink(missing_ok=True)
+
+        self._vectors_file = vectors_file
+        self._matrix = (
+            np.load(directory / vectors_file, mmap_mode="r") if vectors_file else None
+        )
+        self._positions = {identifier: i for i, identifier in enumerate(self._ids)}
+        self._stamp = self._file_stamp()
+
+    # -- VectorStore interface -----------------------------------------------
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        metadatas = list(metadatas) if metadatas else [{} for _ in texts]
+        ids = list(ids) if ids else [uuid4().hex for _ in texts]
+        vectors = _normalise(
+            np.asarray(self._embedding.embed_documents(texts), dtype=np.float32)
+        )
+
+        rows = vectors.astype(self._dtype)
+
+        with self._lock:
+            self._refresh()
+            if self._positions.keys().isdisjoint(ids):
+                # Plain append: the rows are joined to the matrix lazily.
+                self._pending.append(rows)
+            else:
+                # Re-adding an existing id replaces it (upsert semantics).
+                keep = self._keep_mask(set(ids))
+                matrix = self._vectors()
+                kept = [] if matrix is None else [matrix[keep]]
+                self._filter(keep)
+                self._matrix = np.concatenate(kept + [rows])
+                self._positions = {
+                    identifier: i for i, identifier in enumerate(self._ids)
+                }
+            start = len(self._ids)
+            self._ids.extend(ids)
+            self._texts.extend(texts)
+            self._metadatas.extend(dict(metadata) for metadata in metadatas)
+            self._positions.update(
+                (identifier, start + i) for i, identifier in enumerate(ids)
+            )
+            self._write()
+        return ids
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> bool:
+        if not ids:
+            return False
+        with self._lock:
+            self._refresh()
+            doomed = set(ids) & set(self._positions)
+            if not doomed:
+                return False
+            keep = self._keep_mask(doomed)
+            matrix = self._vectors()
+            self._matrix = None if matrix is None else np.asarray(matrix[keep])
+            self._filter(keep)
+            self._positions = {identifier: i for i, identifier in enumerate(self._ids)}
+            self._write()
+        return True
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        with self._lock:
+            self._refresh()
+            return [
+                self._document(self._positions[identifier])
+                for identifier in ids
+                if identifier in self._positions
+            ]
+
+    def similarity_search(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        vector = np.asarray(self._embedding.embed_query(query), dtype=np.float32)
+        return self.similarity_search_by_vector_with_score(vector, k, filter=filter)
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Document]:
+        return [
+            doc
+            for doc, _ in self.similarity_search_by_vector_with_score(
+                embedding, k, **kwargs
+            )
+        ]
+
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: Sequence[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        query = _normalise(np.asarray(embedding, dtype=np.float32).reshape(1, -1))[0]
+        with self._lock:
+            self._refresh()
+            matrix = self._vectors()
+            if matrix is None or k <= 0:
+                return []
+            scores = np.asarray(matrix @ query, dtype=np.float32)
+            if filter:
+                allowed = np.array(
+                    [
+                        all(meta.get(key) == value for key, value in filter.items())
+                        for meta in self._metadatas
+                    ],
+                    dtype=bool,
+                )
+                scores = np.where(allowed, scores, -np.inf)
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [
+                (self._document(int(i)), float(scores[i]))
+                for i in top
+                if np.isfinite(scores[i])
+            ]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        # Scores are cosine similarities in [-1, 1].
+        return lambda score: (score + 1.0) / 2.0
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        persist_directory: Optional[str] = None,
+        **kwargs: Any,
+    ) -> "FlatVectorStore":
+        if persist_directory is None:
+            raise ValueError("FlatVectorStore.from_texts requires persist_directory.")
+        store = cls(persist_directory, embedding, **kwargs)
+        store.add_texts(texts, metadatas, ids=ids)
+        return store
+
+    # -- helpers --------------------------------------------------------------
+
+    def _keep_mask(self, removed: set) -> np.ndarray:
+        return np.array(
+            [identifier not in removed for identifier in self._ids], dtype=bool
+        )
+
+    def _filter(self, keep: np.ndarray) -> None:
+        self._ids = [value for value, kept in zip(self._ids, keep) if kept]
+        self._texts = [value for value, kept in zip(self._texts, keep) if kept]
+        self._metadatas = [value for value, kept in zip(self._metadatas, keep) if kept]
+
+    def _document(self, position: int) -> Document:
+        return Document(
+            id=self._ids[position],
+            page_content=self._texts[position],
+            metadata=dict(self._metadatas[position]),
+        )
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+try:  # pragma: no cover - platform dependent
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+STORE_DIR = "vector_store"
+POINTER_FILE = "CURRENT"
+LEASE_FILE = ".lease"
+_PREFIX = "gen-"
+
+
+def _root(book_path: str) -> Path:
+    return Path(book_path) / STORE_DIR
+
+
+def _number(name: str) -> int:
+    try:
+        return int(name[len(_PREFIX) :])
+    except ValueError:
+        return 0
+
+
+def current_generation(book_path: str) -> Optional[str]:
+    """Return the name of the generation serving reads, if any."""
+    try:
+        name = (_root(book_path) / POINTER_FILE).read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if name and (_root(book_path) / name).is_dir():
+        return name
+    return None
+
+
+def list_generations(book_path: str) -> List[str]:
+    root = _root(book_path)
+    if not root.is_dir():
+        return []
+    names = [
+        entry.name
+        for entry in root.iterdir()
+        if entry.is_dir() and entry.name.startswith(_PREFIX)
+    ]
+    return sorted(names, key=_number)
+
+
+def create_generation(book_path: str) -> str:
+    """Create an empty generation directory with the next free number."""
+    root = _root(book_path)
+    root.mkdir(parents=True, exist_ok=True)
+    number = max((_number(name) for name in list_generations(book_path)), default=0)
+    while True:
+        number += 1
+        name = f"{_PREFIX}{number}"
+        try:
+            (root / name).mkdir()
+        except FileExistsError:
+            continue  # another process claimed this number first
+        return name
+
+
+def activate_generation(book_path: str, name: str) -> None:
+    """Atomically point readers at generation ``name``."""
+    pointer = _root(book_path) / POINTER_FILE
+    tmp_path = pointer.with_name(f"{POINTER_FILE}.{os.getpid()}.tmp")
+    tmp_path.write_text(name, encoding="utf-8")
+    os.replace(tmp_path, pointer)
+
+
+def _lock(handle, exclusive: bool, blocking: bool = True) -> bool:
+    if fcntl is None:
+        return True
+    flags = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+    if not blocking:
+        flags |= fcntl.LOCK_NB
+    try:
+        fcntl.flock(handle.fileno(), flags)
+    except OSError:
+        return False
+    return True
+
+
+def collect_generations(book_path: str) -> List[str]:
+    """
+    Delete generations that are neither current nor held by any reader.
+
+    Readers (in this or any other process) hold a shared lock on the
+    generation's lease file; a generation is removed only when an exclusive
+    lock can be taken. Files left by the pre-generation layout directly
+    under ``vector_store/`` are removed once a generation is current.
+    """
+    current = current_generation(book_path)
+    if current is None:
+        return []
+    root = _root(book_path)
+    removed: List[str] = []
+    for name in list_generations(book_path):
+        if name == current:
+            continue
+        path = root / name
+        lease_path = path / LEASE_FILE
+        try:
+            handle = lease_path.open("a")
+        except OSError:
+            continue
+        with handle:
+            if not _lock(handle, exclusive=True, blocking=False):
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+        removed.append(name)
+    for entry in root.iterdir():
+        if entry.name == POINTER_FILE or entry.name.startswith(_PREFIX):
+            continue
+        if entry.name.startswith(f"{POINTER_FILE}."):
+            continue  # pointer being replaced by another process
+        if entry.is_dir():
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            entry.unlink(missing_ok=True)
+    return removed
+
+
+class Generation:
+    """
+    A lease on one index generation.
+
+    The generation cannot be garbage-collected while the lease is open.
+    ``reading()`` marks in-flight retrievals; after ``retire()`` the lease is
+    dropped once the last of them finishes and unused generations are
+    collected. The ``cleanup`` given to ``retire`` (closing the generation's
+    store and keyword index) runs at that point, before the files go.
+    """
+
+    def __init__(self, book_path: str, name: str):
+        self.book_path = book_path
+        self.name = name
+        self.path = _root(book_path) / name
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._readers = 0
+        self._retired = False
+        self._cleanup: Optional[Callable[[], None]] = None
+        self._lease = (self.path / LEASE_FILE).open("a")
+        _lock(self._lease, exclusive=False)
+
+    @property
+    def subdir(self) -> str:
+        """Path of the generation relative to the project root."""
+        return f"{STORE_DIR}/{self.name}"
+
+    @contextmanager
+    def reading(self) -> Iterator["Generation"]:
+        with self._lock:
+            self._readers += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._readers -= 1
+                release = self._retired and self._readers == 0
+            if release:
+                self._release()
+
+    def retire(self, cleanup: Optional[Callable[[], None]] = None) -> None:
+        with self._lock:
+            self._retired = True
+            if cleanup is not None:
+                self._cleanup = cleanup
+            release = self._readers == 0
+        if release:
+            self._release()
+
+    def _release(self) -> None:
+        with self._lock:
+            cleanup, self._cleanup = self._cleanup, None
+            if self._lease.closed:
+                return
+        if cleanup is not None:
+            try:
+                cleanup()
+            except Exception as exc:  # pragma: no cover - best effort cleanup
+                logger.warning("Closing generation %s failed: %s", self.name, exc)
+        self._lease.close()
+        collect_generations(self.book_path)
+
+
+def open_generation(book_path: str) -> Generation:
+    """
+    Lease the current generation, creating (and activating) an empty first
+    generation for projects that have none yet.
+    """
+    while True:
+        name = current_generation(book_path)
+        if name is None:
+            name = create_generation(book_path)
+            activate_generation(book_path, name)
+        generation = Generation(book_path, name)
+        # A concurrent rebuild may have swapped generations before the lease
+        # was taken; retry against the new pointer.
+        if current_generation(book_path) == name:
+            break
+        generation.retire()
+    collect_generations(book_path)
+    return generation
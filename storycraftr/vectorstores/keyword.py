@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from langchain_core.documents import Document
+
+# Lives inside each index generation directory next to the Chroma files.
+KEYWORD_INDEX_NAME = "keyword-index.sqlite"
+
+# Constant from the original reciprocal-rank fusion paper; dampens the
+# influence of top ranks so that agreement between retrievers dominates.
+RRF_K = 60
+_MAX_QUERY_TERMS = 32
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _match_expression(query: str) -> str:
+    terms = list(dict.fromkeys(token.lower() for token in _TOKEN_RE.findall(query)))
+    terms = [term for term in terms if len(term) > 1][:_MAX_QUERY_TERMS]
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+class KeywordIndex:
+    """
+    SQLite FTS5 inverted index over the same chunks as the vector store.
+
+    Lookups are ranked with BM25 and never touch the embedding model, which
+    makes exact matches on proper nouns (characters, places, spells) cheap
+    and reliable. ``chunk_rows`` maps chunk IDs to FTS rowids so updates
+    delete by rowid instead of scanning the unindexed ``chunk_id`` column.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, timeout=30
+        )
+        with self._conn:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5("
+                "chunk_id UNINDEXED, metadata UNINDEXED, content, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+            mapped = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'chunk_rows'"
+            ).fetchone()
+            if mapped is None:
+                self._conn.execute(
+                    "CREATE TABLE chunk_rows ("
+                    "chunk_id TEXT PRIMARY KEY, row INTEGER NOT NULL) WITHOUT ROWID"
+                )
+                # Indexes written before the mapping existed: backfill once.
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO chunk_rows (chunk_id, row) "
+                    "SELECT chunk_id, rowid FROM chunks"
+                )
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM chunk_rows").fetchone()
+        return int(row[0])
+
+    def add_documents(self, documents: Sequence[Document], ids: Sequence[str]) -> None:
+        unique = {identifier: doc for doc, identifier in zip(documents, ids)}
+        if not unique:
+            return
+        with self._lock, self._conn:
+            self._delete_locked(list(unique))
+            last = self._conn.execute(
+                "SELECT rowid FROM chunks ORDER BY rowid DESC LIMIT 1"
+            ).fetchone()
+            first = (last[0] if last else 0) + 1
+            rows = [
+                (
+                    first + offset,
+                    identifier,
+                    json.dumps(doc.metadata, default=str),
+                    doc.page_content,
+                )
+                for offset, (identifier, doc) in enumerate(unique.items())
+            ]
+            self._conn.executemany(
+                "INSERT INTO chunks (rowid, chunk_id, metadata, content) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.executemany(
+                "INSERT INTO chunk_rows (chunk_id, row) VALUES (?, ?)",
+                [(row[1], row[0]) for row in rows],
+            )
+
+    def delete(self, ids: Iterable[str]) -> None:
+        with self._lock, self._conn:
+            self._delete_locked(list(ids))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM chunks")
+            self._conn.execute("DELETE FROM chunk_rows")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def search(self, query: str, k: int = 6) -> List[Document]:
+        from langchain_core.documents import Document
+
+        expression = _match_expression(query)
+        if not expression:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT metadata, content FROM chunks WHERE chunks MATCH ? "
+                "ORDER BY bm25(chunks) LIMIT ?",
+                (expression, k),
+            ).fetchall()
+        return [
+            Document(page_content=content, metadata=json.loads(metadata))
+            for metadata, content in rows
+        ]
+
+    def _delete_locked(self, ids: List[str]) -> None:
+        for start in range(0, len(ids), 500):
+            batch = ids[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rowids = [
+                row[0]
+                for row in self._conn.execute(
+                    f"SELECT row FROM chunk_rows WHERE chunk_id IN ({placeholders})",  # nosec B608
+                    batch,
+                )
+            ]
+            if not rowids:
+                continue
+            self._conn.executemany(
+                "DELETE FROM chunks WHERE rowid = ?", [(rowid,) for rowid in rowids]
+            )
+            self._conn.execute(
+                f"DELETE FROM chunk_rows WHERE chunk_id IN ({placeholders})",  # nosec B608
+                batch,
+            )
+
+
+def _document_key(document: Document) -> str:
+    chunk = document.metadata.get("chunk_id")
+    if chunk:
+        return chunk
+    return f"{document.metadata.get('source', '')}\0{document.page_content}"
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[Sequence[Document]], limit: int, k: int = RRF_K
+) -> List[Document]:
+    """
+    Merge ranked result lists, scoring each chunk by ``sum(1 / (k + rank))``.
+    """
+    scores: Dict[str, float] = {}
+    documents: Dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, document in enumerate(ranking, start=1):
+            key = _document_key(document)
+            documents.setdefault(key, document)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    ordered = sorted(scores, key=lambda key: scores[key], reverse=True)
+    return [documents[key] for key in ordered[:limit]]
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Mapping, Tuple
+
+MANIFEST_VERSION = 3
+MANIFEST_PATH = Path(".storycraftr") / "index-manifest.json"
+
+
+def content_hash(text: str) -> str:
+    """Return the SHA-256 digest used to detect changed source files."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_key(text: str) -> str:
+    """
+    Hash the content of a chunk for deduplication.
+
+    Whitespace is normalised so re-wrapped but otherwise identical chunks
+    share a key and are stored only once.
+    """
+    raw = " ".join(text.split()).encode("utf-8")
+    return hashlib.sha1(raw, usedforsecurity=False).hexdigest()
+
+
+def chunk_id(source: str, heading_path: str, text: str) -> str:
+    """
+    Build the deterministic ID of a chunk from where it lives and what it says.
+
+    An edit to one section only changes the IDs of that section's chunks, so
+    the rest of the file is left untouched in the stores.
+    """
+    raw = f"{source}\0{heading_path}\0{chunk_key(text)}".encode("utf-8")
+    return hashlib.sha1(raw, usedforsecurity=False).hexdigest()
+
+
+@dataclass
+class FileEntry:
+    hash: str
+    chunk_ids: List[str] = field(default_factory=list)
+    chunk_keys: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "hash": self.hash,
+            "chunk_ids": list(self.chunk_ids),
+            "chunk_keys": list(self.chunk_keys),
+        }
+
+
+@dataclass
+class ManifestDiff:
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+
+@dataclass
+class IndexManifest:
+    """
+    Records the content hash and chunk IDs of every indexed file so the vector
+    store can be updated incrementally instead of being rebuilt from scratch.
+
+    Chunks with identical content (``chunk_keys``) are stored once; ``owners``
+    maps each content key to the chunk ID that holds it in the stores.
+    """
+
+    path: Path
+    embed_model: str = ""
+    chunker: str = ""
+    generation: str = ""
+    vector_backend: str = "chroma"
+    files: Dict[str, FileEntry] = field(default_factory=dict)
+    owners: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, book_path: str) -> "IndexManifest":
+        path = Path(book_path) / MANIFEST_PATH
+        manifest = cls(path=path)
+        if not path.exists():
+            return manifest
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return manifest
+        if data.get("version") != MANIFEST_VERSION:
+            return manifest
+        manifest.embed_model = data.get("embed_model", "")
+        manifest.chunker = data.get("chunker", "")
+        manifest.generation = data.get("generation", "")
+        manifest.vector_backend = data.get("vector_backend", "chroma")
+        manifest.files = {
+            source: FileEntry(
+                hash=entry.get("hash", ""),
+                chunk_ids=list(entry.get("chunk_ids", [])),
+                chunk_keys=list(entry.get("chunk_keys", [])),
+            )
+            for source, entry in (data.get("files") or {}).items()
+        }
+        manifest.owners = dict(data.get("owners") or {})
+        return manifest
+
+    @property
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": MANIFEST_VERSION,
+            "embed_model": self.embed_model,
+            "chunker": self.chunker,
+            "generation": self.generation,
+            "vector_backend": self.vector_backend,
+            "files": {
+                source: entry.to_dict() for source, entry in sorted(self.files.items())
+            },
+            "owners": dict(sorted(self.owners.items())),
+        }
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        self.files = {}
+        self.owners = {}
+
+    @property
+    def stored_ids(self) -> List[str]:
+        """IDs of the chunks actually held by the stores."""
+        return sorted(set(self.owners.values()))
+
+    def assign_owners(self) -> Tuple[List[str], List[str]]:
+        """
+        Pick the chunk that stores each distinct content after ``files``
+        changed, keeping existing owners where they are still referenced.
+
+        Returns ``(stale_ids, new_ids)``: chunks to delete from and to add to
+        the stores.
+        """
+        candidates: Dict[str, List[str]] = {}
+        for _, entry in sorted(self.files.items()):
+            for identifier, key in zip(entry.chunk_ids, entry.chunk_keys):
+                candidates.setdefault(key, []).append(identifier)
+
+        owners: Dict[str, str] = {}
+        for key, identifiers in candidates.items():
+            current = self.owners.get(key)
+            owners[key] = current if current in identifiers else identifiers[0]
+
+        before = set(self.owners.values())
+        after = set(owners.values())
+        self.owners = owners
+        return sorted(before - after), sorted(after - before)
+
+    def diff(self, current: Mapping[str, str]) -> ManifestDiff:
+        """
+        Compare the recorded hashes against ``current`` (source -> hash).
+        """
+        result = ManifestDiff()
+        for source, digest in sorted(current.items()):
+            entry = self.files.get(source)
+            if entry is None:
+                result.added.append(source)
+            elif entry.hash != digest:
+                result.changed.append(source)
+            else:
+                result.unchanged.append(source)
+        result.removed = sorted(set(self.files) - set(current))
+        return result
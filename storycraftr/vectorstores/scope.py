@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+DEFAULT_INDEX_INCLUDE = ("**/*.md",)
+# Generated or duplicated content that would otherwise be embedded twice:
+# consolidated books/papers, stores, internal state, the tutorial docs that
+# ``init`` copies into ``storycraftr/`` and repository notes.
+DEFAULT_INDEX_EXCLUDE = (
+    "book/**",
+    "output/**",
+    "vector_store/**",
+    ".storycraftr/**",
+    "storycraftr/**",
+    ".git/**",
+    "**/README.md",
+)
+MIN_LINES = 4
+
+
+def _glob_to_regex(pattern: str) -> re.Pattern:
+    """Translate a ``/``-separated glob with ``**`` support into a regex."""
+    parts: List[str] = []
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith("**/", index):
+            parts.append("(?:.*/)?")
+            index += 3
+        elif pattern.startswith("**", index):
+            parts.append(".*")
+            index += 2
+        elif pattern[index] == "*":
+            parts.append("[^/]*")
+            index += 1
+        elif pattern[index] == "?":
+            parts.append("[^/]")
+            index += 1
+        else:
+            parts.append(re.escape(pattern[index]))
+            index += 1
+    return re.compile("".join(parts) + r"\Z")
+
+
+@dataclass
+class IndexScope:
+    """
+    Include/exclude globs (relative to the book root) that decide which
+    Markdown files are indexed. Exclusions win over inclusions.
+    """
+
+    include: Sequence[str] = DEFAULT_INDEX_INCLUDE
+    exclude: Sequence[str] = DEFAULT_INDEX_EXCLUDE
+
+    def __post_init__(self):
+        self._include = [(p, _glob_to_regex(p)) for p in self.include]
+        self._exclude = [(p, _glob_to_regex(p)) for p in self.exclude]
+        self._pruned = [
+            (p, _glob_to_regex(p[:-3])) for p in self.exclude if p.endswith("/**")
+        ]
+
+    @classmethod
+    def from_config(cls, config) -> "IndexScope":
+        include = getattr(config, "index_include", None) or DEFAULT_INDEX_INCLUDE
+        exclude = getattr(config, "index_exclude", None)
+        if exclude is None:
+            exclude = DEFAULT_INDEX_EXCLUDE
+        return cls(include=tuple(include), exclude=tuple(exclude))
+
+    def exclusion_reason(self, relative: str) -> Optional[str]:
+        for pattern, regex in self._exclude:
+            if regex.match(relative):
+                return f"excluded by '{pattern}'"
+        if not any(regex.match(relative) for _, regex in self._include):
+            return "not matched by index_include"
+        return None
+
+    def pruned_by(self, relative_dir: str) -> Optional[str]:
+        for pattern, regex in self._pruned:
+            if regex.match(relative_dir):
+                return pattern
+        return None
+
+
+@dataclass
+class ScanResult:
+    included: List[str] = field(default_factory=list)
+    excluded: Dict[str, str] = field(default_factory=dict)
+
+
+def scan_markdown_files(book_path: str, scope: IndexScope) -> ScanResult:
+    """
+    Walk the book and classify every Markdown file.
+
+    Directories matched by ``dir/**`` exclusions are not descended into; they
+    are reported once with a trailing slash.
+    """
+    result = ScanResult()
+    root = Path(book_path)
+    for current, dirnames, filenames in os.walk(root):
+        relative_dir = Path(current).relative_to(root).as_posix()
+        prefix = "" if relative_dir == "." else f"{relative_dir}/"
+        kept = []
+        for dirname in sorted(dirnames):
+            pattern = scope.pruned_by(f"{prefix}{dirname}")
+            if pattern:
+                result.excluded[f"{prefix}{dirname}/"] = f"excluded by '{pattern}'"
+            else:
+                kept.append(dirname)
+        dirnames[:] = kept
+        for filename in sorted(filenames):
+            if not filename.endswith(".md"):
+                continue
+            relative = f"{prefix}{filename}"
+            reason = scope.exclusion_reason(relative)
+            if reason:
+                result.excluded[relative] = reason
+            else:
+                result.included.append(relative)
+    return result
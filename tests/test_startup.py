@@ -0,0 +1,91 @@
+import json
+import subprocess  # nosec B404
+import sys
+
+# Packages that must stay out of the process until a command actually needs them.
+HEAVY_PACKAGES = {
+    "chromadb",
+    "langchain",
+    "langchain_chroma",
+    "langchain_community",
+    "langchain_core",
+    "langchain_huggingface",
+    "langchain_openai",
+    "langchain_text_splitters",
+    "markdown_pdf",
+    "sentence_transformers",
+    "torch",
+}
+
+_PROBE = """
+import json, sys
+from click.testing import CliRunner
+sys.argv = ["storycraftr"]
+from storycraftr.cli import cli
+result = CliRunner().invoke(cli, {args})
+print(json.dumps({{
+    "exit_code": result.exit_code,
+    "output": result.output,
+    "modules": sorted({{name.split(".")[0] for name in sys.modules}}),
+}}))
+"""
+
+
+def _probe(args):
+    completed = subprocess.run(  # nosec B603
+        [sys.executable, "-c", _PROBE.format(args=json.dumps(args))],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def test_help_does_not_import_llm_stack():
+    report = _probe(["--help"])
+    assert report["exit_code"] == 0
+    for name in ("chapters", "chat", "iterate", "outline", "sub-agents"):
+        assert name in report["output"]
+    assert HEAVY_PACKAGES.isdisjoint(report["modules"])
+
+
+def test_sub_agents_seed_does_not_import_llm_stack(tmp_path):
+    (tmp_path / "storycraftr.json").write_text("{}", encoding="utf-8")
+    report = _probe(["sub-agents", "seed", "--book-path", str(tmp_path)])
+    assert report["exit_code"] == 0
+    assert (tmp_path / ".storycraftr" / "subagents" / "editor.yaml").exists()
+    assert HEAVY_PACKAGES.isdisjoint(report["modules"])
+
+
+def test_init_creates_the_project(tmp_path, monkeypatch):
+    monkeypatch.setenv("STORYCRAFTR_NO_DAEMON", "1")
+    behavior = tmp_path / "behavior.txt"
+    behavior.write_text("Keep answers short.", encoding="utf-8")
+    book = tmp_path / "book"
+    report = _probe(
+        [
+            "init",
+            str(book),
+            "--behavior",
+            str(behavior),
+            "--llm-provider",
+            "fake",
+            "--embed-model",
+            "hash",
+        ]
+    )
+    assert report["exit_code"] == 0, report["output"]
+    config = json.loads((book / "storycraftr.json").read_text(encoding="utf-8"))
+    assert config["book_name"] == "book"
+    assert config["embed_model"] == "hash"
+    assert (book / "behaviors" / "default.txt").read_text(
+        encoding="utf-8"
+    ) == "Keep answers short."
+    for relative in (
+        "chapters/chapter-1.md",
+        "outline/general_outline.md",
+        "worldbuilding/geography.md",
+        "templates/template.tex",
+        ".storycraftr/subagents/editor.yaml",
+    ):
+        assert (book / relative).exists(), relative
@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.runnables import RunnableLambda
+
+from storycraftr.agent import agents
+from storycraftr.graph import build_assistant_graph
+from storycraftr.llm.offline import OfflineChatModel
+from storycraftr.utils.markdown import asave_to_markdown
+
+
+def _assistant(tmp_path, llm):
+    assistant = agents.LangChainAssistant(
+        id="assistant:test",
+        book_path=str(tmp_path),
+        config=SimpleNamespace(
+            multiple_answer=False, reference_author="", primary_language="en"
+        ),
+        llm=llm,
+        embeddings=None,
+        vector_store=None,
+        behavior="Be helpful.",
+    )
+
+    async def aretrieve(_):
+        return [Document(page_content="Lore", metadata={"source": "lore.md"})]
+
+    assistant.retriever = RunnableLambda(lambda _: [], afunc=aretrieve)
+    assistant.graph = build_assistant_graph(assistant)
+    return assistant
+
+
+def test_acreate_message_overlaps_requests_on_one_thread(tmp_path):
+    assistant = _assistant(
+        tmp_path, OfflineChatModel(template="Answer END_OF_RESPONSE", latency=0.2)
+    )
+
+    threads = [agents.get_thread(str(tmp_path)) for _ in range(10)]
+
+    async def run():
+        requests = [
+            agents.acreate_message(
+                str(tmp_path), thread_id=thread.id, content="Hi", assistant=assistant
+            )
+            for thread in threads
+        ]
+        return await asyncio.gather(*requests)
+
+    started = time.perf_counter()
+    answers = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    assert answers == ["Answer"] * 10
+    assert elapsed < 1.0  # ten 0.2s requests, not run back to back
+    assert all(len(thread.messages) == 2 for thread in threads)
+    assert assistant.last_documents[0].metadata["source"] == "lore.md"
+
+
+def test_astream_message_feeds_asave_to_markdown(tmp_path):
+    assistant = _assistant(
+        tmp_path, FakeListChatModel(responses=["  Chapter body END_OF_RESPONSE"])
+    )
+    thread = agents.get_thread(str(tmp_path))
+    deltas = []
+
+    async def run():
+        stream = await agents.astream_message(
+            str(tmp_path), thread_id=thread.id, content="Write", assistant=assistant
+        )
+
+        async def observed():
+            async for delta in stream:
+                deltas.append(delta)
+                yield delta
+
+        path = await asave_to_markdown(
+            str(tmp_path), "chapters/chapter-1.md", "Chapter 1", observed()
+        )
+        return stream, path
+
+    stream, path = asyncio.run(run())
+
+    assert stream.text == "Chapter body" == "".join(deltas)
+    assert Path(path).read_text(encoding="utf-8") == "# Chapter 1\n\nChapter body"
+    assert len(thread.messages) == 2
+
+
+def test_aprocess_chapters_bounds_concurrency_and_saves_in_order(tmp_path, monkeypatch):
+    for folder, names in {
+        "chapters": ["chapter-2.md", "chapter-1.md", "cover.md"],
+        "outline": ["general_outline.md"],
+        "worldbuilding": ["history.md"],
+    }.items():
+        (tmp_path / folder).mkdir()
+        for name in names:
+            (tmp_path / folder / name).write_text(f"# {name}\n", encoding="utf-8")
+
+    state = {"active": 0, "peak": 0, "threads": set()}
+    saved = []
+
+    async def fake_acreate_message(book_path, thread_id, content, file_path, **kw):
+        state["threads"].add(threading.get_ident())
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.05 if file_path.endswith("chapter-1.md") else 0.01)
+        state["active"] -= 1
+        return f"{content}:{Path(file_path).name}"
+
+    async def fake_save(book_path, relative_path, header, content, progress, task):
+        saved.append(relative_path)
+
+    assistant = SimpleNamespace(config=SimpleNamespace(llm_max_concurrency=2))
+    monkeypatch.setattr(agents, "create_or_get_assistant", lambda path: assistant)
+    monkeypatch.setattr(agents, "acreate_message", fake_acreate_message)
+    monkeypatch.setattr(agents, "update_agent_files", lambda path, asst: None)
+
+    results = asyncio.run(
+        agents.aprocess_chapters(
+            fake_save,
+            str(tmp_path),
+            prompt_template="Check {topic}",
+            task_description="Checking...",
+            file_suffix="Check",
+            topic="names",
+        )
+    )
+
+    expected = [
+        "chapters/chapter-1.md",
+        "chapters/chapter-2.md",
+        "outline/general_outline.md",
+        "worldbuilding/history.md",
+    ]
+    assert saved == list(results) == expected
+    assert state["peak"] == 2
+    assert len(state["threads"]) == 1
@@ -0,0 +1,65 @@
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+from langchain_core.runnables import RunnableLambda
+
+from storycraftr.agent.agents import LangChainAssistant
+from storycraftr.llm.offline import OfflineChatModel
+from storycraftr.vectorstores.keyword import KeywordIndex
+
+CHAPTER = "# Chapter 1\n\nMara crossed the Karsh bridge.\n\nThe river was loud.\n"
+
+
+class BlockingStore:
+    """Vector store whose first write blocks until the test releases it."""
+
+    def __init__(self, persist_dir: Path):
+        self._persist_directory = str(persist_dir)
+        self.chunks = {}
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def add_documents(self, documents, ids):
+        self.entered.set()
+        assert self.release.wait(5)
+        self.chunks.update(zip(ids, documents))
+
+    def delete(self, ids):
+        for identifier in ids:
+            self.chunks.pop(identifier, None)
+
+    def as_retriever(self, search_kwargs):
+        return RunnableLambda(lambda _: list(self.chunks.values()))
+
+
+def test_turns_use_keyword_fallback_until_background_build_swaps(tmp_path):
+    chapter = tmp_path / "chapters" / "chapter-1.md"
+    chapter.parent.mkdir(parents=True)
+    chapter.write_text(CHAPTER, encoding="utf-8")
+    store = BlockingStore(tmp_path / "vector_store")
+    assistant = LangChainAssistant(
+        id="assistant:test",
+        book_path=str(tmp_path),
+        config=SimpleNamespace(embed_model="test-model"),
+        llm=OfflineChatModel(template="ok"),
+        embeddings=None,
+        vector_store=store,
+        behavior="",
+        keyword_index=KeywordIndex(tmp_path / "keyword.sqlite"),
+    )
+
+    build = assistant.start_background_index()
+    assert store.entered.wait(5)
+    assert build.running
+
+    result = assistant.graph.invoke({"question": "Who crossed the Karsh bridge?"})
+    assert [doc.metadata["source"] for doc in result["documents"]] == [
+        "chapters/chapter-1.md"
+    ]
+
+    store.release.set()
+    assert build.wait(5)
+    assert build.error is None
+    assert (build.done, build.total) == (1, 1)
+    assert len(store.chunks) == 1
@@ -0,0 +1,138 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+from langchain_core.documents import Document
+
+from storycraftr.agent.agents import LangChainAssistant
+from storycraftr.vectorstores import chunking
+from storycraftr.vectorstores.chunking import (
+    MarkdownChunker,
+    count_tokens,
+    describe_location,
+    split_sections,
+)
+from storycraftr.vectorstores.manifest import IndexManifest
+
+CHAPTER = """# Chapter 1
+
+## Arrival
+
+Mara stepped off the ferry.
+
+"Who sent you?" the guard asked.
+
+***
+
+Night fell over the harbour.
+
+## Departure
+
+She left before dawn.
+"""
+
+
+class RecordingStore:
+    def __init__(self, persist_dir: Path):
+        self._persist_directory = str(persist_dir)
+        self.chunks = {}
+        self.added = []
+
+    def add_documents(self, documents, ids):
+        self.chunks.update(zip(ids, documents))
+        self.added.extend(documents)
+
+    def delete(self, ids):
+        for identifier in ids:
+            self.chunks.pop(identifier, None)
+
+
+def test_sections_follow_headings_and_scene_breaks():
+    sections = split_sections(CHAPTER)
+
+    assert [(s.heading_path, s.scene) for s in sections] == [
+        ("Chapter 1 > Arrival", 0),
+        ("Chapter 1 > Arrival", 1),
+        ("Chapter 1 > Departure", 0),
+    ]
+    assert sections[0].paragraphs == [
+        "Mara stepped off the ferry.",
+        '"Who sent you?" the guard asked.',
+    ]
+
+
+def test_chunks_carry_location_and_stable_ids():
+    chunker = MarkdownChunker()
+    document = Document(page_content=CHAPTER, metadata={"source": "chapters/c1.md"})
+
+    first = chunker.split_documents([document])
+    second = chunker.split_documents([document])
+
+    assert [c.metadata["chunk_id"] for c in first] == [
+        c.metadata["chunk_id"] for c in second
+    ]
+    assert describe_location(first[1].metadata) == (
+        "chapters/c1.md > Chapter 1 > Arrival (scene 2)"
+    )
+
+    edited = Document(
+        page_content=CHAPTER.replace("before dawn", "at noon"),
+        metadata={"source": "chapters/c1.md"},
+    )
+    changed = {c.metadata["chunk_id"] for c in chunker.split_documents([edited])}
+    original = {c.metadata["chunk_id"] for c in first}
+    assert len(original - changed) == 1
+
+
+def test_long_paragraphs_are_split_at_sentences():
+    sentence = "The lighthouse keeper counted every ship that passed. "
+    chunker = MarkdownChunker(max_tokens=40, overlap_tokens=0)
+
+    bodies = [body for _, body in chunker.split_text("# Log\n\n" + sentence * 12)]
+
+    assert len(bodies) > 1
+    assert all(count_tokens(body) <= 40 for body in bodies)
+    assert all(body.endswith("passed.") for body in bodies)
+
+
+def test_token_counter_never_downloads_and_is_part_of_the_signature(
+    tmp_path, monkeypatch
+):
+    import tiktoken
+
+    def no_download(name):
+        raise AssertionError("encoding must not be fetched")
+
+    monkeypatch.setenv("TIKTOKEN_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(tiktoken, "get_encoding", no_download)
+    chunking._tiktoken_counter.cache_clear()
+    try:
+        assert count_tokens("Mara stepped off the ferry.") == 6
+        assert chunking.token_counter_name() == "approx"
+        assert MarkdownChunker(max_tokens=64).signature.endswith(":approx")
+    finally:
+        chunking._tiktoken_counter.cache_clear()
+
+
+def test_editing_one_section_reembeds_only_that_section(tmp_path):
+    source = tmp_path / "chapters" / "chapter-1.md"
+    source.parent.mkdir(parents=True)
+    source.write_text(CHAPTER, encoding="utf-8")
+    store = RecordingStore(tmp_path / "vector_store")
+    assistant = LangChainAssistant(
+        id="assistant:test",
+        book_path=str(tmp_path),
+        config=SimpleNamespace(embed_model="test-model"),
+        llm=None,
+        embeddings=None,
+        vector_store=store,
+        behavior="",
+    )
+    assistant.sync_vector_store(IndexManifest.load(str(tmp_path)))
+    assert len(store.chunks) == 3
+
+    store.added.clear()
+    source.write_text(CHAPTER.replace("before dawn", "at noon"), encoding="utf-8")
+    assistant.sync_vector_store()
+
+    assert [doc.page_content for doc in store.added] == ["She left at noon."]
+    assert len(store.chunks) == 3
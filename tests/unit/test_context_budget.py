@@ -0,0 +1,154 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from storycraftr.agent import agents
+from storycraftr.graph import build_assistant_graph
+from storycraftr.llm.context import (
+    ContextBudget,
+    ContextOverflowError,
+    context_window_for,
+)
+from storycraftr.vectorstores.chunking import count_tokens
+
+
+def _paragraphs(label: str, count: int) -> str:
+    return "\n\n".join(f"{label} paragraph {i} " + "word " * 20 for i in range(count))
+
+
+def test_context_window_is_inferred_from_the_model_name(caplog):
+    assert context_window_for("gpt-4o-mini") == 128_000
+    assert context_window_for("openai/gpt-4") == 8_192
+    assert context_window_for("llama3:8b") == 8_192
+    assert context_window_for("llama3.2") == 131_072
+    # A prefix does not claim a newer version it does not list.
+    assert context_window_for("llama3.9", default=0) == 0
+    assert context_window_for("my-local-model", default=4096) == 4096
+    budget = ContextBudget.from_config(
+        SimpleNamespace(llm_model="gpt-4", llm_context_window=0)
+    )
+    assert budget.window == 8_192 and budget.prompt_tokens == 8_192 - 2048
+    assert not budget.window_assumed
+
+    with caplog.at_level(logging.WARNING):
+        unknown = ContextBudget.from_config(SimpleNamespace(llm_model="my-model"))
+    assert unknown.window_assumed and "llm_context_window" in caplog.text
+
+
+def test_fit_never_shortens_the_file_being_revised():
+    budget = ContextBudget(window=1200, output_tokens=200)
+    chapter = _paragraphs("Chapter", 60)
+
+    with pytest.raises(ContextOverflowError, match="llm_context_window"):
+        budget.fit("System prompt.", "Rewrite the chapter.", file_text=chapter)
+
+    fitted = ContextBudget(window=4000, output_tokens=200).fit(
+        "System prompt.", "Rewrite the chapter.", file_text=chapter
+    )
+    assert fitted.file_text == chapter
+
+
+def test_fit_keeps_the_file_then_documents_then_history():
+    budget = ContextBudget(window=1200, output_tokens=200)
+    documents = [
+        Document(page_content="Lore " * 60, metadata={"source": f"lore-{i}.md"})
+        for i in range(4)
+    ]
+    history = []
+    for turn in range(6):
+        history += [
+            HumanMessage(content=f"question {turn} " + "x " * 30),
+            AIMessage(content=f"answer {turn} " + "y " * 30),
+        ]
+
+    fitted = budget.fit(
+        "System prompt.",
+        "Rewrite the chapter.",
+        documents=documents,
+        file_text=_paragraphs("Chapter", 34),
+        history=history,
+    )
+
+    assert fitted.file_text == _paragraphs("Chapter", 34)
+    assert fitted.documents == documents[: len(fitted.documents)]
+    assert 1 <= len(fitted.documents) < 4
+    assert fitted.dropped_documents == 4 - len(fitted.documents)
+    assert fitted.prompt_tokens <= budget.prompt_tokens
+    # The file outranks the conversation.
+    assert fitted.history == [] and fitted.dropped_messages == 12
+
+    small = ContextBudget(window=500, output_tokens=200)
+    chat = small.fit("System prompt.", "Go on.", history=history)
+    # Only whole, most recent turns survive.
+    assert 2 <= len(chat.history) < 12 and len(chat.history) % 2 == 0
+    assert chat.history == history[-len(chat.history) :]
+    assert chat.prompt_tokens <= small.prompt_tokens
+
+
+def test_graph_sends_recent_history_and_fitted_file(tmp_path):
+    seen = []
+
+    def llm(prompt_value):
+        seen.append(prompt_value.to_messages())
+        return AIMessage(content="Noted.")
+
+    assistant = agents.LangChainAssistant(
+        id="assistant:test",
+        book_path=str(tmp_path),
+        config=SimpleNamespace(
+            multiple_answer=False, reference_author="", primary_language="en"
+        ),
+        llm=RunnableLambda(llm),
+        embeddings=None,
+        vector_store=None,
+        behavior="Be helpful.",
+        context_budget=ContextBudget(window=4000, output_tokens=500),
+    )
+    lore = [
+        Document(page_content="Lore " * 400, metadata={"source": f"lore-{i}.md"})
+        for i in range(6)
+    ]
+    assistant.retriever = RunnableLambda(lambda _: lore)
+    assistant.graph = build_assistant_graph(assistant)
+    chapter = tmp_path / "chapter-1.md"
+    chapter.write_text(_paragraphs("Chapter", 300), encoding="utf-8")
+    thread = agents.get_thread(str(tmp_path))
+
+    # A chapter too large for the window is refused, not shortened.
+    with pytest.raises(ContextOverflowError):
+        agents.create_message(
+            str(tmp_path),
+            thread_id=thread.id,
+            content="First request",
+            assistant=assistant,
+            file_path=str(chapter),
+        )
+    assert seen == []
+
+    chapter.write_text(_paragraphs("Chapter", 60), encoding="utf-8")
+    agents.create_message(
+        str(tmp_path),
+        thread_id=thread.id,
+        content="First request",
+        assistant=assistant,
+        file_path=str(chapter),
+    )
+    dropped = assistant.last_timings["dropped"]
+    agents.create_message(
+        str(tmp_path), thread_id=thread.id, content="Second", assistant=assistant
+    )
+
+    first, second = seen
+    assert [message.type for message in first] == ["system", "human"]
+    assert first[-1].content.endswith(_paragraphs("Chapter", 60))
+    assert sum(count_tokens(str(m.content)) for m in first) <= 3500
+    # Passages that no longer fit are dropped and reported.
+    assert 0 < dropped["documents"] < 6
+    # The next turn sees the previous one, without the file attached again.
+    assert [message.type for message in second] == ["system", "human", "ai", "human"]
+    assert "First request" in second[1].content
+    assert "existing content to adjust" not in second[1].content
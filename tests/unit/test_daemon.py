@@ -0,0 +1,98 @@
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.runnables import RunnableLambda
+
+from storycraftr.agent import agents
+from storycraftr.daemon import DaemonClient, connect_daemon
+from storycraftr.daemon.server import AssistantDaemon
+from storycraftr.graph import build_assistant_graph
+
+
+def _warm_assistant(book_path: Path, response: str) -> agents.LangChainAssistant:
+    assistant = agents.LangChainAssistant(
+        id="assistant:book",
+        book_path=str(book_path),
+        config=SimpleNamespace(
+            multiple_answer=False, reference_author="", primary_language="en"
+        ),
+        llm=FakeListChatModel(responses=[response]),
+        embeddings=None,
+        vector_store=None,
+        behavior="Be helpful.",
+    )
+    assistant.retriever = RunnableLambda(
+        lambda _: [Document(page_content="Lore", metadata={"source": "lore.md"})]
+    )
+    assistant.graph = build_assistant_graph(assistant)
+    return assistant
+
+
+def test_remote_assistant_streams_turns_from_daemon(tmp_path, monkeypatch):
+    book = (tmp_path / "book").resolve()
+    book.mkdir()
+    (book / "storycraftr.json").write_text("{}", encoding="utf-8")
+    monkeypatch.setitem(
+        agents._ASSISTANT_CACHE,
+        str(book),
+        _warm_assistant(book, "Remote answer END_OF_RESPONSE"),
+    )
+
+    socket_path = tmp_path / "daemon.sock"
+    daemon = AssistantDaemon(socket_path)
+    daemon.build_server()
+    server_thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    server_thread.start()
+
+    client = connect_daemon(socket_path)
+    assert isinstance(client, DaemonClient)
+    assert client.ping()["books"] == [str(book)]
+
+    remote = client.attach(str(book), config=SimpleNamespace())
+    deltas = []
+    answer = agents.create_message(
+        str(book),
+        thread_id="thread:remote",
+        content="Say hi",
+        assistant=remote,
+        on_token=deltas.append,
+    )
+
+    assert answer == "Remote answer"
+    assert "".join(deltas) == answer
+    assert remote.last_documents[0].metadata["source"] == "lore.md"
+    assert "generation" in remote.last_timings["stages"]
+    # History lives in the daemon process (here: the same interpreter).
+    assert len(agents._THREADS["thread:remote"].messages) == 2
+
+    client.shutdown()
+    server_thread.join(timeout=5)
+    assert not server_thread.is_alive()
+    assert not socket_path.exists()
+    assert connect_daemon(socket_path) is None
+
+
+def test_cold_build_does_not_block_other_books(tmp_path, monkeypatch):
+    slow, fast = (tmp_path / "slow").resolve(), (tmp_path / "fast").resolve()
+    building, release = threading.Event(), threading.Event()
+
+    def fake_create(book_path, use_daemon=True):
+        if book_path == str(slow):
+            building.set()
+            release.wait(5)
+        return SimpleNamespace(id=book_path)
+
+    monkeypatch.setattr(agents, "create_or_get_assistant", fake_create)
+    daemon = AssistantDaemon(tmp_path / "daemon.sock")
+    cold = threading.Thread(target=daemon._assistant, args=(str(slow),))
+    cold.start()
+    assert building.wait(5)
+
+    # Served while the slow project is still building its index.
+    assert daemon._assistant(str(fast)).id == str(fast)
+    assert cold.is_alive()
+    release.set()
+    cold.join(timeout=5)
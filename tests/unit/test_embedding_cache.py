@@ -0,0 +1,100 @@
+import sqlite3
+from types import SimpleNamespace
+
+from langchain_core.embeddings import Embeddings
+
+from storycraftr.agent.agents import LangChainAssistant
+from storycraftr.llm.embeddings import CachedEmbeddings, HashEmbeddings
+from storycraftr.utils.sqlite_cache import SQLiteLRUCache
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+
+    def embed_query(self, text):
+        self.calls.append([text])
+        return [float(len(text)), 1.0]
+
+
+def test_cached_embeddings_only_compute_misses(tmp_path):
+    underlying = CountingEmbeddings()
+    store = SQLiteLRUCache(tmp_path / "cache.sqlite")
+    embeddings = CachedEmbeddings(underlying, store, namespace="model|normalize=True")
+
+    first = embeddings.embed_documents(["alpha", "beta", "alpha"])
+    assert underlying.calls == [["alpha", "beta"]]
+    assert first == [[5.0, 0.5], [4.0, 0.5], [5.0, 0.5]]
+
+    second = embeddings.embed_documents(["beta", "gamma"])
+    assert underlying.calls[-1] == ["gamma"]
+    assert second == [[4.0, 0.5], [5.0, 0.5]]
+
+    # A fresh wrapper over the same file serves everything from disk.
+    reopened = CachedEmbeddings(
+        CountingEmbeddings(),
+        SQLiteLRUCache(tmp_path / "cache.sqlite"),
+        namespace="model|normalize=True",
+    )
+    assert reopened.embed_documents(["alpha", "gamma"]) == [[5.0, 0.5], [5.0, 0.5]]
+    assert reopened.underlying.calls == []
+
+
+def test_cache_namespace_separates_models(tmp_path):
+    store = SQLiteLRUCache(tmp_path / "cache.sqlite")
+    CachedEmbeddings(CountingEmbeddings(), store, "a").embed_documents(["text"])
+    other = CountingEmbeddings()
+    CachedEmbeddings(other, store, "b").embed_documents(["text"])
+    assert other.calls == [["text"]]
+
+
+def test_lru_store_evicts_least_recently_used(tmp_path):
+    store = SQLiteLRUCache(tmp_path / "cache.sqlite", max_entries=2)
+    store.put("a", b"1")
+    store.put("b", b"2")
+    assert store.get("a") == b"1"
+    store.put("c", b"3")
+    assert len(store) == 2
+    assert store.get("b") is None
+    assert store.get_many(["a", "c"]) == {"a": b"1", "c": b"3"}
+
+
+def test_lru_store_buffers_hits_and_skips_counting_below_the_cap(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    store = SQLiteLRUCache(path, max_entries=100)
+    store.put_many({"a": b"1", "b": b"2"})
+    statements = []
+    store._conn.set_trace_callback(statements.append)
+
+    for _ in range(3):
+        assert store.get("a") == b"1"
+    store.put_many({"c": b"3", "d": b"4"})
+
+    assert not [sql for sql in statements if sql.startswith("UPDATE")]
+    assert not [sql for sql in statements if "COUNT(*)" in sql]
+
+    store.close()
+    store.close()
+    reader = sqlite3.connect(str(path))
+    access = dict(reader.execute("SELECT key, last_access FROM entries"))
+    reader.close()
+    assert access["a"] > access["b"]
+
+
+def test_closing_the_assistant_closes_its_vector_cache(tmp_path):
+    store = SQLiteLRUCache(tmp_path / "cache.sqlite")
+    assistant = LangChainAssistant(
+        id="assistant:test",
+        book_path=str(tmp_path),
+        config=SimpleNamespace(embed_model="hash"),
+        llm=None,
+        embeddings=CachedEmbeddings(HashEmbeddings(8), store, "hash"),
+        vector_store=None,
+        behavior="",
+    )
+    assistant.close()
+    assert store._closed
@@ -0,0 +1,84 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from storycraftr.llm import embeddings
+from storycraftr.llm.embeddings import (
+    CachedEmbeddings,
+    EmbeddingPool,
+    EmbeddingSettings,
+    HashEmbeddings,
+    build_embedding_model,
+    embedding_pool_stats,
+    release_embedding_model,
+)
+
+
+class ExclusiveEmbeddings(HashEmbeddings):
+    """Fails if two threads embed at the same time."""
+
+    def __init__(self):
+        super().__init__(8)
+        self._busy = threading.Lock()
+
+    def embed_query(self, text):
+        assert self._busy.acquire(blocking=False), "concurrent call"
+        try:
+            time.sleep(0.001)
+            return super().embed_query(text)
+        finally:
+            self._busy.release()
+
+
+def test_pool_shares_one_model_per_key_and_unloads_idle():
+    loads = []
+
+    def loader(settings):
+        loads.append(settings.model_name)
+        return ExclusiveEmbeddings()
+
+    pool = EmbeddingPool(loader)
+    first = pool.acquire(EmbeddingSettings(model_name="BAAI/bge-large-en-v1.5"))
+    second = pool.acquire(EmbeddingSettings(model_name="BAAI/bge-large-en-v1.5"))
+    other = pool.acquire(
+        EmbeddingSettings(model_name="BAAI/bge-large-en-v1.5", device="cuda")
+    )
+
+    assert first is second
+    assert other is not first
+    assert len(loads) == 2
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(first.embed_query, ["a", "b", "c", "d"] * 5))
+
+    pool.release(first)
+    assert pool.unload() == []
+    pool.release(second)
+    pool.release(other)
+    assert sorted(pool.unload()) == ["BAAI/bge-large-en-v1.5"] * 2
+    assert pool.stats() == {}
+
+
+def test_build_embedding_model_layers_project_cache_on_shared_model(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(
+        embeddings, "_POOL", EmbeddingPool(lambda settings: HashEmbeddings(16))
+    )
+    settings = [
+        EmbeddingSettings(
+            model_name="BAAI/bge-small-en-v1.5",
+            vector_cache_path=str(tmp_path / f"{book}.sqlite"),
+        )
+        for book in ("one", "two")
+    ]
+    first, second = (build_embedding_model(s) for s in settings)
+
+    assert isinstance(first, CachedEmbeddings)
+    assert first.underlying is second.underlying
+    key = first.underlying.key
+    assert embedding_pool_stats()[key] == 2
+
+    release_embedding_model(first)
+    release_embedding_model(second)
+    assert embedding_pool_stats()[key] == 0
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from storycraftr.llm.embeddings import HashEmbeddings
+from storycraftr.vectorstores import build_vector_store
+from storycraftr.vectorstores.flat import FlatVectorStore
+
+TEXTS = [
+    "Mara crossed the Karsh bridge at dawn.",
+    "The tavern keeper poured another ale.",
+    "Storm clouds gathered over the harbour.",
+]
+
+
+def _store(tmp_path, **kwargs):
+    return FlatVectorStore(tmp_path / "flat", HashEmbeddings(64), **kwargs)
+
+
+def test_exact_search_returns_best_match_first(tmp_path):
+    store = _store(tmp_path)
+    store.add_texts(
+        TEXTS, [{"source": f"c{i}.md"} for i in range(3)], ids=["a", "b", "c"]
+    )
+
+    hits = store.similarity_search_with_score("Who crossed the Karsh bridge?", k=2)
+
+    assert len(hits) == 2
+    assert hits[0][0].id == "a"
+    assert hits[0][0].metadata == {"source": "c0.md"}
+    assert hits[0][1] >= hits[1][1]
+    filtered = store.similarity_search("bridge", k=3, filter={"source": "c2.md"})
+    assert [doc.id for doc in filtered] == ["c"]
+
+
+def test_upsert_delete_and_reload_from_disk(tmp_path):
+    store = _store(tmp_path, dtype="float16")
+    store.add_texts(TEXTS, ids=["a", "b", "c"])
+    store.add_texts(["The harbour froze overnight."], ids=["c"])
+    assert store.delete(["b"])
+
+    reopened = _store(tmp_path, dtype="float16")
+    assert len(reopened) == 2
+    assert [doc.page_content for doc in reopened.get_by_ids(["a", "c"])] == [
+        TEXTS[0],
+        "The harbour froze overnight.",
+    ]
+    assert reopened._matrix.dtype == np.float16
+    assert len(list((tmp_path / "flat").glob("flat-vectors-*.npy"))) <= 2
+
+
+def test_readers_pick_up_writes_from_other_instances(tmp_path):
+    writer = _store(tmp_path)
+    reader = _store(tmp_path)
+    assert reader.similarity_search("bridge") == []
+
+    writer.add_texts(TEXTS, ids=["a", "b", "c"])
+
+    assert reader.similarity_search("Karsh bridge", k=1)[0].id == "a"
+
+
+def test_deferred_writes_save_once_at_the_end(tmp_path, monkeypatch):
+    store = _store(tmp_path)
+    reader = _store(tmp_path)
+    saves = []
+    save = store._save
+    monkeypatch.setattr(store, "_save", lambda matrix: saves.append(1) or save(matrix))
+
+    with store.deferred_writes():
+        for index, text in enumerate(TEXTS):
+            store.add_texts([text], ids=[f"id-{index}"])
+        store.add_texts(["The harbour froze overnight."], ids=["id-2"])
+        assert store.delete(["id-1"])
+        # Pending rows are searchable here but not yet on disk.
+        assert store.similarity_search("Karsh bridge", k=1)[0].id == "id-0"
+        assert len(reader) == 0
+
+    assert saves == [1]
+    assert len(reader) == 2
+    assert [doc.page_content for doc in reader.get_by_ids(["id-0", "id-2"])] == [
+        TEXTS[0],
+        "The harbour froze overnight.",
+    ]
+
+
+def test_build_vector_store_selects_backend(tmp_path):
+    store = build_vector_store(
+        str(tmp_path), HashEmbeddings(8), backend="flat", persist_subdir="vs"
+    )
+    assert isinstance(store, FlatVectorStore)
+    with pytest.raises(ValueError, match="Unknown vector_backend"):
+        build_vector_store(str(tmp_path), HashEmbeddings(8), backend="faiss")
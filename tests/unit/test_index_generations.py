@@ -0,0 +1,131 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from storycraftr.agent import agents
+from storycraftr.agent.agents import LangChainAssistant
+from storycraftr.vectorstores.generations import (
+    collect_generations,
+    current_generation,
+    list_generations,
+    open_generation,
+)
+
+CHAPTER = "# Chapter 1\n\nMara crossed the bridge.\n\nThe river was loud.\n"
+
+
+# Chunks "on disk" per persist directory, shared by stores opened on it.
+_PERSISTED = {}
+
+
+class RecordingStore:
+    def __init__(self, persist_dir: Path, fail: bool = False):
+        self._persist_directory = str(persist_dir)
+        self.chunks = _PERSISTED.setdefault(str(persist_dir), {})
+        self.fail = fail
+        self.embedded = 0
+        self.closed = False
+        self._collection = SimpleNamespace(count=lambda: len(self.chunks))
+
+    def add_documents(self, documents, ids):
+        if self.fail:
+            raise ValueError("embedding service unavailable")
+        self.embedded += len(ids)
+        self.chunks.update(zip(ids, documents))
+
+    def close(self):
+        self.closed = True
+
+    def delete(self, ids):
+        for identifier in ids:
+            self.chunks.pop(identifier, None)
+
+    def as_retriever(self, search_kwargs):
+        return SimpleNamespace(invoke=lambda _: list(self.chunks.values()))
+
+
+def _assistant(tmp_path: Path, monkeypatch, fail_rebuild=False) -> LangChainAssistant:
+    chapter = tmp_path / "chapters" / "chapter-1.md"
+    chapter.parent.mkdir(parents=True, exist_ok=True)
+    chapter.write_text(CHAPTER, encoding="utf-8")
+    monkeypatch.setattr(
+        agents,
+        "_build_store",
+        lambda book, embeddings, config, persist_subdir: RecordingStore(
+            Path(book) / persist_subdir, fail=fail_rebuild
+        ),
+    )
+    generation = open_generation(str(tmp_path))
+    assistant = LangChainAssistant(
+        id="assistant:test",
+        book_path=str(tmp_path),
+        config=SimpleNamespace(embed_model="test-model"),
+        llm=None,
+        embeddings=None,
+        vector_store=RecordingStore(generation.path),
+        behavior="",
+        generation=generation,
+    )
+    monkeypatch.setattr(agents, "build_assistant_graph", lambda _: None)
+    assistant.ensure_vector_store()
+    return assistant
+
+
+def test_first_generation_is_created_and_legacy_files_collected(tmp_path):
+    legacy = tmp_path / "vector_store" / "chroma.sqlite3"
+    legacy.parent.mkdir()
+    legacy.write_text("old layout", encoding="utf-8")
+
+    generation = open_generation(str(tmp_path))
+
+    assert generation.name == "gen-1"
+    assert current_generation(str(tmp_path)) == "gen-1"
+    assert not legacy.exists()
+
+
+def test_rebuild_swaps_generation_after_readers_finish(tmp_path, monkeypatch):
+    assistant = _assistant(tmp_path, monkeypatch)
+    old = assistant.generation
+    old_store = assistant.vector_store
+    assert len(old_store.chunks) == 1
+
+    with old.reading():
+        assistant.ensure_vector_store(force=True)
+        # The reader still sees the old generation on disk.
+        assert current_generation(str(tmp_path)) == "gen-2"
+        assert list_generations(str(tmp_path)) == ["gen-1", "gen-2"]
+        assert not old_store.closed
+
+    assert old_store.closed
+    assert list_generations(str(tmp_path)) == ["gen-2"]
+    assert assistant.vector_store is not old_store
+    assert len(assistant.vector_store.chunks) == 1
+    assert collect_generations(str(tmp_path)) == []
+
+
+def test_failed_rebuild_keeps_serving_old_generation(tmp_path, monkeypatch):
+    assistant = _assistant(tmp_path, monkeypatch, fail_rebuild=True)
+    store = assistant.vector_store
+
+    with pytest.raises(RuntimeError, match="embedding service unavailable"):
+        assistant.ensure_vector_store(force=True)
+
+    assert assistant.vector_store is store
+    assert current_generation(str(tmp_path)) == "gen-1"
+    assert list_generations(str(tmp_path)) == ["gen-1"]
+
+
+def test_other_processes_reopen_a_rebuilt_generation(tmp_path, monkeypatch):
+    rebuilder = _assistant(tmp_path, monkeypatch)
+    follower = _assistant(tmp_path, monkeypatch)
+    stale_store = follower.vector_store
+
+    rebuilder.ensure_vector_store(force=True)
+    follower.ensure_vector_store()
+
+    assert follower.generation.name == "gen-2"
+    assert follower.vector_store.embedded == 0
+    assert len(follower.vector_store.chunks) == 1
+    assert stale_store.closed
+    assert list_generations(str(tmp_path)) == ["gen-2"]
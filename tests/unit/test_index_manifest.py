@@ -0,0 +1,83 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+from storycraftr.agent.agents import LangChainAssistant
+from storycraftr.vectorstores.manifest import FileEntry, IndexManifest, content_hash
+
+
+class RecordingStore:
+    def __init__(self, persist_dir: Path):
+        self._persist_directory = str(persist_dir)
+        self.chunks = {}
+        self.added_sources = []
+
+    def add_documents(self, documents, ids):
+        for doc, identifier in zip(documents, ids):
+            self.chunks[identifier] = doc
+            self.added_sources.append(doc.metadata["source"])
+
+    def delete(self, ids):
+        for identifier in ids:
+            self.chunks.pop(identifier, None)
+
+
+def _write(path: Path, body: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("# Title\n\nline one\nline two\n" + body, encoding="utf-8")
+
+
+def _assistant(tmp_path: Path) -> LangChainAssistant:
+    return LangChainAssistant(
+        id="assistant:test",
+        book_path=str(tmp_path),
+        config=SimpleNamespace(embed_model="test-model"),
+        llm=None,
+        embeddings=None,
+        vector_store=RecordingStore(tmp_path / "vector_store"),
+        behavior="",
+    )
+
+
+def test_manifest_diff_classifies_sources(tmp_path):
+    manifest = IndexManifest.load(str(tmp_path))
+    manifest.files = {
+        "a.md": FileEntry(hash="1", chunk_ids=["1-0"]),
+        "b.md": FileEntry(hash="2", chunk_ids=["2-0"]),
+    }
+    diff = manifest.diff({"a.md": "1", "b.md": "changed", "c.md": "3"})
+    assert diff.unchanged == ["a.md"]
+    assert diff.changed == ["b.md"]
+    assert diff.added == ["c.md"]
+    assert diff.removed == []
+
+
+def test_sync_only_reembeds_changed_files(tmp_path):
+    _write(tmp_path / "chapters" / "chapter-1.md", "first")
+    _write(tmp_path / "chapters" / "chapter-2.md", "second")
+    assistant = _assistant(tmp_path)
+    store = assistant.vector_store
+
+    manifest = IndexManifest.load(str(tmp_path))
+    assistant.sync_vector_store(manifest)
+    assert sorted(store.added_sources) == [
+        "chapters/chapter-1.md",
+        "chapters/chapter-2.md",
+    ]
+
+    store.added_sources.clear()
+    _write(tmp_path / "chapters" / "chapter-2.md", "second, edited")
+    (tmp_path / "chapters" / "chapter-1.md").unlink()
+    diff = assistant.sync_vector_store()
+
+    assert diff.changed == ["chapters/chapter-2.md"]
+    assert diff.removed == ["chapters/chapter-1.md"]
+    assert store.added_sources == ["chapters/chapter-2.md"]
+    assert {doc.metadata["source"] for doc in store.chunks.values()} == {
+        "chapters/chapter-2.md"
+    }
+
+    saved = IndexManifest.load(str(tmp_path))
+    text = (tmp_path / "chapters" / "chapter-2.md").read_text(encoding="utf-8")
+    assert set(saved.files) == {"chapters/chapter-2.md"}
+    assert saved.files["chapters/chapter-2.md"].hash == content_hash(text)
+    assert assistant.sync_vector_store().is_empty
@@ -0,0 +1,100 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+from storycraftr.agent.agents import (
+    LangChainAssistant,
+    index_stats,
+    load_markdown_documents,
+)
+from storycraftr.vectorstores.manifest import IndexManifest
+from storycraftr.vectorstores.scope import IndexScope, ScanResult, scan_markdown_files
+
+
+class RecordingStore:
+    def __init__(self, persist_dir: Path):
+        self._persist_directory = str(persist_dir)
+        self.chunks = {}
+        self.added_sources = []
+
+    def add_documents(self, documents, ids):
+        for doc, identifier in zip(documents, ids):
+            self.chunks[identifier] = doc
+            self.added_sources.append(doc.metadata["source"])
+
+    def delete(self, ids):
+        for identifier in ids:
+            self.chunks.pop(identifier, None)
+
+
+SHARED = "A paragraph that appears verbatim in two different notes.\n"
+
+
+def _write(path: Path, body: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"line one\nline two\nline three\n{body}", encoding="utf-8")
+
+
+def test_scope_excludes_generated_outputs(tmp_path):
+    _write(tmp_path / "chapters" / "chapter-1.md", "text")
+    _write(tmp_path / "book" / "full-book.md", "compiled")
+    _write(tmp_path / "outline" / "README.md", "notes")
+    (tmp_path / "chapters" / "notes.txt").write_text("ignored", encoding="utf-8")
+
+    result = scan_markdown_files(str(tmp_path), IndexScope())
+
+    assert result.included == ["chapters/chapter-1.md"]
+    assert result.excluded["book/"] == "excluded by 'book/**'"
+    assert result.excluded["outline/README.md"] == "excluded by '**/README.md'"
+
+
+def test_tutorial_docs_copied_by_init_are_not_indexed(tmp_path):
+    (tmp_path / "storycraftr.json").write_text('{"book_name": "Test"}', "utf-8")
+    _write(tmp_path / "chapters" / "chapter-1.md", "text")
+    _write(tmp_path / "storycraftr" / "getting_started.md", "tutorial")
+
+    stats = index_stats(str(tmp_path))
+
+    assert stats.included == ["chapters/chapter-1.md"]
+    assert stats.excluded["storycraftr/"] == "excluded by 'storycraftr/**'"
+
+
+def test_scope_include_globs_and_short_files(tmp_path):
+    _write(tmp_path / "chapters" / "chapter-1.md", "text")
+    _write(tmp_path / "worldbuilding" / "magic.md", "text")
+    (tmp_path / "chapters" / "stub.md").write_text("# Stub\n", encoding="utf-8")
+
+    scope = IndexScope(include=("chapters/*.md",), exclude=())
+    report = ScanResult()
+    documents = load_markdown_documents(str(tmp_path), scope, report)
+
+    assert [doc.metadata["source"] for doc in documents] == ["chapters/chapter-1.md"]
+    assert report.excluded["worldbuilding/magic.md"] == "not matched by index_include"
+    assert report.excluded["chapters/stub.md"] == "fewer than 4 lines"
+
+
+def test_duplicate_chunks_are_stored_once(tmp_path):
+    _write(tmp_path / "outline" / "summary.md", SHARED)
+    _write(tmp_path / "worldbuilding" / "summary.md", SHARED)
+    store = RecordingStore(tmp_path / "vector_store")
+    assistant = LangChainAssistant(
+        id="assistant:test",
+        book_path=str(tmp_path),
+        config=SimpleNamespace(embed_model="test-model"),
+        llm=None,
+        embeddings=None,
+        vector_store=store,
+        behavior="",
+    )
+
+    assistant.sync_vector_store(IndexManifest.load(str(tmp_path)))
+    assert len(store.chunks) == 1
+    assert len(store.added_sources) == 1
+
+    # The shared chunk stays while another file still references it.
+    (tmp_path / "outline" / "summary.md").unlink()
+    assistant.sync_vector_store()
+    assert len(store.chunks) == 1
+
+    (tmp_path / "worldbuilding" / "summary.md").unlink()
+    assistant.sync_vector_store()
+    assert store.chunks == {}
@@ -0,0 +1,79 @@
+import sqlite3
+from types import SimpleNamespace
+
+from langchain_core.documents import Document
+from langchain_core.runnables import RunnableLambda
+
+from storycraftr.graph import build_assistant_graph
+from storycraftr.vectorstores.keyword import KeywordIndex, reciprocal_rank_fusion
+
+
+def _doc(identifier, text, source="chapters/chapter-1.md"):
+    return Document(
+        page_content=text, metadata={"source": source, "chunk_id": identifier}
+    )
+
+
+def test_keyword_index_ranks_proper_nouns_and_updates_incrementally(tmp_path):
+    index = KeywordIndex(tmp_path / "keyword.sqlite")
+    docs = [
+        _doc("a", "The tavern was quiet that night."),
+        _doc("b", "Elowen cast Veilfire across the ruined bridge of Karsh."),
+        _doc("c", "Rain fell over the harbour."),
+    ]
+    index.add_documents(docs, ["a", "b", "c"])
+
+    hits = index.search("Where did Elowen use veilfire?", k=2)
+    assert [hit.metadata["chunk_id"] for hit in hits] == ["b"]
+
+    index.delete(["b"])
+    index.add_documents([_doc("b2", "Veilfire is forbidden in Karsh.")], ["b2"])
+    assert [hit.metadata["chunk_id"] for hit in index.search("veilfire")] == ["b2"]
+    assert len(index) == 3
+
+
+def test_keyword_index_backfills_rowid_map_for_older_indexes(tmp_path):
+    path = tmp_path / "keyword.sqlite"
+    legacy = sqlite3.connect(str(path))
+    with legacy:
+        legacy.execute(
+            "CREATE VIRTUAL TABLE chunks USING fts5("
+            "chunk_id UNINDEXED, metadata UNINDEXED, content, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        legacy.executemany(
+            "INSERT INTO chunks (chunk_id, metadata, content) VALUES (?, '{}', ?)",
+            [("a", "Elowen at the gate."), ("b", "Karsh burns.")],
+        )
+    legacy.close()
+
+    index = KeywordIndex(path)
+    assert len(index) == 2
+    index.add_documents([_doc("a", "Elowen leaves Karsh.")], ["a"])
+    index.delete(["b"])
+
+    hits = index.search("Karsh")
+    assert [hit.page_content for hit in hits] == ["Elowen leaves Karsh."]
+    assert len(index) == 1
+    index.close()
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    dense = [_doc("a", "a"), _doc("b", "b"), _doc("c", "c")]
+    keyword = [_doc("c", "c"), _doc("d", "d")]
+    fused = reciprocal_rank_fusion([dense, keyword], limit=3)
+    assert [doc.metadata["chunk_id"] for doc in fused] == ["c", "a", "b"]
+
+
+def test_graph_fuses_keyword_hits_into_context(tmp_path):
+    index = KeywordIndex(tmp_path / "keyword.sqlite")
+    index.add_documents([_doc("k", "Karsh is a ruined city.")], ["k"])
+    assistant = SimpleNamespace(
+        retriever=RunnableLambda(lambda _: [_doc("d", "Unrelated dense hit.")]),
+        keyword_index=index,
+        retrieval_k=6,
+        llm=RunnableLambda(lambda _: "ok"),
+        system_prompt="system",
+    )
+    result = build_assistant_graph(assistant).invoke({"question": "Tell me of Karsh"})
+    assert {doc.metadata["chunk_id"] for doc in result["documents"]} == {"d", "k"}
@@ -0,0 +1,58 @@
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+
+from storycraftr.llm.cache import CachedChatModel, LLMCacheMissError
+from storycraftr.utils.core import generate_prompt_with_hash
+from storycraftr.utils.sqlite_cache import SQLiteLRUCache
+
+
+def _cached(tmp_path, responses, replay_only=False):
+    return CachedChatModel(
+        underlying=FakeListChatModel(responses=responses),
+        store=SQLiteLRUCache(tmp_path / "llm.sqlite"),
+        namespace="fake|model|0.7",
+        replay_only=replay_only,
+    )
+
+
+def test_identical_requests_are_served_from_cache(tmp_path):
+    model = _cached(tmp_path, ["first", "second"])
+    assert model.invoke([HumanMessage(content="hi")]).content == "first"
+    assert model.invoke([HumanMessage(content="hi")]).content == "first"
+    assert model.invoke([HumanMessage(content="other")]).content == "second"
+
+    streamed = "".join(
+        chunk.content for chunk in model.stream([HumanMessage(content="hi")])
+    )
+    assert streamed == "first"
+
+
+def test_replay_mode_never_calls_the_provider(tmp_path):
+    _cached(tmp_path, ["recorded"]).invoke([HumanMessage(content="hi")])
+
+    replay = _cached(tmp_path, ["live"], replay_only=True)
+    assert replay.invoke([HumanMessage(content="hi")]).content == "recorded"
+    with pytest.raises(LLMCacheMissError):
+        replay.invoke([HumanMessage(content="unseen")])
+
+
+def test_deterministic_prompt_prefix_is_stable(tmp_path):
+    prompts = {
+        generate_prompt_with_hash("Write", "May 1, 2025", str(tmp_path), True)
+        for _ in range(5)
+    }
+    assert len(prompts) == 1
+
+
+def test_deterministic_prompts_hit_the_cache_on_another_day(tmp_path):
+    book = tmp_path / "book"
+    book.mkdir()
+    first = generate_prompt_with_hash("Write", "May 1, 2025", str(book), True)
+    second = generate_prompt_with_hash("Write", "May 2, 2025", str(book), True)
+    assert first == second
+    assert "2025" not in first
+
+    _cached(tmp_path, ["recorded"]).invoke([HumanMessage(content=first)])
+    replay = _cached(tmp_path, ["live"], replay_only=True)
+    assert replay.invoke([HumanMessage(content=second)]).content == "recorded"
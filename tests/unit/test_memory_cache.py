@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from storycraftr.agent import agents
+from storycraftr.utils.memory_cache import BoundedCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bounded_cache_evicts_least_recently_used():
+    evicted = []
+    cache = BoundedCache(max_entries=2, on_evict=lambda k, v: evicted.append(k))
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1  # refresh "a"
+    cache["c"] = 3
+
+    assert sorted(cache) == ["a", "c"]
+    assert evicted == ["b"]
+    stats = cache.stats()
+    assert stats.evicted_lru == 1 and stats.hits == 1 and stats.evictions == 1
+
+
+def test_bounded_cache_expires_idle_entries():
+    clock = FakeClock()
+    cache = BoundedCache(ttl=10, clock=clock)
+    cache["a"] = 1
+    clock.now = 5
+    cache["b"] = 2
+    clock.now = 12
+
+    assert "a" not in cache
+    assert cache.get("a") is None
+    assert cache["b"] == 2
+    assert cache.stats().evicted_ttl == 1
+
+
+def test_bounded_cache_enforces_byte_budget_after_touch():
+    cache = BoundedCache(max_bytes=10, sizeof=len)
+    cache["old"] = ["x"] * 4
+    cache["new"] = ["x"] * 4
+    cache["new"].extend(["x"] * 4)
+    cache.touch("new")
+
+    assert list(cache) == ["new"]
+    stats = cache.stats()
+    assert stats.bytes == 8 and stats.evicted_bytes == 1
+
+
+def test_thread_cache_is_bounded(tmp_path, monkeypatch):
+    threads = BoundedCache(max_entries=3, sizeof=agents._thread_size)
+    monkeypatch.setattr(agents, "_THREADS", threads)
+
+    created = [agents.get_thread(str(tmp_path)) for _ in range(5)]
+
+    assert list(threads) == [thread.id for thread in created[-3:]]
+    assert agents.cache_stats()["threads"]["evicted_lru"] == 2
+
+
+def test_evicted_assistants_are_closed(monkeypatch):
+    class Closable:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    cache = BoundedCache(max_entries=1, on_evict=agents._close_evicted)
+    monkeypatch.setattr(agents, "_ASSISTANT_CACHE", cache)
+    first, second = Closable(), Closable()
+    cache["/books/one"] = first
+    cache["/books/two"] = second
+
+    assert first.closed and not second.closed
+    agents.close_assistant("/books/two")
+    assert second.closed and len(cache) == 0
+
+
+def test_checked_out_assistant_closes_when_released(tmp_path, monkeypatch):
+    cache = BoundedCache(max_entries=1, on_evict=agents._close_evicted)
+    monkeypatch.setattr(agents, "_ASSISTANT_CACHE", cache)
+    assistant = agents.LangChainAssistant(
+        id="assistant:one",
+        book_path=str(tmp_path),
+        config=SimpleNamespace(),
+        llm=None,
+        embeddings=None,
+        vector_store=None,
+        behavior="",
+    )
+    cache["/books/one"] = assistant
+
+    with agents.hold_assistant(assistant):
+        cache["/books/two"] = SimpleNamespace()
+        assert "/books/one" not in cache
+        assert not assistant._closed
+    assert assistant._closed
+
+
+def test_assistant_size_counts_the_index_generation(tmp_path):
+    (tmp_path / "segment").mkdir()
+    (tmp_path / "segment" / "data_level0.bin").write_bytes(b"\0" * 4096)
+    (tmp_path / "keyword-index.sqlite").write_bytes(b"\0" * 1024)
+    assistant = SimpleNamespace(
+        last_documents=[], generation=SimpleNamespace(path=tmp_path)
+    )
+
+    assert agents._assistant_size(assistant) == 5120
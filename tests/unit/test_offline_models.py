@@ -0,0 +1,34 @@
+import time
+
+from langchain_core.messages import HumanMessage
+
+from storycraftr.llm.embeddings import (
+    EmbeddingSettings,
+    HashEmbeddings,
+    build_embedding_model,
+)
+from storycraftr.llm.offline import OfflineChatModel
+
+
+def test_hash_embeddings_are_deterministic_and_normalised():
+    model = build_embedding_model(EmbeddingSettings(model_name="hash:64"))
+    assert isinstance(model, HashEmbeddings)
+
+    first, second = model.embed_documents(["Elowen crossed the river", "Elowen"])
+    assert len(first) == 64
+    assert first == HashEmbeddings(64).embed_query("Elowen crossed the river")
+    assert abs(sum(value * value for value in first) - 1.0) < 1e-9
+    assert any(a and b for a, b in zip(first, second))
+
+
+def test_offline_model_streams_tokens_at_configured_rate():
+    model = OfflineChatModel(
+        template="one two three four", latency=0.02, tokens_per_second=200
+    )
+    start = time.perf_counter()
+    chunks = [chunk.content for chunk in model.stream([HumanMessage(content="hi")])]
+    elapsed = time.perf_counter() - start
+
+    assert "".join(chunks) == "one two three four"
+    assert len(chunks) == 4
+    assert elapsed >= 0.02 + 4 / 200
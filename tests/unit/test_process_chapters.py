@@ -0,0 +1,67 @@
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from storycraftr.agent import agents
+
+
+def _book(tmp_path: Path) -> Path:
+    for folder, names in {
+        "chapters": ["chapter-2.md", "chapter-1.md", "cover.md"],
+        "outline": ["general_outline.md"],
+        "worldbuilding": ["history.md"],
+    }.items():
+        (tmp_path / folder).mkdir()
+        for name in names:
+            (tmp_path / folder / name).write_text(f"# {name}\n", encoding="utf-8")
+    return tmp_path
+
+
+def test_process_chapters_runs_concurrently_and_saves_in_order(tmp_path, monkeypatch):
+    book = _book(tmp_path)
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+    saved = []
+    refreshed = []
+
+    def fake_create_message(book_path, thread_id, content, file_path, **kwargs):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        # Later files finish first to prove output order does not depend on timing.
+        time.sleep(0.05 if file_path.endswith("chapter-1.md") else 0.01)
+        with lock:
+            state["active"] -= 1
+        return f"{content}:{Path(file_path).name}"
+
+    def fake_save(book_path, relative_path, header, content, progress, task):
+        saved.append(relative_path)
+
+    assistant = SimpleNamespace(config=SimpleNamespace(llm_max_concurrency=2))
+    monkeypatch.setattr(agents, "create_or_get_assistant", lambda path: assistant)
+    monkeypatch.setattr(agents, "create_message", fake_create_message)
+    monkeypatch.setattr(
+        agents, "update_agent_files", lambda path, asst: refreshed.append(path)
+    )
+
+    results = agents.process_chapters(
+        fake_save,
+        str(book),
+        prompt_template="Check {topic}",
+        task_description="Checking...",
+        file_suffix="Check",
+        topic="names",
+    )
+
+    expected = [
+        "chapters/chapter-1.md",
+        "chapters/chapter-2.md",
+        "outline/general_outline.md",
+        "worldbuilding/history.md",
+    ]
+    assert saved == expected
+    assert list(results) == expected
+    assert results["chapters/chapter-1.md"] == "Check names:chapter-1.md"
+    assert state["peak"] == 2
+    assert refreshed == [str(book)]
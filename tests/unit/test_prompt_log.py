@@ -0,0 +1,59 @@
+import gzip
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+
+from storycraftr.utils.prompt_log import PromptLog, read_prompt_log
+
+
+def test_concurrent_appends_keep_every_line(tmp_path):
+    log = PromptLog(tmp_path)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: log.append("today", f"prompt {i}"), range(200)))
+
+    lines = log.path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 200
+    prompts = {json.loads(line)["original_prompt"] for line in lines}
+    assert prompts == {f"prompt {i}" for i in range(200)}
+
+
+def test_rotation_compresses_archives_and_reader_merges_history(tmp_path):
+    (tmp_path / "prompts.yaml").write_text(
+        yaml.dump([{"date": "old", "original_prompt": "legacy"}]), encoding="utf-8"
+    )
+    log = PromptLog(tmp_path, max_bytes=200, compress=True)
+    for i in range(10):
+        log.append("today", f"prompt {i} " + "x" * 40)
+    log.wait_for_compression(timeout=10)
+
+    archives = log.archives()
+    assert archives and all(path.suffix == ".gz" for path in archives)
+    with gzip.open(archives[0], "rt", encoding="utf-8") as handle:
+        assert json.loads(handle.readline())["original_prompt"].startswith("prompt 0")
+
+    history = [entry["original_prompt"] for entry in read_prompt_log(tmp_path)]
+    assert history[0] == "legacy"
+    assert [text.split(" x")[0] for text in history[1:]] == [
+        f"prompt {i}" for i in range(10)
+    ]
+
+
+def test_independent_writers_rotate_without_losing_entries(tmp_path):
+    # Separate instances share nothing in memory, like the chat process and
+    # the daemon writing to the same book.
+    writers = [PromptLog(tmp_path, max_bytes=300, compress=True) for _ in range(4)]
+
+    def write(index):
+        writers[index % 4].append("today", f"prompt {index} " + "x" * 30)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(write, range(120)))
+    for writer in writers:
+        writer.wait_for_compression(timeout=10)
+
+    assert all(path.suffix == ".gz" for path in writers[0].archives())
+    prompts = [entry["original_prompt"] for entry in read_prompt_log(tmp_path)]
+    assert sorted(text.split(" x")[0] for text in prompts) == sorted(
+        f"prompt {i}" for i in range(120)
+    )
@@ -0,0 +1,137 @@
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from storycraftr.llm import ratelimit
+from storycraftr.llm.factory import LLMSettings, build_chat_model
+from storycraftr.llm.ratelimit import RateLimitedChatModel, RateLimiter, RateLimits
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code: int, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+class FlakyChatModel(BaseChatModel):
+    errors: List[Exception] = []
+    calls: int = 0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="ok"))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        for token in ("o", "k"):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    @property
+    def _llm_type(self) -> str:
+        return "flaky"
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def sleeps(monkeypatch, clock):
+    recorded = []
+
+    def sleep(seconds):
+        recorded.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(ratelimit.time, "sleep", sleep)
+    return recorded
+
+
+def test_limiter_queues_requests_beyond_the_per_minute_budget(clock):
+    limiter = RateLimiter(
+        RateLimits(requests_per_minute=2, tokens_per_minute=600), clock=clock
+    )
+
+    assert limiter.reserve(100) == 0
+    assert limiter.reserve(100) == 0
+    assert limiter.reserve(100) == pytest.approx(30.0)  # third request of two/min
+    assert limiter.reserve(500) == pytest.approx(60.0)  # 200 tokens over budget
+
+    clock.now = 120
+    limiter.settle(reserved=500, used=50)
+    assert limiter.reserve(100) == 0
+    stats = limiter.stats()
+    assert stats.requests == 5 and stats.queue_wait_max == pytest.approx(60.0)
+
+
+def test_retries_honour_retry_after(sleeps, clock):
+    limiter = RateLimiter(RateLimits(max_retries=3, retry_base_delay=0.01), clock=clock)
+    flaky = FlakyChatModel(
+        errors=[ProviderError(429, {"retry-after": "2"}), ProviderError(503)]
+    )
+    model = RateLimitedChatModel(underlying=flaky, limiter=limiter)
+
+    assert model.invoke("hi").content == "ok"
+
+    assert flaky.calls == 3
+    assert sleeps[0] >= 2.0  # Retry-After wins over the short backoff
+    assert 0 <= sleeps[-1] <= 0.02
+    stats = limiter.stats()
+    assert stats.retries == 2 and stats.throttled == 1 and stats.failures == 0
+
+
+def test_non_retryable_errors_and_exhausted_retries_raise(sleeps, clock):
+    limiter = RateLimiter(RateLimits(max_retries=1, retry_base_delay=0.01), clock=clock)
+    bad_request = RateLimitedChatModel(
+        underlying=FlakyChatModel(errors=[ProviderError(400)]), limiter=limiter
+    )
+    with pytest.raises(ProviderError):
+        bad_request.invoke("hi")
+    assert sleeps == []
+
+    throttled = RateLimitedChatModel(
+        underlying=FlakyChatModel(errors=[ProviderError(429), ProviderError(429)]),
+        limiter=limiter,
+    )
+    with pytest.raises(ProviderError):
+        throttled.invoke("hi")
+    assert limiter.stats().failures == 2
+
+
+def test_streams_are_retried_before_the_first_chunk(sleeps, clock):
+    limiter = RateLimiter(RateLimits(max_retries=2, retry_base_delay=0.01), clock=clock)
+    flaky = FlakyChatModel(errors=[ProviderError(502)])
+    model = RateLimitedChatModel(underlying=flaky, limiter=limiter)
+
+    assert "".join(chunk.content for chunk in model.stream("hi")) == "ok"
+    assert flaky.calls == 2 and len(sleeps) == 1
+
+
+def test_build_chat_model_applies_configured_limits():
+    settings = LLMSettings(provider="fake", model="offline", requests_per_minute=120)
+    model = build_chat_model(settings)
+
+    assert isinstance(model, RateLimitedChatModel)
+    assert model.limiter.limits.requests_per_minute == 120
+    assert "fake|" in ratelimit.rate_limit_stats()
+    # Without limits the offline model is returned as is.
+    plain = build_chat_model(LLMSettings(provider="fake", model="offline"))
+    assert not isinstance(plain, RateLimitedChatModel)
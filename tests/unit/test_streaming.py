@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.runnables import RunnableLambda
+
+from storycraftr.agent.agents import (
+    LangChainAssistant,
+    create_message,
+    get_thread,
+    stream_message,
+)
+from storycraftr.graph import build_assistant_graph
+from storycraftr.utils.markdown import save_to_markdown
+
+
+def _assistant(tmp_path, response):
+    assistant = LangChainAssistant(
+        id="assistant:test",
+        book_path=str(tmp_path),
+        config=SimpleNamespace(
+            multiple_answer=False, reference_author="", primary_language="en"
+        ),
+        llm=FakeListChatModel(responses=[response]),
+        embeddings=None,
+        vector_store=None,
+        behavior="Be helpful.",
+    )
+    assistant.retriever = RunnableLambda(
+        lambda _: [Document(page_content="Lore", metadata={"source": "lore.md"})]
+    )
+    assistant.graph = build_assistant_graph(assistant)
+    return assistant
+
+
+def test_create_message_streams_tokens(tmp_path):
+    assistant = _assistant(tmp_path, "  Hello there END_OF_RESPONSE\n")
+    thread = get_thread(str(tmp_path))
+    deltas = []
+
+    answer = create_message(
+        str(tmp_path),
+        thread_id=thread.id,
+        content="Say hello",
+        assistant=assistant,
+        on_token=deltas.append,
+    )
+
+    assert answer == "Hello there"
+    assert "".join(deltas) == answer
+    assert len(deltas) > 1
+    assert assistant.last_documents[0].metadata["source"] == "lore.md"
+    assert len(thread.messages) == 2
+
+
+def test_save_to_markdown_writes_stream_progressively(tmp_path):
+    assistant = _assistant(tmp_path, "Chapter body")
+    thread = get_thread(str(tmp_path))
+    stream = stream_message(
+        str(tmp_path), thread_id=thread.id, content="Write", assistant=assistant
+    )
+
+    path = save_to_markdown(str(tmp_path), "chapters/chapter-1.md", "Chapter 1", stream)
+
+    assert stream.text == "Chapter body"
+    with open(path, encoding="utf-8") as handle:
+        assert handle.read() == "# Chapter 1\n\nChapter body"
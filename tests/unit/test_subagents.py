@@ -1,11 +1,18 @@
 import json
+import os
+import subprocess  # nosec B404
+import sys
+import threading
 import time
+from datetime import datetime, timedelta, timezone
 from io import StringIO
 from pathlib import Path
 
+import pytest
 from rich.console import Console
 
 from storycraftr.subagents import SubAgentJobManager, seed_default_roles
+from storycraftr.subagents.job_queue import FINISHED_STATUSES, JobQueue
 
 
 def _minimal_config(tmp_path: Path) -> None:
@@ -75,3 +82,311 @@ def test_job_manager_runs_background_job(monkeypatch, tmp_path):
     assert captured["book_path"] == str(tmp_path)
     assert captured["command"].startswith("outline general-outline")
     assert manager.list_jobs()[0].status == "succeeded"
+
+
+def _wait_for_jobs(manager, count):
+    for _ in range(100):
+        jobs = manager.list_jobs()
+        if len(jobs) == count and all(job.status in FINISHED_STATUSES for job in jobs):
+            return jobs
+        time.sleep(0.1)
+    raise AssertionError("Sub-agent jobs did not finish in time.")
+
+
+def test_process_executor_streams_each_job_separately(monkeypatch, tmp_path):
+    _minimal_config(tmp_path)
+    seed_default_roles(tmp_path, language="en", force=True)
+    lines = []
+
+    def worker_command(self, job):
+        label = job.command_text.split()[-1]
+        script = (
+            "import sys, time\n"
+            "for i in range(3):\n"
+            f"    print('{label}', i); time.sleep(0.05)\n"
+            f"print('{label} warning', file=sys.stderr)\n"
+        )
+        return [sys.executable, "-c", script]
+
+    monkeypatch.setattr(SubAgentJobManager, "_worker_command", worker_command)
+    manager = SubAgentJobManager(
+        str(tmp_path),
+        Console(file=StringIO(), force_terminal=False),
+        event_callback=lambda event, payload: lines.append((event, payload)),
+        executor="process",
+    )
+
+    for label in ("alpha", "beta"):
+        manager.submit(
+            command_token="!outline",  # nosec B106
+            args=["general-outline", label],
+            role_slug="editor",
+        )
+    jobs = {job.command_text.split()[-1]: job for job in _wait_for_jobs(manager, 2)}
+    manager.shutdown()
+
+    for label, other in (("alpha", "beta"), ("beta", "alpha")):
+        job = jobs[label]
+        assert job.status == "succeeded"
+        assert job.output.startswith(f"{label} 0\n{label} 1\n{label} 2")
+        assert f"[stderr]\n{label} warning" in job.output
+        assert other not in job.output
+        streamed = [
+            (payload["stream"], payload["line"])
+            for event, payload in lines
+            if event == "output" and payload["job_id"] == job.job_id
+        ]
+        assert [line for stream, line in streamed if stream == "stdout"] == [
+            f"{label} {i}" for i in range(3)
+        ]
+        assert ("stderr", f"{label} warning") in streamed
+
+
+def test_process_executor_reports_command_errors(tmp_path):
+    _minimal_config(tmp_path)
+    seed_default_roles(tmp_path, language="en", force=True)
+    manager = SubAgentJobManager(
+        str(tmp_path),
+        Console(file=StringIO(), force_terminal=False),
+        executor="process",
+    )
+
+    manager.submit(
+        command_token="!bogus",  # nosec B106
+        args=["anything"],
+        role_slug="editor",
+    )
+    (job,) = _wait_for_jobs(manager, 1)
+    manager.shutdown()
+
+    assert job.status == "failed"
+    assert job.error == "Unknown module 'bogus'."
+    ((logged, snippet),) = manager.search_logs("unknown module bogus")
+    assert logged.job_id == job.job_id and "[bogus]" in snippet
+
+
+def _blocking_runner(monkeypatch, order, gate):
+    def fake_run_module_command(command_text, console, book_path):
+        order.append(command_text.split()[-1])
+        gate.wait(5)
+
+    monkeypatch.setattr(
+        "storycraftr.subagents.jobs.run_module_command", fake_run_module_command
+    )
+
+
+def _submit(manager, label, **options):
+    return manager.submit(
+        command_token="!outline",  # nosec B106
+        args=["general-outline", label],
+        role_slug="editor",
+        **options,
+    )
+
+
+def test_queue_runs_by_priority_and_cancels_pending_jobs(monkeypatch, tmp_path):
+    _minimal_config(tmp_path)
+    seed_default_roles(tmp_path, language="en", force=True)
+    order, gate = [], threading.Event()
+    _blocking_runner(monkeypatch, order, gate)
+    manager = SubAgentJobManager(
+        str(tmp_path), Console(file=StringIO(), force_terminal=False), max_workers=1
+    )
+
+    _submit(manager, "first")
+    _submit(manager, "low")
+    dropped = _submit(manager, "dropped", priority=9)
+    _submit(manager, "high", priority=5)
+    assert manager.cancel(dropped.job_id[:8]).status == "cancelled"
+    gate.set()
+    jobs = _wait_for_jobs(manager, 4)
+    manager.shutdown()
+
+    assert order == ["first", "high", "low"]
+    assert sorted(job.status for job in jobs) == [
+        "cancelled",
+        "succeeded",
+        "succeeded",
+        "succeeded",
+    ]
+    with pytest.raises(ValueError, match="already cancelled"):
+        manager.cancel(dropped.job_id)
+
+
+def test_running_thread_jobs_cannot_be_cancelled(monkeypatch, tmp_path):
+    _minimal_config(tmp_path)
+    seed_default_roles(tmp_path, language="en", force=True)
+    order, gate = [], threading.Event()
+    _blocking_runner(monkeypatch, order, gate)
+    manager = SubAgentJobManager(str(tmp_path), Console(file=StringIO()))
+
+    job = _submit(manager, "busy")
+    for _ in range(50):
+        if order:
+            break
+        time.sleep(0.1)
+    with pytest.raises(ValueError, match="cannot be interrupted"):
+        manager.cancel(job.job_id)
+    gate.set()
+    (finished,) = _wait_for_jobs(manager, 1)
+    manager.shutdown()
+
+    assert finished.status == "succeeded"
+
+
+def test_pending_jobs_resume_in_the_next_session(monkeypatch, tmp_path):
+    _minimal_config(tmp_path)
+    seed_default_roles(tmp_path, language="en", force=True)
+    order, gate = [], threading.Event()
+    gate.set()
+    _blocking_runner(monkeypatch, order, gate)
+    console = Console(file=StringIO(), force_terminal=False)
+
+    first = SubAgentJobManager(str(tmp_path), console, resume=False)
+    first.shutdown()  # e.g. a one-shot --prompt session
+    queued = _submit(first, "overnight")
+    assert first.list_jobs()[0].status == "pending" and order == []
+
+    second = SubAgentJobManager(str(tmp_path), console)
+    (job,) = _wait_for_jobs(second, 1)
+    second.shutdown()
+
+    assert job.job_id == queued.job_id and job.status == "succeeded"
+    assert order == ["overnight"]
+
+
+def test_process_jobs_time_out_and_can_be_cancelled(monkeypatch, tmp_path):
+    _minimal_config(tmp_path)
+    seed_default_roles(tmp_path, language="en", force=True)
+    monkeypatch.setattr(
+        SubAgentJobManager,
+        "_worker_command",
+        lambda self, job: [sys.executable, "-c", "import time; time.sleep(30)"],
+    )
+    manager = SubAgentJobManager(
+        str(tmp_path),
+        Console(file=StringIO(), force_terminal=False),
+        executor="process",
+    )
+
+    slow = _submit(manager, "slow", timeout=0.5)
+    stuck = _submit(manager, "stuck")
+    time.sleep(0.3)
+    manager.cancel(stuck.job_id)
+    _wait_for_jobs(manager, 2)
+    manager.shutdown()
+
+    assert slow.status == "timed_out" and "0.5s" in slow.error
+    assert stuck.status == "cancelled"
+
+
+def test_orphaned_running_jobs_return_to_the_queue(tmp_path):
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])  # nosec B603
+    dead.wait()
+    queue = JobQueue(tmp_path / "jobs.sqlite")
+    for job_id, owner in (("orphan", dead.pid), ("mine", os.getpid())):
+        queue.add(
+            {
+                "job_id": job_id,
+                "role": "editor",
+                "command_text": "outline general-outline",
+                "status": "running",
+                "created_at": "2026-01-01T00:00:00+00:00",
+                "owner": owner,
+            }
+        )
+
+    assert queue.requeue_orphans() == ["orphan"]
+    assert [row["job_id"] for row in queue.pending()] == ["orphan"]
+    queue.close()
+
+
+def test_job_logs_are_listed_searched_and_exported(monkeypatch, tmp_path):
+    _minimal_config(tmp_path)
+    seed_default_roles(tmp_path, language="en", force=True)
+    legacy = tmp_path / ".storycraftr" / "subagents" / "logs" / "editor"
+    legacy.mkdir(parents=True, exist_ok=True)
+    yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+    (legacy / "20250101-000000-legacy.json").write_text(
+        json.dumps(
+            {
+                "job_id": "legacy",
+                "role": "editor",
+                "command_text": "outline general-outline old",
+                "status": "succeeded",
+                "created_at": yesterday,
+                "finished_at": yesterday,
+                "output": "The lighthouse keeper vanished.",
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    def fake_run_module_command(command_text, console, book_path):
+        console.print(f"Draft for {command_text.split()[-1]}")
+
+    monkeypatch.setattr(
+        "storycraftr.subagents.jobs.run_module_command", fake_run_module_command
+    )
+    manager = SubAgentJobManager(
+        str(tmp_path), Console(file=StringIO(), force_terminal=False), max_workers=1
+    )
+    for label in ("prologue", "epilogue"):
+        _submit(manager, label)
+    # The imported job is listed alongside the new ones.
+    _wait_for_jobs(manager, 3)
+    manager.shutdown()
+
+    latest = manager.role_logs("editor", limit=2)
+    assert [job.command_text.split()[-1] for job in latest] == ["epilogue", "prologue"]
+    assert [job.job_id for job, _ in manager.search_logs("lighthouse")] == ["legacy"]
+    assert manager.search_logs("draft prologue", role_slug="continuity") == []
+    ((found, _),) = manager.search_logs("draft prologue", role_slug="editor")
+    # No Markdown unless asked for.
+    assert not list(legacy.glob("*.md"))
+
+    path = manager.export_log(found.job_id[:8])
+    assert path.parent == legacy
+    assert "Draft for prologue" in path.read_text(encoding="utf-8")
+
+
+def test_job_queue_prunes_finished_jobs_by_age_and_count(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite")
+    for day in range(1, 6):
+        job_id = f"job-{day}"
+        queue.add(
+            {
+                "job_id": job_id,
+                "role": "editor",
+                "command_text": f"outline general-outline day {day}",
+                "status": "pending",
+                "created_at": f"2026-01-0{day}T00:00:00+00:00",
+            }
+        )
+        queue.finish(
+            job_id,
+            status="succeeded",
+            finished_at=f"2026-01-0{day}T00:05:00+00:00",
+            output=f"Log of day {day}",
+        )
+    queue.add(
+        {
+            "job_id": "waiting",
+            "role": "editor",
+            "command_text": "outline general-outline later",
+            "status": "pending",
+            "created_at": "2020-01-01T00:00:00+00:00",
+        }
+    )
+
+    assert queue.prune(max_per_role=3) == 2
+    assert [row["job_id"] for row in queue.latest("editor", 10)] == [
+        "job-5",
+        "job-4",
+        "job-3",
+    ]
+    assert [row["job_id"] for row, _ in queue.search("day 2")] == []
+    # Everything finished is older than a day; pending jobs are never pruned.
+    assert queue.prune(max_age_days=1) == 3
+    assert queue.search("log") == [] and queue.get("waiting") is not None
+    queue.close()
@@ -0,0 +1,110 @@
+import asyncio
+from types import SimpleNamespace
+
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.runnables import RunnableLambda
+
+from storycraftr.agent import agents
+from storycraftr.chat.render import format_timings
+from storycraftr.graph import build_assistant_graph
+from storycraftr.llm.embeddings import HashEmbeddings
+from storycraftr.utils.timing import TurnTimer, activate, stage
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _assistant(tmp_path, response):
+    assistant = agents.LangChainAssistant(
+        id="assistant:test",
+        book_path=str(tmp_path),
+        config=SimpleNamespace(
+            multiple_answer=False, reference_author="", primary_language="en"
+        ),
+        llm=FakeListChatModel(responses=[response]),
+        embeddings=None,
+        vector_store=None,
+        behavior="Be helpful.",
+    )
+    embeddings = HashEmbeddings()
+
+    def retrieve(question):
+        embeddings.embed_query(question)
+        return [Document(page_content="Lore", metadata={"source": "lore.md"})]
+
+    assistant.retriever = RunnableLambda(retrieve)
+    assistant.graph = build_assistant_graph(assistant)
+    return assistant
+
+
+def test_spans_accumulate_and_exclude_nested_stages():
+    clock = FakeClock()
+    timer = TurnTimer(clock=clock)
+
+    with activate(timer):
+        with stage("search", exclude=("embed",)):
+            clock.now += 0.01
+            with stage("embed"), stage("embed"):  # nested wrappers count once
+                clock.now += 0.03
+            clock.now += 0.01
+        with stage("search"):
+            clock.now += 0.05
+    with stage("search"):  # no active timer
+        clock.now += 1
+
+    stages = timer.as_dict()["stages"]
+    assert list(stages) == ["embed", "search"]
+    assert round(stages["embed"], 6) == 0.03
+    assert round(stages["search"], 6) == 0.07
+
+
+def test_streamed_turn_records_every_stage(tmp_path):
+    assistant = _assistant(tmp_path, "  Hello there END_OF_RESPONSE")
+    thread = agents.get_thread(str(tmp_path))
+
+    agents.create_message(
+        str(tmp_path),
+        thread_id=thread.id,
+        content="Say hello",
+        assistant=assistant,
+        on_token=lambda delta: None,
+    )
+
+    timings = assistant.last_timings
+    assert list(timings["stages"]) == [
+        "prompt_log",
+        "embed",
+        "search",
+        "prompt",
+        "first_token",
+        "generation",
+    ]
+    tokens = timings["tokens"]
+    assert tokens["completion"] > 0 and tokens["prompt"] > tokens["completion"]
+    assert tokens["estimated"] is True
+    summary = format_timings(timings)
+    assert "ttft" in summary and summary.endswith("tok")
+    timings["dropped"] = {"documents": 2}
+    assert format_timings(timings).endswith("dropped 2 docs, 0 msgs to fit")
+
+
+def test_async_turn_times_the_whole_call_as_generation(tmp_path):
+    assistant = _assistant(tmp_path, "Answer")
+    thread = agents.get_thread(str(tmp_path))
+
+    answer = asyncio.run(
+        agents.acreate_message(
+            str(tmp_path), thread_id=thread.id, content="Hi", assistant=assistant
+        )
+    )
+
+    assert answer == "Answer"
+    stages = assistant.last_timings["stages"]
+    assert {"embed", "search", "prompt", "generation"} <= set(stages)
+    assert "first_token" not in stages
@@ -1,11 +1,14 @@
 import io
 import json
+import time
 
+from storycraftr.integrations import vscode
 from storycraftr.integrations.vscode import (
     VSCodeEventEmitter,
     create_vscode_event_emitter,
     install_vscode_extension,
     is_running_in_vscode,
+    read_events,
 )
 
 
@@ -29,12 +32,67 @@ def test_vscode_event_emitter_writes_jsonl(tmp_path, monkeypatch):
     book_path.mkdir()
     emitter = VSCodeEventEmitter(str(book_path))
     emitter.emit("session.started", {"foo": "bar"})
+    assert emitter.flush(timeout=5)
 
     data = emitter.path.read_text(encoding="utf-8").strip().splitlines()
     assert len(data) == 1
     entry = json.loads(data[0])
     assert entry["event"] == "session.started"
     assert entry["payload"] == {"foo": "bar"}
+    assert entry["seq"] == 1
+    emitter.close()
+
+
+def test_vscode_event_emitter_batches_until_a_threshold(tmp_path):
+    emitter = VSCodeEventEmitter(str(tmp_path), flush_interval=0.2)
+    emitter.emit("chat.turn.delta", {"delta": "Once"})
+    emitter.emit("chat.turn.delta", {"delta": " upon"})
+
+    for _ in range(50):
+        if emitter.path.exists() and emitter.path.stat().st_size:
+            break
+        time.sleep(0.05)
+    lines = emitter.path.read_text(encoding="utf-8").splitlines()
+    # Written together once the interval passed, without an explicit flush.
+    assert [json.loads(line)["seq"] for line in lines] == [1, 2]
+    emitter.close()
+
+
+def test_unclosed_emitters_are_flushed_at_exit(tmp_path):
+    emitter = VSCodeEventEmitter(str(tmp_path), flush_interval=60)
+    emitter.emit("chat.turn", {"answer": "queued"})
+
+    # What atexit runs when a session dies without reaching close().
+    vscode._close_open_emitters()
+
+    lines = emitter.path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["payload"] for line in lines] == [{"answer": "queued"}]
+    assert emitter not in vscode._OPEN_EMITTERS
+
+
+def test_vscode_event_stream_rotates_and_resumes_by_sequence(tmp_path):
+    emitter = VSCodeEventEmitter(
+        str(tmp_path), flush_bytes=200, segment_bytes=1000, keep_segments=2
+    )
+    for index in range(120):
+        emitter.emit("sub_agent.output", {"line": f"line {index}"})
+    emitter.close()
+
+    rotated = sorted(emitter.path.parent.glob("vscode-events.*.jsonl"))
+    assert len(rotated) == 2
+    assert emitter.path.stat().st_size < 1000 + 200
+    tail = list(read_events(str(tmp_path), after_seq=100))
+    assert [event["seq"] for event in tail] == list(range(101, 121))
+    assert tail[-1]["payload"] == {"line": "line 119"}
+    # The oldest segments were pruned; reading starts at the first one kept.
+    everything = [event["seq"] for event in read_events(str(tmp_path))]
+    assert everything == list(range(everything[0], 121)) and everything[0] > 1
+
+    # A new session continues the numbering.
+    emitter = VSCodeEventEmitter(str(tmp_path))
+    emitter.emit("session.started", {})
+    emitter.close()
+    assert [event["seq"] for event in read_events(str(tmp_path), 120)] == [121]
 
 
 def test_create_vscode_event_emitter_respects_environment(monkeypatch, tmp_path):